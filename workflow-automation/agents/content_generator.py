@@ -61,7 +61,8 @@ class ContentGeneratorAgent:
         self,
         api_key: str,
         model: str = "gpt-4",
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        session: Optional[Any] = None
     ):
         """
         Initialize Content Generator Agent.
@@ -70,15 +71,17 @@ class ContentGeneratorAgent:
             api_key: OpenAI API key
             model: Model identifier (gpt-4, gpt-4-turbo, etc.)
             temperature: Sampling temperature
+            session: Shared aiohttp session (e.g. from WorkflowRuntime)
         """
         self.api_key = api_key
         self.model = model
         self.temperature = temperature
+        self.session = session
         self.stream_processor: Optional[StreamProcessor] = None
 
     async def __aenter__(self):
         """Initialize stream processor"""
-        self.stream_processor = StreamProcessor(self.api_key)
+        self.stream_processor = StreamProcessor(self.api_key, session=self.session)
         await self.stream_processor.__aenter__()
         return self
 
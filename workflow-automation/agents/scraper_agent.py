@@ -44,7 +44,8 @@ class ScraperAgent:
         self,
         timeout: int = 10,
         max_retries: int = 2,
-        user_agent: Optional[str] = None
+        user_agent: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None
     ):
         """
         Initialize Scraper Agent.
@@ -53,6 +54,7 @@ class ScraperAgent:
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts
             user_agent: Custom user agent string
+            session: Shared aiohttp session (e.g. from WorkflowRuntime); not closed on exit
         """
         self.timeout = timeout
         self.max_retries = max_retries
@@ -61,24 +63,26 @@ class ScraperAgent:
             "AppleWebKit/537.36 (KHTML, like Gecko) "
             "Chrome/120.0.0.0 Safari/537.36"
         )
-        self.session: Optional[aiohttp.ClientSession] = None
-
-    async def __aenter__(self):
-        """Create aiohttp session with headers"""
-        headers = {
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        # Sent per request so a shared session can be used
+        self._headers = {
             "User-Agent": self.user_agent,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9",
             "Accept-Encoding": "gzip, deflate, br",
             "Connection": "keep-alive",
         }
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
-        self.session = aiohttp.ClientSession(headers=headers, timeout=timeout)
+
+    async def __aenter__(self):
+        """Create aiohttp session unless a shared one was given"""
+        if self._owns_session:
+            self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Close aiohttp session"""
-        if self.session:
+        """Close own aiohttp session"""
+        if self.session and self._owns_session:
             await self.session.close()
 
     async def scrape(self, url: str) -> ScrapedContent:
@@ -96,7 +100,12 @@ class ScraperAgent:
 
         for attempt in range(self.max_retries):
             try:
-                async with self.session.get(url, ssl=False) as response:
+                async with self.session.get(
+                    url,
+                    ssl=False,
+                    headers=self._headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                ) as response:
                     response.raise_for_status()
                     html = await response.text()
 
@@ -51,7 +51,8 @@ class SerpAgent:
         self,
         api_key: str,
         provider: str = "serpapi",
-        results_limit: int = 5
+        results_limit: int = 5,
+        session: Optional[aiohttp.ClientSession] = None
     ):
         """
         Initialize SERP Agent.
@@ -60,20 +61,23 @@ class SerpAgent:
             api_key: API key for SERP provider
             provider: SERP API provider ('serpapi', 'scraperapi', 'google')
             results_limit: Maximum number of results to fetch (default: 5)
+            session: Shared aiohttp session (e.g. from WorkflowRuntime); not closed on exit
         """
         self.api_key = api_key
         self.provider = provider
         self.results_limit = results_limit
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
 
     async def __aenter__(self):
-        """Create aiohttp session"""
-        self.session = aiohttp.ClientSession()
+        """Create aiohttp session unless a shared one was given"""
+        if self._owns_session:
+            self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Close aiohttp session"""
-        if self.session:
+        """Close own aiohttp session"""
+        if self.session and self._owns_session:
             await self.session.close()
 
     async def search(
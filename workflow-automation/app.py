@@ -19,6 +19,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from core.entity_mapping import create_seo_blog_entity_map
 from core.workflow_architecture import WorkflowArchitecture, WorkflowStage
+from core.tracing import Tracer, ConsoleSpanExporter
 
 
 async def demo_entity_mapping():
@@ -54,8 +55,13 @@ async def demo_workflow_architecture():
     print("DEMO 2: AGI2 Workflow Architecture")
     print("="*80 + "\n")
 
-    # Create workflow
-    workflow = WorkflowArchitecture("Sample SEO Workflow")
+    # Create workflow (global cap plus per-provider pools)
+    workflow = WorkflowArchitecture(
+        "Sample SEO Workflow",
+        concurrency=5,
+        resource_limits={"serp": 2, "scraper": 3, "openai": 3},
+        tracer=Tracer([ConsoleSpanExporter()])
+    )
 
     # Define sample executors
     async def fetch_keyword(ctx):
@@ -112,51 +118,20 @@ async def demo_workflow_architecture():
         await asyncio.sleep(0.15)
         return {
             "headings": [
-                {"level": "h2", "text": "Introduction"},
-                {"level": "h2", "text": "Benefits of AI Automation"},
-                {"level": "h2", "text": "Implementation Guide"},
-                {"level": "h2", "text": "Conclusion"}
+                {"level": "h2", "text": "Introduction", "words": 300},
+                {"level": "h2", "text": "Benefits of AI Automation", "words": 500},
+                {"level": "h2", "text": "Implementation Guide", "words": 700},
+                {"level": "h2", "text": "Conclusion", "words": 200}
             ]
         }
 
-    def make_section_generator(log_label, content, words, duration=0.2):
-        async def generator(ctx):
-            print(f"    → Generating {log_label}...")
-            await asyncio.sleep(duration)
-            return {"content": content, "words": words}
-
-        return generator
-
-    section_definitions = [
-        (
-            "section_1",
-            "Generate Section 1",
-            "Section 1: Introduction",
-            "Introduction content...",
-            300,
-        ),
-        (
-            "section_2",
-            "Generate Section 2",
-            "Section 2: Benefits",
-            "Benefits content...",
-            500,
-        ),
-        (
-            "section_3",
-            "Generate Section 3",
-            "Section 3: Implementation",
-            "Implementation content...",
-            700,
-        ),
-        (
-            "section_4",
-            "Generate Section 4",
-            "Section 4: Conclusion",
-            "Conclusion content...",
-            200,
-        ),
-    ]
+    async def generate_section(ctx, heading):
+        print(f"    → Generating section: {heading['text']}...")
+        await asyncio.sleep(0.2)
+        return {"heading": heading["text"], "content": f"{heading['text']} content...", "words": heading["words"]}
+
+    def assemble_sections(sections):
+        return {"sections": sections, "words": sum(section["words"] for section in sections)}
 
     # Build workflow
     print("Building workflow...")
@@ -175,7 +150,8 @@ async def demo_workflow_architecture():
         "Fetch SERP Results",
         WorkflowStage.DESIGN,
         fetch_serp_results,
-        dependencies=["fetch_keyword"]
+        dependencies=["fetch_keyword"],
+        resources=["serp"]
     )
 
     # Stage 3: Implementation (Web Scraping - Parallel)
@@ -185,7 +161,8 @@ async def demo_workflow_architecture():
         WorkflowStage.IMPLEMENTATION,
         scrape_url_1,
         dependencies=["fetch_serp"],
-        parallel_group="scraping"
+        parallel_group="scraping",
+        resources=["scraper"]
     )
     workflow.add_node(
         "scrape_2",
@@ -193,7 +170,8 @@ async def demo_workflow_architecture():
         WorkflowStage.IMPLEMENTATION,
         scrape_url_2,
         dependencies=["fetch_serp"],
-        parallel_group="scraping"
+        parallel_group="scraping",
+        resources=["scraper"]
     )
     workflow.add_node(
         "scrape_3",
@@ -201,7 +179,8 @@ async def demo_workflow_architecture():
         WorkflowStage.IMPLEMENTATION,
         scrape_url_3,
         dependencies=["fetch_serp"],
-        parallel_group="scraping"
+        parallel_group="scraping",
+        resources=["scraper"]
     )
 
     # Stage 4: Implementation (Analysis & Generation)
@@ -210,33 +189,37 @@ async def demo_workflow_architecture():
         "Analyze User Intent",
         WorkflowStage.IMPLEMENTATION,
         analyze_intent,
-        dependencies=["scrape_1", "scrape_2", "scrape_3"]
+        dependencies=["scrape_1", "scrape_2", "scrape_3"],
+        resources=["openai"]
     )
     workflow.add_node(
         "generate_title",
         "Generate Title",
         WorkflowStage.IMPLEMENTATION,
         generate_title,
-        dependencies=["analyze_intent"]
+        dependencies=["analyze_intent"],
+        resources=["openai"]
     )
     workflow.add_node(
         "generate_structure",
         "Generate Structure",
         WorkflowStage.IMPLEMENTATION,
         generate_structure,
-        dependencies=["generate_title"]
+        dependencies=["generate_title"],
+        resources=["openai"]
     )
 
-    # Stage 5: Implementation (Content Generation - Parallel)
-    for node_id, display_name, log_label, content, words in section_definitions:
-        workflow.add_node(
-            node_id,
-            display_name,
-            WorkflowStage.IMPLEMENTATION,
-            make_section_generator(log_label, content, words),
-            dependencies=["generate_structure"],
-            parallel_group="content_generation"
-        )
+    # Stage 5: Implementation (Content Generation - one child node per heading)
+    workflow.add_map_node(
+        "generate_sections",
+        "Generate Section",
+        WorkflowStage.IMPLEMENTATION,
+        source="generate_structure",
+        executor=generate_section,
+        items=lambda structure: structure["headings"],
+        reduce=assemble_sections,
+        resources=["openai"]
+    )
 
     # Visualize DAG
     print("\n" + workflow.visualize_dag())
@@ -299,8 +282,8 @@ async def main():
     print("\nKey Observations:")
     print("  1. Entity Relation Mapping provides LLM-optimized workflow notation")
     print("  2. Workflow executes tasks in parallel when possible")
-    print("  3. Notice Batch 2 (scraping): 3 nodes executed in parallel")
-    print("  4. Notice Batch 6 (content): 4 sections generated in parallel")
+    print("  3. Notice scraping: 3 nodes start together as soon as SERP results arrive")
+    print("  4. Notice content: one section node per heading, capped by the openai pool (3)")
     print("  5. Total time is much less than sum of individual durations\n")
     print("Next Steps:")
     print("  - Run the full SEO Blog Generator: streamlit run examples/seo_blog_generator.py")
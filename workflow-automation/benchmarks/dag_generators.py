@@ -0,0 +1,161 @@
+"""
+Synthetic DAG Generators
+========================
+
+Builds WorkflowArchitecture instances of known shape for benchmarking:
+- chain:      n0 → n1 → ... → n(N-1)                   (no parallelism)
+- fan_out:    root → N-2 leaves → join                  (maximum parallelism)
+- diamond:    repeated root → width branches → join     (alternating fan-out/in)
+- layered:    random layered DAG, each node depends on 1..max_deps nodes
+              of earlier layers (seeded, reproducible)
+
+Every node runs a fake executor that sleeps for its latency. Latencies are
+drawn per node from a seeded RNG, so the ideal critical path is known in
+advance and can be compared with the measured makespan.
+"""
+
+import asyncio
+import os
+import random
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workflow_architecture import WorkflowArchitecture, WorkflowStage
+
+
+# (node_id, dependencies) in insertion order
+Edges = List[Tuple[str, List[str]]]
+
+
+def chain_edges(size: int) -> Edges:
+    """Linear chain of ``size`` nodes."""
+    return [(f"n{i}", [f"n{i - 1}"] if i else []) for i in range(size)]
+
+
+def fan_out_edges(size: int) -> Edges:
+    """One root, ``size - 2`` parallel leaves and one join node."""
+    leaves = [f"n{i}" for i in range(1, max(size - 1, 1))]
+    edges: Edges = [("n0", [])]
+    edges.extend((leaf, ["n0"]) for leaf in leaves)
+    if size > 1:
+        edges.append((f"n{size - 1}", leaves or ["n0"]))
+    return edges
+
+
+def diamond_edges(size: int, width: int = 8) -> Edges:
+    """Stacked diamonds: join → ``width`` branches → join → ..."""
+    edges: Edges = [("n0", [])]
+    join = "n0"
+    index = 1
+    while index < size:
+        branches = []
+        for _ in range(min(width, size - index)):
+            branches.append(f"n{index}")
+            edges.append((f"n{index}", [join]))
+            index += 1
+        if index >= size:
+            break
+        join = f"n{index}"
+        edges.append((join, branches))
+        index += 1
+    return edges
+
+
+def layered_edges(size: int, layers: Optional[int] = None, max_deps: int = 3, seed: int = 0) -> Edges:
+    """
+    Random layered DAG.
+
+    Args:
+        size: Number of nodes
+        layers: Number of layers (default: about sqrt(size))
+        max_deps: Maximum dependencies per node, drawn from earlier layers
+        seed: RNG seed
+    """
+    rng = random.Random(seed)
+    layers = layers or max(1, int(size ** 0.5))
+    per_layer = [size // layers + (1 if i < size % layers else 0) for i in range(layers)]
+
+    edges: Edges = []
+    previous: List[str] = []
+    index = 0
+    for count in per_layer:
+        current = []
+        for _ in range(count):
+            node_id = f"n{index}"
+            deps = rng.sample(previous, min(len(previous), rng.randint(1, max_deps))) if previous else []
+            edges.append((node_id, deps))
+            current.append(node_id)
+            index += 1
+        previous = previous[-4 * max(count, 1):] + current  # Mostly recent layers, like real pipelines
+    return edges
+
+
+SHAPES: Dict[str, Callable[[int], Edges]] = {
+    "chain": chain_edges,
+    "fan_out": fan_out_edges,
+    "diamond": diamond_edges,
+    "layered": layered_edges,
+}
+
+
+def node_latencies(edges: Edges, latency_ms: float, jitter: float = 0.0, seed: int = 0) -> Dict[str, float]:
+    """
+    Per-node fake latency in ms.
+
+    Args:
+        latency_ms: Mean latency
+        jitter: Relative spread, e.g. 0.5 draws uniformly from [0.5x, 1.5x]
+        seed: RNG seed
+    """
+    rng = random.Random(seed)
+    return {
+        node_id: max(0.0, latency_ms * (1 + rng.uniform(-jitter, jitter))) if jitter else latency_ms
+        for node_id, _ in edges
+    }
+
+
+def _sleeper(delay_ms: float):
+    delay = delay_ms / 1000
+
+    async def executor(ctx):
+        await asyncio.sleep(delay)
+        return delay_ms
+
+    return executor
+
+
+def build_workflow(
+    shape: str,
+    size: int,
+    latency_ms: float = 0.0,
+    jitter: float = 0.0,
+    seed: int = 0,
+    **workflow_kwargs
+) -> Tuple[WorkflowArchitecture, Dict[str, float]]:
+    """
+    Build a synthetic workflow.
+
+    Args:
+        shape: One of SHAPES
+        size: Number of nodes
+        latency_ms: Mean fake executor latency
+        jitter: Relative latency spread
+        seed: RNG seed for graph shape and latencies
+        **workflow_kwargs: Passed to WorkflowArchitecture (concurrency, ...)
+
+    Returns:
+        (workflow, latency per node id in ms)
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape '{shape}' (choose from {', '.join(SHAPES)})")
+    edges = layered_edges(size, seed=seed) if shape == "layered" else SHAPES[shape](size)
+    latencies = node_latencies(edges, latency_ms, jitter, seed)
+
+    workflow = WorkflowArchitecture(f"bench-{shape}-{size}", **workflow_kwargs)
+    for node_id, deps in edges:
+        workflow.add_node(
+            node_id, node_id, WorkflowStage.IMPLEMENTATION, _sleeper(latencies[node_id]), dependencies=deps
+        )
+    return workflow, latencies
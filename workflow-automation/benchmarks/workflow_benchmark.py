@@ -0,0 +1,241 @@
+"""
+Workflow Benchmark
+==================
+
+Measures WorkflowArchitecture on synthetic DAGs (see dag_generators.py):
+- plan_ms:        compute_execution_order() on a fresh graph
+- makespan_ms:    wall-clock execute() time
+- warm_makespan_ms: a second execute() of the same workflow (validation and
+                  planning are cached per graph version, so this is the
+                  steady state of a long-lived or compiled workflow)
+- critical_path_ms: ideal makespan with unlimited parallelism (sum of
+                  latencies along the longest path)
+- overhead_ms:    makespan - critical path (scheduler + event loop cost)
+- overhead_us_per_node
+- efficiency:     critical path / makespan (1.0 = ideal)
+- peak_memory_mb: tracemalloc peak during build + run (measured in a
+                  separate pass, since tracing slows execution several times)
+
+Results are written as JSON (one object per case plus environment metadata)
+so runs from different releases can be compared:
+
+  python benchmarks/workflow_benchmark.py --output bench.json
+  python benchmarks/workflow_benchmark.py --compare bench.json --threshold 0.2
+
+--compare exits with status 1 when any case's makespan or overhead per node
+regressed by more than the threshold.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dag_generators import SHAPES, build_workflow
+
+
+DEFAULT_SIZES = [100, 1000, 10000]
+REGRESSION_METRICS = ["makespan_ms", "warm_makespan_ms", "overhead_us_per_node"]
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one (shape, size, latency) case"""
+    shape: str
+    size: int
+    latency_ms: float
+    jitter: float
+    concurrency: Optional[int]
+    edges: int
+    levels: int
+    plan_ms: float
+    makespan_ms: float
+    warm_makespan_ms: float
+    critical_path_ms: float
+    overhead_ms: float
+    overhead_us_per_node: float
+    efficiency: float
+    peak_memory_mb: float
+    success: bool
+
+
+def run_case(
+    shape: str,
+    size: int,
+    latency_ms: float,
+    jitter: float = 0.0,
+    concurrency: Optional[int] = None,
+    seed: int = 0,
+    trace_memory: bool = True
+) -> BenchmarkResult:
+    """Build, plan and execute one synthetic workflow."""
+    gc.collect()
+    workflow, latencies = build_workflow(shape, size, latency_ms, jitter, seed, concurrency=concurrency)
+    workflow.invalidate_plan()
+    plan_start = time.perf_counter()
+    workflow.compute_execution_order()
+    plan_ms = (time.perf_counter() - plan_start) * 1000
+
+    _, critical_path_ms = workflow.critical_path(latencies)
+    run_start = time.perf_counter()
+    result = asyncio.run(workflow.execute({}))
+    makespan_ms = (time.perf_counter() - run_start) * 1000
+
+    gc.collect()
+    warm_start = time.perf_counter()
+    asyncio.run(workflow.execute({}))
+    warm_makespan_ms = (time.perf_counter() - warm_start) * 1000
+
+    peak_memory_mb = measure_peak_memory(shape, size, latency_ms, jitter, concurrency, seed) if trace_memory else 0.0
+
+    overhead_ms = makespan_ms - critical_path_ms
+    return BenchmarkResult(
+        shape=shape,
+        size=size,
+        latency_ms=latency_ms,
+        jitter=jitter,
+        concurrency=concurrency,
+        edges=sum(len(node.dependencies) for node in workflow.nodes.values()),
+        levels=len(workflow.execution_order),
+        plan_ms=round(plan_ms, 3),
+        makespan_ms=round(makespan_ms, 3),
+        warm_makespan_ms=round(warm_makespan_ms, 3),
+        critical_path_ms=round(critical_path_ms, 3),
+        overhead_ms=round(overhead_ms, 3),
+        overhead_us_per_node=round(overhead_ms * 1000 / size, 3),
+        efficiency=round(critical_path_ms / makespan_ms, 4) if makespan_ms and critical_path_ms else 0.0,
+        peak_memory_mb=round(peak_memory_mb, 3),
+        success=result.success
+    )
+
+
+def measure_peak_memory(
+    shape: str,
+    size: int,
+    latency_ms: float,
+    jitter: float = 0.0,
+    concurrency: Optional[int] = None,
+    seed: int = 0
+) -> float:
+    """Peak traced allocation (MB) while building and executing a workflow."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        workflow, _ = build_workflow(shape, size, latency_ms, jitter, seed, concurrency=concurrency)
+        asyncio.run(workflow.execute({}))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def environment() -> Dict[str, Any]:
+    """Metadata identifying where and on what revision a run happened."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def case_key(case: Dict[str, Any]) -> str:
+    return f"{case['shape']}/{case['size']}/{case['latency_ms']}ms/c={case['concurrency']}"
+
+
+def compare(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> List[str]:
+    """
+    Find cases that got slower than the baseline.
+
+    Returns:
+        One message per regressed metric
+    """
+    previous = {case_key(case): case for case in baseline}
+    regressions = []
+    for case in current:
+        base = previous.get(case_key(case))
+        if base is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            old, new = base.get(metric), case.get(metric)
+            # Ignore sub-millisecond noise on tiny cases
+            if old is None or new is None or abs(new - old) < 1.0:
+                continue
+            if old > 0 and (new - old) / old > threshold:
+                regressions.append(
+                    f"{case_key(case)} {metric}: {old:.2f} → {new:.2f} (+{(new - old) / old:.0%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark WorkflowArchitecture on synthetic DAGs")
+    parser.add_argument("--shapes", nargs="+", default=list(SHAPES), choices=list(SHAPES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--latency-ms", nargs="+", type=float, default=[0.0, 1.0],
+                        help="Fake executor latency; 0 measures pure scheduler overhead")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Relative latency spread, e.g. 0.5")
+    parser.add_argument("--concurrency", type=int, default=None, help="Workflow concurrency cap")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass (halves run time)")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'case':36} {'plan':>9} {'makespan':>10} {'warm':>10} {'crit.path':>10} {'us/node':>9} {'eff.':>6} {'mem MB':>8}")
+    for shape in args.shapes:
+        for size in args.sizes:
+            for latency_ms in args.latency_ms:
+                result = run_case(
+                    shape, size, latency_ms, args.jitter, args.concurrency, args.seed,
+                    trace_memory=not args.no_memory
+                )
+                results.append(asdict(result))
+                print(f"{case_key(results[-1]):36} {result.plan_ms:8.1f}ms {result.makespan_ms:9.1f}ms "
+                      f"{result.warm_makespan_ms:9.1f}ms "
+                      f"{result.critical_path_ms:9.1f}ms {result.overhead_us_per_node:9.1f} "
+                      f"{result.efficiency:6.2f} {result.peak_memory_mb:8.1f}")
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline.get("results", []), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
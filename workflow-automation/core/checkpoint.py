@@ -0,0 +1,219 @@
+"""
+Workflow Checkpointing
+======================
+
+Persists workflow runs node by node so a crashed or interrupted run can be
+resumed without re-executing the nodes that already completed.
+
+Backends:
+- FileCheckpointStore: one directory per run, one pickle per node
+- SQLiteCheckpointStore: single SQLite database (stdlib sqlite3)
+
+Usage:
+    store = SQLiteCheckpointStore("checkpoints.db")
+    workflow = WorkflowArchitecture("SEO Blog", checkpoint_store=store)
+    result = await workflow.execute({"keyword": "AI automation"})
+    ...
+    result = await workflow.resume(result.run_id)
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class NodeCheckpoint:
+    """Persisted state of a single node"""
+    node_id: str
+    status: str
+    result: Any = None
+    error: Optional[str] = None
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    attempts: int = 0
+
+
+@dataclass
+class RunCheckpoint:
+    """Persisted state of a workflow run"""
+    run_id: str
+    workflow_name: str
+    initial_context: Dict[str, Any]
+    created_at: float
+    nodes: Dict[str, NodeCheckpoint] = field(default_factory=dict)
+
+
+class CheckpointStore:
+    """
+    Base class for checkpoint backends.
+
+    Subclasses implement run/node persistence; results must be picklable.
+    """
+
+    def save_run(self, run_id: str, workflow_name: str, initial_context: Dict[str, Any]) -> None:
+        """Record the start of a run with its initial context."""
+        raise NotImplementedError
+
+    def save_node(self, run_id: str, checkpoint: NodeCheckpoint) -> None:
+        """Persist (or overwrite) a node's state for a run."""
+        raise NotImplementedError
+
+    def load_run(self, run_id: str) -> Optional[RunCheckpoint]:
+        """Load a run with all its node checkpoints (None if unknown)."""
+        raise NotImplementedError
+
+    def list_runs(self) -> List[str]:
+        """List stored run ids."""
+        raise NotImplementedError
+
+    def delete_run(self, run_id: str) -> None:
+        """Remove a run and its node checkpoints."""
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Directory-based store: <root>/<run_id>/run.pkl and nodes/<hash>.pkl"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def save_run(self, run_id: str, workflow_name: str, initial_context: Dict[str, Any]) -> None:
+        run = RunCheckpoint(
+            run_id=run_id,
+            workflow_name=workflow_name,
+            initial_context=initial_context,
+            created_at=time.time()
+        )
+        os.makedirs(os.path.join(self._run_dir(run_id), "nodes"), exist_ok=True)
+        self._write(os.path.join(self._run_dir(run_id), "run.pkl"), run)
+
+    def save_node(self, run_id: str, checkpoint: NodeCheckpoint) -> None:
+        node_file = hashlib.sha1(checkpoint.node_id.encode("utf-8")).hexdigest() + ".pkl"
+        self._write(os.path.join(self._run_dir(run_id), "nodes", node_file), checkpoint)
+
+    def load_run(self, run_id: str) -> Optional[RunCheckpoint]:
+        run_path = os.path.join(self._run_dir(run_id), "run.pkl")
+        if not os.path.exists(run_path):
+            return None
+        with open(run_path, "rb") as f:
+            run: RunCheckpoint = pickle.load(f)
+
+        nodes_dir = os.path.join(self._run_dir(run_id), "nodes")
+        for filename in sorted(os.listdir(nodes_dir)):
+            if filename.endswith(".pkl"):
+                with open(os.path.join(nodes_dir, filename), "rb") as f:
+                    checkpoint: NodeCheckpoint = pickle.load(f)
+                run.nodes[checkpoint.node_id] = checkpoint
+        return run
+
+    def list_runs(self) -> List[str]:
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, "run.pkl"))
+        )
+
+    def delete_run(self, run_id: str) -> None:
+        run_dir = self._run_dir(run_id)
+        if not os.path.isdir(run_dir):
+            return
+        for root, dirs, files in os.walk(run_dir, topdown=False):
+            for filename in files:
+                os.remove(os.path.join(root, filename))
+            for dirname in dirs:
+                os.rmdir(os.path.join(root, dirname))
+        os.rmdir(run_dir)
+
+    def _run_dir(self, run_id: str) -> str:
+        return os.path.join(self.root, run_id)
+
+    @staticmethod
+    def _write(path: str, value: Any) -> None:
+        # Pickle first so an unpicklable value never leaves a truncated file behind
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Single-file SQLite store (safe to share between threads of one process)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " run_id TEXT PRIMARY KEY,"
+                " workflow_name TEXT NOT NULL,"
+                " initial_context BLOB NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS nodes ("
+                " run_id TEXT NOT NULL,"
+                " node_id TEXT NOT NULL,"
+                " checkpoint BLOB NOT NULL,"
+                " PRIMARY KEY (run_id, node_id))"
+            )
+
+    def save_run(self, run_id: str, workflow_name: str, initial_context: Dict[str, Any]) -> None:
+        payload = pickle.dumps(initial_context, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)",
+                (run_id, workflow_name, payload, time.time())
+            )
+
+    def save_node(self, run_id: str, checkpoint: NodeCheckpoint) -> None:
+        payload = pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO nodes VALUES (?, ?, ?)",
+                (run_id, checkpoint.node_id, payload)
+            )
+
+    def load_run(self, run_id: str) -> Optional[RunCheckpoint]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT workflow_name, initial_context, created_at FROM runs WHERE run_id = ?",
+                (run_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            node_rows = self._conn.execute(
+                "SELECT checkpoint FROM nodes WHERE run_id = ?", (run_id,)
+            ).fetchall()
+
+        run = RunCheckpoint(
+            run_id=run_id,
+            workflow_name=row[0],
+            initial_context=pickle.loads(row[1]),
+            created_at=row[2]
+        )
+        for (payload,) in node_rows:
+            checkpoint: NodeCheckpoint = pickle.loads(payload)
+            run.nodes[checkpoint.node_id] = checkpoint
+        return run
+
+    def list_runs(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT run_id FROM runs ORDER BY created_at")]
+
+    def delete_run(self, run_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM nodes WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
@@ -0,0 +1,101 @@
+"""
+Node Duration History
+=====================
+
+Rolling per-node execution times, optionally persisted to a JSON file.
+
+Used by WorkflowArchitecture to estimate node cost for critical-path
+analysis and longest-remaining-path priority scheduling.
+
+Example:
+  history = DurationHistory(".cache/workflow/durations.json")
+  workflow = WorkflowArchitecture("SEO Blog", duration_history=history)
+  await workflow.execute(...)          # records and saves durations
+  path, length_ms = workflow.critical_path()
+"""
+
+import json
+import math
+import os
+from statistics import median
+from typing import Dict, List, Optional
+
+
+class DurationHistory:
+    """
+    Keeps the most recent ``max_samples`` durations (ms) per node id.
+
+    Node ids are used as keys, so use one history file per workflow
+    definition.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_samples: int = 50):
+        """
+        Initialize history.
+
+        Args:
+            path: JSON file to load from and save to (None = in-memory only)
+            max_samples: Samples kept per node (older ones are dropped)
+        """
+        self.path = path
+        self.max_samples = max_samples
+        self._samples: Dict[str, List[float]] = {}
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def record(self, node_id: str, duration_ms: float) -> None:
+        """Add a duration sample for a node."""
+        samples = self._samples.setdefault(node_id, [])
+        samples.append(duration_ms)
+        if len(samples) > self.max_samples:
+            del samples[:len(samples) - self.max_samples]
+
+    def samples(self, node_id: str) -> List[float]:
+        """Recorded samples for a node (oldest first)."""
+        return list(self._samples.get(node_id, []))
+
+    def estimate(self, node_id: str, default: Optional[float] = None) -> Optional[float]:
+        """Median duration in ms (robust to one-off outliers)."""
+        samples = self._samples.get(node_id)
+        return median(samples) if samples else default
+
+    def percentile(self, node_id: str, q: float) -> Optional[float]:
+        """
+        Duration percentile in ms (nearest-rank).
+
+        Args:
+            node_id: Node identifier
+            q: Percentile in [0, 100], e.g. 95 for p95
+        """
+        samples = self._samples.get(node_id)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def estimates(self) -> Dict[str, float]:
+        """Median estimate for every known node."""
+        return {node_id: median(samples) for node_id, samples in self._samples.items() if samples}
+
+    def load(self) -> None:
+        """Load samples from ``self.path``."""
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self._samples = {
+            node_id: [float(value) for value in values][-self.max_samples:]
+            for node_id, values in data.get("nodes", {}).items()
+        }
+
+    def save(self) -> None:
+        """Write samples to ``self.path`` (atomically)."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"nodes": self._samples}, f)
+        os.replace(tmp_path, self.path)
@@ -8,10 +8,19 @@ Uses N1, N2, N3 notation with $H (high) and $L (low) relationship markers.
 Example:
   N1:UserRequest $H→ N2:SearchQuery $H→ N3:SerpResults
   N2:SearchQuery $L← N3:CompetitorAnalysis
+
+Notation text (e.g. produced by an LLM) is loaded back with
+parse_notation() / EntityRelationMap.from_notation().
 """
 
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from collections.abc import MutableMapping, Sequence, ValuesView
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set
+from itertools import accumulate, chain, islice
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 from enum import Enum
 
 
@@ -28,11 +37,46 @@ class EntityLevel(Enum):
     N3 = "N3"  # Tertiary/Output entities
 
 
+# Compact encodings: levels are stored as their index, relations as two flag bits
+_LEVEL_BY_CODE: List[EntityLevel] = list(EntityLevel)
+_LEVEL_CODES: Dict[EntityLevel, int] = {level: code for code, level in enumerate(_LEVEL_BY_CODE)}
+_LOW = 1       # $L (unset: $H)
+_BACKWARD = 2  # ← (unset: →)
+_RELATION_BY_FLAG: List[Tuple[RelationType, str]] = [
+    (RelationType.HIGH, "→"), (RelationType.LOW, "→"), (RelationType.HIGH, "←"), (RelationType.LOW, "←")
+]
+_FLAGS: Dict[Tuple[RelationType, str], int] = {relation: flag for flag, relation in enumerate(_RELATION_BY_FLAG)}
+_FLAG_TOKENS: List[str] = [f"{relation_type.value}{direction}" for relation_type, direction in _RELATION_BY_FLAG]
+
+
+def _data_flow(source: Any, target: Any, backward: bool) -> Tuple[Any, Any]:
+    """
+    (upstream, downstream) ends of a relation along the data flow.
+
+    Data flows source → target, and target → source for ``←`` relations
+    (``A $L← B`` means B feeds A). Every traversal that follows the data
+    flow goes through here.
+    """
+    return (target, source) if backward else (source, target)
+
+# Edges added after the last CSR build are indexed in small dicts until they
+# exceed this many (or a quarter of the indexed edges); then the CSR is rebuilt
+_TAIL_EDGES = 4096
+
+# Reachability is precomputed as one bitset per strongly connected component
+# while components x entities stays within this many bits (16 MiB); larger
+# maps (e.g. long chains) walk the graph per source and memoize the results
+_REACH_BITS_LIMIT = 1 << 27
+_REACH_MEMO = 1024  # Sources whose reachable sets are kept (LRU)
+
+
 @dataclass
 class Entity:
     """
     Represents a workflow entity with hierarchical level.
 
+    Entities hash by ``(name, level)``; equality also compares metadata.
+
     Attributes:
         name: Entity identifier (e.g., "UserRequest", "SearchQuery")
         level: Hierarchical level (N1, N2, or N3)
@@ -40,7 +84,7 @@ class Entity:
     """
     name: str
     level: EntityLevel
-    metadata: Dict[str, any] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
     def __str__(self) -> str:
         return f"{self.level.value}:{self.name}"
@@ -65,23 +109,245 @@ class Relation:
     def __str__(self) -> str:
         return f"{self.source} {self.relation_type.value}{self.direction} {self.target}"
 
+    @property
+    def data_flow(self) -> Tuple[Entity, Entity]:
+        """(upstream, downstream) entities; ``←`` relations point upstream."""
+        return _data_flow(self.source, self.target, self.direction == "←")
+
+
+class NotationSyntaxError(ValueError):
+    """Malformed entity notation; ``line`` and ``column`` are 1-based."""
+
+    def __init__(self, message: str, line: int, column: int, text: str = ""):
+        self.line = line
+        self.column = column
+        self.text = text
+        super().__init__(f"line {line}, column {column}: {message}")
+
+
+class _EntityValues(ValuesView):
+    def __iter__(self) -> Iterator[Entity]:
+        erm = self._mapping._map
+        return (erm._entity(entity_id) for entity_id in range(len(erm._keys)))
+
+
+class _EntityTable(MutableMapping):
+    """
+    ``"N1:Name" -> Entity`` view of a map's entities, in insertion order.
+
+    Assigning an entity registers it (replacing the entity stored under its
+    key); entities cannot be removed, since relations refer to them by id.
+    """
+
+    def __init__(self, erm: "EntityRelationMap"):
+        self._map = erm
+
+    def __getitem__(self, key: str) -> Entity:
+        return self._map._entity(self._map._ids[key])
+
+    def __setitem__(self, key: str, entity: Entity) -> None:
+        if not isinstance(entity, Entity):
+            raise TypeError(f"Expected an Entity, got {type(entity).__name__}")
+        if key != str(entity):
+            raise KeyError(f"Entity {entity} must be stored under '{entity}', not '{key}'")
+        self._map._store(entity)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Entities cannot be removed from a map; build a new one (e.g. with subgraph())")
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._map._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._map._keys)
+
+    def __len__(self) -> int:
+        return len(self._map._keys)
+
+    def values(self) -> _EntityValues:
+        return _EntityValues(self)
+
+
+class _RelationList(Sequence):
+    """
+    View of a map's relations, in insertion order.
+
+    ``append``/``extend`` add relations like add_relation(); relations
+    cannot be removed or reordered.
+    """
+
+    def __init__(self, erm: "EntityRelationMap"):
+        self._map = erm
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Relation, List[Relation]]:
+        if isinstance(index, slice):
+            return [self._map._relation(i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("relation index out of range")
+        return self._map._relation(index)
+
+    def __iter__(self) -> Iterator[Relation]:
+        erm = self._map
+        return (erm._relation(index) for index in range(len(erm._flags)))
+
+    def __len__(self) -> int:
+        return len(self._map._flags)
+
+    def append(self, relation: Relation) -> None:
+        self._map.add_relation(relation.source, relation.target, relation.relation_type, relation.direction)
+
+    def extend(self, relations: Iterable[Relation]) -> None:
+        for relation in relations:
+            self.append(relation)
+
+
+def _csr(keys: array, size: int) -> Tuple[array, array]:
+    """Edge ids grouped by ``keys[edge]`` (stable), and the offset of each group."""
+    counts = [0] * size
+    for node, count in Counter(keys).items():
+        counts[node] = count
+    offsets = array("i", accumulate(counts, initial=0))
+    cursor = offsets.tolist()
+    edges = array("i", bytes(4 * len(keys)))
+    for edge, node in enumerate(keys):
+        position = cursor[node]
+        edges[position] = edge
+        cursor[node] = position + 1
+    return offsets, edges
+
+
+def _condense(offsets: array, neighbors: array, size: int) -> Tuple[array, List[List[int]]]:
+    """
+    Strongly connected components (iterative Tarjan).
+
+    Returns:
+        Component index per node, and the components' members; components
+        come sinks first, so every component follows those it reaches
+    """
+    index = array("i", [-1]) * size
+    low = array("i", bytes(4 * size))
+    on_stack = bytearray(size)
+    component = array("i", [-1]) * size
+    components: List[List[int]] = []
+    stack: List[int] = []
+    counter = 0
+    for root in range(size):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, offsets[root])]
+        while work:
+            node, position = work[-1]
+            if position < offsets[node + 1]:
+                work[-1] = (node, position + 1)
+                successor = neighbors[position]
+                if index[successor] == -1:
+                    index[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = 1
+                    work.append((successor, offsets[successor]))
+                elif on_stack[successor] and index[successor] < low[node]:
+                    low[node] = index[successor]
+                continue
+            work.pop()
+            if work and low[node] < low[work[-1][0]]:
+                low[work[-1][0]] = low[node]
+            if low[node] == index[node]:
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component[member] = len(components)
+                    members.append(member)
+                    if member == node:
+                        break
+                components.append(members)
+    return component, components
+
+
+def _bit_ids(bits: int) -> List[int]:
+    """Positions of the set bits, ascending."""
+    digits = bin(bits)[:1:-1]
+    ids = []
+    position = digits.find("1")
+    while position != -1:
+        ids.append(position)
+        position = digits.find("1", position + 1)
+    return ids
+
+
+_WORD = re.compile(r"[^\W_]+|[^\w\s]|_")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough LLM token count: one token per 4 characters of a word, one per symbol.
+
+    Pass a real tokenizer where accuracy matters, e.g.
+    ``count_tokens=lambda text: len(encoding.encode(text))``.
+    """
+    return sum((len(word) + 3) // 4 for word in _WORD.findall(text))
+
 
 class EntityRelationMap:
     """
     Manages entity relationships and dependencies.
     Supports LLM-readable notation for workflow automation.
+
+    Storage is compact so maps with millions of relations stay small:
+    entity keys are interned to integer ids, levels and relation flags
+    ($H/$L, →/←) are bytes, and relations are parallel int arrays indexed
+    forward (source → relations) and in reverse (target → relations) in
+    CSR form. Entity objects are created on first access and kept,
+    Relation objects are built on access; ``entities`` and ``relations``
+    are read-only views. The execution
+    order and reachability along the data flow are computed once and
+    cached until the map changes: a bitset per strongly connected
+    component (a query is a bit test or a union of bitsets), or, when
+    that would exceed _REACH_BITS_LIMIT bits, a per-source walk whose
+    results are memoized.
     """
 
     def __init__(self):
-        self.entities: Dict[str, Entity] = {}
-        self.relations: List[Relation] = []
-        self._adjacency: Dict[Entity, List[Entity]] = {}
+        self._keys: List[str] = []  # id -> "N1:Name"
+        self._ids: Dict[str, int] = {}  # "N1:Name" -> id
+        self._levels = bytearray()  # id -> level code
+        self._entities: List[Optional[Entity]] = []  # id -> Entity, created on first access
+        self._sources = array("i")  # relation -> source id
+        self._targets = array("i")  # relation -> target id
+        self._flags = bytearray()  # relation -> _LOW | _BACKWARD
+        # CSR over the first _csr_edges relations; later ones are in the tail dicts
+        self._out_offsets = array("i", [0])
+        self._out_edges = array("i")
+        self._in_offsets = array("i", [0])
+        self._in_edges = array("i")
+        self._csr_edges = 0
+        self._tail_out: Dict[int, List[int]] = {}
+        self._tail_in: Dict[int, List[int]] = {}
+        self._tail_end = 0
+        self._execution_order: Optional[array] = None  # Cached ids; reset on mutation
+        # (downstream, relation type) -> (offsets, neighbors, component per entity, components)
+        self._reach: Dict[Tuple[bool, Optional[RelationType]], Tuple[array, array, array, List[List[int]]]] = {}
+        # (downstream, relation type) -> reachable-entity bits per component (None = map too large)
+        self._reach_bits: Dict[Tuple[bool, Optional[RelationType]], Optional[List[int]]] = {}
+        # ((downstream, relation type), source id) -> sorted reachable ids, for maps without bitsets
+        self._reach_memo: "OrderedDict[Tuple[Tuple[bool, Optional[RelationType]], int], array]" = OrderedDict()
+        self.entities = _EntityTable(self)
+        self.relations = _RelationList(self)
 
     def add_entity(self, name: str, level: EntityLevel, metadata: Optional[Dict] = None) -> Entity:
-        """Register a new entity in the map."""
-        entity = Entity(name=name, level=level, metadata=metadata or {})
-        self.entities[f"{level.value}:{name}"] = entity
-        self._adjacency[entity] = []
+        """Register a new entity in the map (replacing an entity with the same key; its relations are kept)."""
+        return self._store(Entity(name=name, level=level, metadata=metadata or {}))
+
+    def _store(self, entity: Entity) -> Entity:
+        entity_id = self._intern(str(entity), _LEVEL_CODES[entity.level])
+        self._entities[entity_id] = entity
         return entity
 
     def add_relation(
@@ -91,43 +357,473 @@ class EntityRelationMap:
         relation_type: RelationType,
         direction: str = "→"
     ) -> Relation:
-        """Create a directed relationship between entities."""
-        relation = Relation(
-            source=source,
-            target=target,
-            relation_type=relation_type,
-            direction=direction
+        """
+        Create a directed relationship between entities.
+
+        Raises:
+            KeyError: ``source`` or ``target`` was not added to this map
+            ValueError: ``direction`` is not → or ←
+        """
+        source_id, target_id = self._resolve(source), self._resolve(target)
+        if direction == "→":
+            flag = 0
+        elif direction == "←":
+            flag = _BACKWARD
+        else:
+            raise ValueError(f"Unknown direction {direction!r} (expected → or ←)")
+        if relation_type is RelationType.LOW:
+            flag |= _LOW
+        return self._relation(self._link(source_id, target_id, flag))
+
+    def _intern(self, key: str, level_code: int) -> int:
+        entity_id = self._ids.get(key)
+        if entity_id is None:
+            entity_id = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._levels.append(level_code)
+            self._entities.append(None)
+            self._changed()
+        return entity_id
+
+    def _entity(self, entity_id: int) -> Entity:
+        entity = self._entities[entity_id]
+        if entity is None:
+            name = self._keys[entity_id].partition(":")[2]
+            entity = self._entities[entity_id] = Entity(name, _LEVEL_BY_CODE[self._levels[entity_id]])
+        return entity
+
+    def _relation(self, index: int) -> Relation:
+        relation_type, direction = _RELATION_BY_FLAG[self._flags[index]]
+        return Relation(
+            self._entity(self._sources[index]), self._entity(self._targets[index]), relation_type, direction
         )
-        self.relations.append(relation)
-        self._adjacency[source].append(target)
-        return relation
 
-    def get_dependencies(self, entity: Entity) -> List[Entity]:
-        """Get all entities that this entity depends on."""
-        return self._adjacency.get(entity, [])
+    def _link(self, source: int, target: int, flag: int) -> int:
+        self._sources.append(source)
+        self._targets.append(target)
+        self._flags.append(flag)
+        self._changed()
+        return len(self._flags) - 1
+
+    def _changed(self) -> None:
+        """Drop everything derived from the graph's shape."""
+        self._execution_order = None
+        self._reach.clear()
+        self._reach_bits.clear()
+        self._reach_memo.clear()
+
+    def _sync(self, full: bool = False) -> None:
+        """Index relations added since the last call; ``full`` forces a complete CSR."""
+        count = len(self._flags)
+        if full:
+            if self._csr_edges != count or len(self._out_offsets) != len(self._keys) + 1:
+                self._build_csr()
+            return
+        if self._tail_end == count:
+            return
+        if count - self._csr_edges > max(_TAIL_EDGES, self._csr_edges // 4):
+            self._build_csr()
+            return
+        sources, targets = self._sources, self._targets
+        for edge in range(self._tail_end, count):
+            self._tail_out.setdefault(sources[edge], []).append(edge)
+            self._tail_in.setdefault(targets[edge], []).append(edge)
+        self._tail_end = count
+
+    def _build_csr(self) -> None:
+        size = len(self._keys)
+        self._out_offsets, self._out_edges = _csr(self._sources, size)
+        self._in_offsets, self._in_edges = _csr(self._targets, size)
+        self._csr_edges = self._tail_end = len(self._flags)
+        self._tail_out.clear()
+        self._tail_in.clear()
+
+    def _incident(self, entity_id: int, outgoing: bool = True) -> Iterable[int]:
+        """Relation ids leaving (or entering) an entity, in insertion order."""
+        self._sync()
+        offsets, edges, tail = (
+            (self._out_offsets, self._out_edges, self._tail_out) if outgoing
+            else (self._in_offsets, self._in_edges, self._tail_in)
+        )
+        indexed = edges[offsets[entity_id]:offsets[entity_id + 1]] if entity_id < len(offsets) - 1 else ()
+        pending = tail.get(entity_id)
+        return list(indexed) + pending if pending else indexed
+
+    def _neighbors(self, entity: Entity, relation_type: Optional[RelationType], outgoing: bool) -> List[Entity]:
+        entity_id = self._ids.get(str(entity)) if isinstance(entity, Entity) else None
+        if entity_id is None:
+            return []
+        ends = self._targets if outgoing else self._sources
+        edges = self._incident(entity_id, outgoing)
+        if relation_type is None:
+            return [self._entity(ends[edge]) for edge in edges]
+        flags, wanted = self._flags, _LOW if relation_type is RelationType.LOW else 0
+        return [self._entity(ends[edge]) for edge in edges if flags[edge] & _LOW == wanted]
+
+    def get_dependencies(self, entity: Entity, relation_type: Optional[RelationType] = None) -> List[Entity]:
+        """Get all entities that this entity depends on (optionally of one relation type)."""
+        return self._neighbors(entity, relation_type, outgoing=True)
 
     def get_high_priority_dependencies(self, entity: Entity) -> List[Entity]:
         """Get only high-priority ($H) dependencies."""
-        deps = []
-        for relation in self.relations:
-            if relation.source == entity and relation.relation_type == RelationType.HIGH:
-                deps.append(relation.target)
-        return deps
+        return self._neighbors(entity, RelationType.HIGH, outgoing=True)
+
+    def get_dependents(self, entity: Entity, relation_type: Optional[RelationType] = None) -> List[Entity]:
+        """Get the entities with a relation to this entity (reverse of get_dependencies)."""
+        return self._neighbors(entity, relation_type, outgoing=False)
+
+    def _resolve(self, entity: Union[Entity, str]) -> int:
+        entity_id = self._ids.get(str(entity) if isinstance(entity, Entity) else entity)
+        if entity_id is None:
+            raise KeyError(f"Unknown entity {entity}")
+        return entity_id
 
-    def to_notation(self) -> str:
+    def _flow_index(
+        self,
+        downstream: bool,
+        relation_type: Optional[RelationType]
+    ) -> Tuple[array, array, array, List[List[int]]]:
+        """
+        Data-flow adjacency, computed once per direction and type.
+
+        Returns:
+            CSR offsets and neighbors along the data flow (against it when
+            ``downstream`` is False), the strongly connected component of
+            every entity, and the components' members; components are
+            numbered sinks first
+        """
+        key = (downstream, relation_type)
+        cached = self._reach.get(key)
+        if cached is not None:
+            return cached
+
+        size = len(self._keys)
+        wanted = None if relation_type is None else (_LOW if relation_type is RelationType.LOW else 0)
+        tails, heads = array("i"), array("i")
+        for source, target, flag in zip(self._sources, self._targets, self._flags):
+            if wanted is not None and flag & _LOW != wanted:
+                continue
+            upstream, downstream_id = _data_flow(source, target, flag & _BACKWARD)
+            tails.append(upstream if downstream else downstream_id)
+            heads.append(downstream_id if downstream else upstream)
+        offsets, edges = _csr(tails, size)
+        neighbors = array("i", (heads[edge] for edge in edges))
+        component, components = _condense(offsets, neighbors, size)
+        cached = self._reach[key] = (offsets, neighbors, component, components)
+        return cached
+
+    def _component_bits(self, downstream: bool, relation_type: Optional[RelationType]) -> Optional[List[int]]:
+        """
+        Transitive closure over the condensation, computed once per direction and type.
+
+        Each component gets the bitset (a Python int over entity ids) of
+        every entity it reaches through at least one relation. Returns None
+        when components x entities exceeds _REACH_BITS_LIMIT bits.
+        """
+        key = (downstream, relation_type)
+        if key in self._reach_bits:
+            return self._reach_bits[key]
+        offsets, neighbors, component, components = self._flow_index(downstream, relation_type)
+        if len(components) * len(self._keys) > _REACH_BITS_LIMIT:
+            self._reach_bits[key] = None
+            return None
+
+        members = [sum(1 << member for member in group) for group in components]
+        reach = [0] * len(components)
+        for index, group in enumerate(components):
+            bits = 0
+            seen = set()
+            for node in group:
+                for position in range(offsets[node], offsets[node + 1]):
+                    other = component[neighbors[position]]
+                    if other == index:
+                        bits |= members[index]  # On a cycle: reaches itself
+                    elif other not in seen:
+                        seen.add(other)
+                        bits |= members[other] | reach[other]
+            reach[index] = bits
+        self._reach_bits[key] = reach
+        return reach
+
+    def _walk(self, root: int, downstream: bool, relation_type: Optional[RelationType]) -> array:
+        """Sorted ids reachable from ``root`` (breadth-first), memoized per source."""
+        memo_key = ((downstream, relation_type), root)
+        cached = self._reach_memo.get(memo_key)
+        if cached is not None:
+            self._reach_memo.move_to_end(memo_key)
+            return cached
+
+        offsets, neighbors = self._flow_index(downstream, relation_type)[:2]
+        seen = set()
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for position in range(offsets[node], offsets[node + 1]):
+                neighbor = neighbors[position]
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        reached = self._reach_memo[memo_key] = array("i", sorted(seen))
+        if len(self._reach_memo) > _REACH_MEMO:
+            self._reach_memo.popitem(last=False)
+        return reached
+
+    def _reach_ids(self, roots: Iterable[int], downstream: bool, relation_type: Optional[RelationType]) -> List[int]:
+        """
+        Ids reachable from any of ``roots`` through at least one relation, ascending.
+
+        A root is included only if it is reached again (it lies on a cycle).
+        """
+        bits = self._component_bits(downstream, relation_type)
+        if bits is not None:
+            component = self._reach[(downstream, relation_type)][2]
+            union = 0
+            for root in roots:
+                union |= bits[component[root]]
+            return _bit_ids(union)
+        roots = list(roots)
+        if len(roots) == 1:
+            return list(self._walk(roots[0], downstream, relation_type))
+        reached = set()
+        for root in roots:
+            reached.update(self._walk(root, downstream, relation_type))
+        return sorted(reached)
+
+    def get_descendants(self, entity: Union[Entity, str], relation_type: Optional[RelationType] = None) -> List[Entity]:
+        """
+        Get every entity downstream of this one along the data flow.
+
+        ``A $H→ B`` makes B downstream of A, ``A $L← B`` makes A downstream
+        of B. The entity itself is included only if it lies on a cycle.
+
+        Args:
+            entity: Entity or its key (e.g. "N3:ArticleTitle")
+            relation_type: Only follow relations of this type (e.g. $H paths)
+
+        Returns:
+            Descendants in insertion order
+        """
+        return [self._entity(entity_id) for entity_id in self._reach_ids([self._resolve(entity)], True, relation_type)]
+
+    def get_ancestors(self, entity: Union[Entity, str], relation_type: Optional[RelationType] = None) -> List[Entity]:
+        """Get every entity upstream of this one (reverse of get_descendants)."""
+        return [self._entity(entity_id) for entity_id in self._reach_ids([self._resolve(entity)], False, relation_type)]
+
+    def reaches(
+        self,
+        source: Union[Entity, str],
+        target: Union[Entity, str],
+        relation_type: Optional[RelationType] = None
+    ) -> bool:
+        """Whether data flows from ``source`` to ``target`` (a bit test or binary search once precomputed)."""
+        source_id, target_id = self._resolve(source), self._resolve(target)
+        bits = self._component_bits(True, relation_type)
+        if bits is not None:
+            component = self._reach[(True, relation_type)][2]
+            return bool(bits[component[source_id]] >> target_id & 1)
+        reached = self._walk(source_id, True, relation_type)
+        position = bisect_left(reached, target_id)
+        return position < len(reached) and reached[position] == target_id
+
+    def get_recompute_set(
+        self,
+        changed: Iterable[Union[Entity, str]],
+        relation_type: Optional[RelationType] = None,
+        levels: Optional[Iterable[EntityLevel]] = None
+    ) -> List[Entity]:
+        """
+        Minimal set of entities to recompute after some entities changed.
+
+        Args:
+            changed: Entities (or keys) whose values changed; they are not
+                recomputed themselves
+            relation_type: Only propagate over relations of this type
+            levels: Only return entities of these levels, e.g. [EntityLevel.N2]
+                for the processing steps to re-run
+
+        Returns:
+            Downstream entities in dependency order (upstream first)
+        """
+        changed_ids = {self._resolve(entity) for entity in changed}
+        component = self._flow_index(True, relation_type)[2]
+        level_codes = None if levels is None else {_LEVEL_CODES[level] for level in levels}
+        stale = [
+            entity_id for entity_id in self._reach_ids(changed_ids, True, relation_type)
+            if entity_id not in changed_ids and (level_codes is None or self._levels[entity_id] in level_codes)
+        ]
+        # Components are numbered sinks first, so a higher number runs earlier
+        stale.sort(key=lambda entity_id: -component[entity_id])
+        return [self._entity(entity_id) for entity_id in stale]
+
+    def subgraph(self, entities: Iterable[Union[Entity, str]]) -> "EntityRelationMap":
+        """
+        Extract the induced subgraph of the given entities.
+
+        Args:
+            entities: Entities (or keys) to keep
+
+        Returns:
+            New map with these entities (metadata copied) and every relation
+            between them, in the original order
+        """
+        keep = sorted({self._resolve(entity) for entity in entities})
+        sub = EntityRelationMap()
+        remap = {}
+        for entity_id in keep:
+            remap[entity_id] = sub._intern(self._keys[entity_id], self._levels[entity_id])
+            entity = self._entities[entity_id]
+            if entity is not None and entity.metadata:
+                sub._entity(remap[entity_id]).metadata = dict(entity.metadata)
+        targets = self._targets
+        edges = sorted(edge for entity_id in keep for edge in self._incident(entity_id) if targets[edge] in remap)
+        for edge in edges:
+            sub._link(remap[self._sources[edge]], remap[targets[edge]], self._flags[edge])
+        return sub
+
+    def to_notation(
+        self,
+        max_tokens: Optional[int] = None,
+        focus: Optional[Union[Entity, str]] = None,
+        count_tokens: Callable[[str], int] = estimate_tokens
+    ) -> str:
         """
         Export to LLM-readable notation.
 
+        Without arguments the whole map is exported, one relation per line.
+        With ``max_tokens`` and/or ``focus`` the most relevant relations are
+        exported first: $H before $L, then fewer hops from the focus entity
+        (in either direction), then insertion order. The longest prefix of
+        that ranking that fits the budget is kept, and connected relations
+        are collapsed into chains (``A $H→ B $H→ C``).
+
+        Args:
+            max_tokens: Token budget for the output (None = no limit)
+            focus: Entity (or key) the export is about
+            count_tokens: Token counter for the budget
+
         Returns:
             Multi-line string with entity relationships:
             N1:UserRequest $H→ N2:SearchQuery $H→ N3:SerpResults
             N2:SearchQuery $L← N3:CompetitorAnalysis
         """
+        keys = self._keys
+        if max_tokens is None and focus is None:
+            lines = [
+                f"{keys[source]} {_FLAG_TOKENS[flag]} {keys[target]}"
+                for source, target, flag in zip(self._sources, self._targets, self._flags)
+            ]
+            # Entities without relations get a line of their own so the map round-trips
+            linked = set(self._sources)
+            linked.update(self._targets)
+            lines.extend(key for entity_id, key in enumerate(keys) if entity_id not in linked)
+            return "\n".join(lines)
+
+        # Every relation adds at least one token, so at most max_tokens of them fit
+        limit = None if max_tokens is None else max(max_tokens, 0)
+        ranked = self._rank_relations(None if focus is None else self._resolve(focus), limit)
+        if max_tokens is None:
+            return self._render_chains(ranked)
+
+        low, high = 0, len(ranked)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count_tokens(self._render_chains(ranked[:middle])) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        text = self._render_chains(ranked[:low])
+        if not text and focus is not None and count_tokens(keys[self._resolve(focus)]) <= max_tokens:
+            text = keys[self._resolve(focus)]
+        return text
+
+    def _rank_relations(self, focus: Optional[int], limit: Optional[int] = None) -> List[int]:
+        """The ``limit`` most relevant relation ids: $H first, then hops from ``focus``, then insertion order."""
+        flags = self._flags
+        if focus is None:
+            ranked = chain(
+                (edge for edge in range(len(flags)) if not flags[edge] & _LOW),
+                (edge for edge in range(len(flags)) if flags[edge] & _LOW)
+            )
+            return list(ranked if limit is None else islice(ranked, limit))
+
+        # Breadth-first from the focus, ignoring direction: a relation first met
+        # from hop d is d hops away. Stop once enough $H relations were found.
+        high: List[int] = []
+        low: List[int] = []
+        seen = set()
+        visited = {focus}
+        layer = [focus]
+        while layer and (limit is None or len(high) < limit):
+            found: List[int] = []
+            next_layer = []
+            for node in layer:
+                for outgoing, ends in ((True, self._targets), (False, self._sources)):
+                    for edge in self._incident(node, outgoing):
+                        if edge in seen:
+                            continue
+                        seen.add(edge)
+                        found.append(edge)
+                        neighbor = ends[edge]
+                        if neighbor not in visited:
+                            visited.add(neighbor)
+                            next_layer.append(neighbor)
+            found.sort()
+            high.extend(edge for edge in found if not flags[edge] & _LOW)
+            low.extend(edge for edge in found if flags[edge] & _LOW)
+            layer = next_layer
+
+        if limit is not None and len(high) >= limit:
+            return high[:limit]
+        # Relations not connected to the focus rank last within their type
+        unseen_high = (edge for edge in range(len(flags)) if not flags[edge] & _LOW and edge not in seen)
+        unseen_low = (edge for edge in range(len(flags)) if flags[edge] & _LOW and edge not in seen)
+        ranked = chain(high, unseen_high, low, unseen_low)
+        return list(ranked if limit is None else islice(ranked, limit))
+
+    def _render_chains(self, edges: List[int]) -> str:
+        """Notation for the given relations, joining consecutive ones into chains; lines follow ``edges`` order."""
+        keys, sources, targets, flags = self._keys, self._sources, self._targets, self._flags
+        by_source: Dict[int, deque] = {}
+        by_target: Dict[int, deque] = {}
+        for edge in edges:
+            by_source.setdefault(sources[edge], deque()).append(edge)
+            by_target.setdefault(targets[edge], deque()).append(edge)
+
+        def take(candidates: Optional[deque]) -> Optional[int]:
+            while candidates:
+                edge = candidates.popleft()
+                if edge not in used:
+                    used.add(edge)
+                    return edge
+            return None
+
+        used = set()
         lines = []
-        for relation in self.relations:
-            lines.append(str(relation))
+        for edge in edges:
+            if edge in used:
+                continue
+            used.add(edge)
+            links = deque([edge])
+            following = take(by_source.get(targets[links[-1]]))
+            while following is not None:
+                links.append(following)
+                following = take(by_source.get(targets[following]))
+            preceding = take(by_target.get(sources[links[0]]))
+            while preceding is not None:
+                links.appendleft(preceding)
+                preceding = take(by_target.get(sources[preceding]))
+            parts = [keys[sources[links[0]]]]
+            for link in links:
+                parts.append(_FLAG_TOKENS[flags[link]])
+                parts.append(keys[targets[link]])
+            lines.append(" ".join(parts))
         return "\n".join(lines)
 
+    @classmethod
+    def from_notation(cls, notation: Union[str, Iterable[str]]) -> "EntityRelationMap":
+        """Build a map from notation text (see parse_notation)."""
+        return parse_notation(notation)
+
     def visualize_ascii(self) -> str:
         """Generate ASCII visualization of the entity map."""
         output = ["Entity Relation Map", "=" * 50, ""]
@@ -159,26 +855,141 @@ class EntityRelationMap:
         """
         Topological sort to determine execution order.
         Returns entities in dependency-resolved order.
+
+        Relations are followed along the data flow, so for ``A $L← B`` B
+        comes before A. The order is cached until an entity or relation is
+        added. Entities on a cycle are left out.
         """
-        # Kahn's algorithm for topological sorting
-        in_degree = {entity: 0 for entity in self.entities.values()}
+        if self._execution_order is None:
+            # Kahn's algorithm for topological sorting, over the data-flow CSR
+            offsets, neighbors = self._flow_index(True, None)[:2]
+            in_degree = [0] * len(self._keys)
+            for neighbor in neighbors:
+                in_degree[neighbor] += 1
 
-        for relation in self.relations:
-            in_degree[relation.target] += 1
+            queue = deque(entity_id for entity_id, degree in enumerate(in_degree) if degree == 0)
+            execution_order = array("i")
 
-        queue = [entity for entity, degree in in_degree.items() if degree == 0]
-        execution_order = []
+            while queue:
+                current = queue.popleft()
+                execution_order.append(current)
 
-        while queue:
-            current = queue.pop(0)
-            execution_order.append(current)
+                for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                    in_degree[neighbor] -= 1
+                    if in_degree[neighbor] == 0:
+                        queue.append(neighbor)
+
+            self._execution_order = execution_order
+
+        return [self._entity(entity_id) for entity_id in self._execution_order]
+
+
+# Relation tokens (-> flag), including ASCII arrows as LLMs often write them
+_RELATION_TOKENS: Dict[str, int] = {}
+for (_type, _direction), _flag in _FLAGS.items():
+    for _arrow in ((_direction, "->") if _direction == "→" else (_direction, "<-")):
+        _RELATION_TOKENS[f"{_type.value}{_arrow}"] = _flag
+_LEVELS = {level.value: _LEVEL_CODES[level] for level in EntityLevel}
+
+# Fallback tokenizer for lines that do not split cleanly on whitespace (e.g. "N1:A $H→N2:B")
+_TOKEN = re.compile(r"\s*(?:(?P<relation>\$[HL](?:→|←|->|<-))|(?P<entity>[^\s$]+))")
 
-            for neighbor in self._adjacency.get(current, []):
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
 
-        return execution_order
+def _tokenize(line: str, line_no: int) -> List[Tuple[str, int]]:
+    """Split a line into (token, column) pairs, reporting characters that fit no token."""
+    tokens = []
+    position = 0
+    stripped_end = len(line.rstrip())
+    while position < stripped_end:
+        match = _TOKEN.match(line, position)
+        if match is None or match.end() == position:
+            column = len(line) - len(line[position:].lstrip()) + 1
+            raise NotationSyntaxError(
+                f"unexpected '{line[column - 1]}' (expected an entity like N2:Name or $H→/$L←)",
+                line_no, column, line
+            )
+        group = "relation" if match.group("relation") else "entity"
+        tokens.append((match.group(group), match.start(group) + 1))
+        position = match.end()
+    return tokens
+
+
+def parse_notation(notation: Union[str, Iterable[str]]) -> EntityRelationMap:
+    """
+    Parse N1/N2/N3 notation into an EntityRelationMap in a single pass.
+
+    Each line is an entity, optionally followed by relation/entity pairs;
+    chains such as ``A $H→ B $L← C`` add one relation per pair. Lines that
+    are empty or start with ``#`` are skipped. ``->`` and ``<-`` are
+    accepted as arrows. Entities are created on first mention (without
+    metadata).
+
+    Args:
+        notation: Notation text, or an iterable of lines (e.g. an open file)
+
+    Returns:
+        The parsed map; ``parse_notation(erm.to_notation()).to_notation()``
+        reproduces the input
+
+    Raises:
+        NotationSyntaxError: With the 1-based line and column of the problem
+    """
+    erm = EntityRelationMap()
+    ids = erm._ids
+    lines = notation.splitlines() if isinstance(notation, str) else notation
+
+    for line_no, line in enumerate(lines, 1):
+        parts = line.split()
+        if not parts or parts[0].startswith("#"):
+            continue
+        tokens: Optional[List[Tuple[str, int]]] = None
+        if (len(parts) % 2 == 0 or line.count("$") != len(parts) // 2
+                or any(not parts[i].startswith("$") for i in range(1, len(parts), 2))):
+            # Whitespace is missing around a token (or the line is malformed): tokenize properly
+            tokens = _tokenize(line, line_no)
+            for index, (token, column) in enumerate(tokens):
+                if token.startswith("$") != bool(index % 2):
+                    expected = "a relation like $H→ or $L←" if index % 2 else "an entity"
+                    raise NotationSyntaxError(f"expected {expected}, found '{token}'", line_no, column, line)
+            if len(tokens) % 2 == 0:
+                token, column = tokens[-1]
+                raise NotationSyntaxError(f"expected an entity after '{token}'", line_no, column + len(token), line)
+            parts = [token for token, _ in tokens]
+
+        previous = -1
+        flag = 0
+        for index, token in enumerate(parts):
+            if index % 2:
+                flag = _RELATION_TOKENS.get(token)
+                if flag is None:
+                    raise NotationSyntaxError(
+                        f"unknown relation '{token}' (expected $H→, $H←, $L→ or $L←)",
+                        line_no, _column(line, line_no, tokens, index), line
+                    )
+                continue
+
+            entity_id = ids.get(token)
+            if entity_id is None:
+                level_name, _, name = token.partition(":")
+                level_code = _LEVELS.get(level_name)
+                if level_code is None or not name:
+                    raise NotationSyntaxError(
+                        f"invalid entity '{token}' (expected N1:Name, N2:Name or N3:Name)",
+                        line_no, _column(line, line_no, tokens, index), line
+                    )
+                entity_id = erm._intern(token, level_code)
+            if previous >= 0:
+                erm._link(previous, entity_id, flag)
+            previous = entity_id
+
+    return erm
+
+
+def _column(line: str, line_no: int, tokens: Optional[List[Tuple[str, int]]], index: int) -> int:
+    """1-based column of the index-th token (re-tokenizes on the error path only)."""
+    if tokens is None:
+        tokens = _tokenize(line, line_no)
+    return tokens[index][1]
 
 
 # Example usage for SEO Blog Generator
@@ -192,6 +1003,7 @@ def create_seo_blog_entity_map() -> EntityRelationMap:
       N3:CompetitorContent $H→ N2:IntentAnalyzer $H→ N3:UserIntent
       N3:UserIntent $H→ N2:TitleGenerator $H→ N3:ArticleTitle
       N3:ArticleTitle $H→ N2:StructureGenerator $H→ N3:Headings
+      N3:UserIntent $H→ N2:StructureGenerator
       N3:Headings $H→ N2:ContentGenerator $H→ N3:ArticleContent (PARALLEL)
     """
     erm = EntityRelationMap()
@@ -205,7 +1017,7 @@ def create_seo_blog_entity_map() -> EntityRelationMap:
     intent_analyzer = erm.add_entity("IntentAnalyzer", EntityLevel.N2, {"agent": "gpt4"})
     title_generator = erm.add_entity("TitleGenerator", EntityLevel.N2, {"agent": "gpt4"})
     structure_generator = erm.add_entity("StructureGenerator", EntityLevel.N2, {"agent": "gpt4"})
-    content_generator = erm.add_entity("ContentGenerator", EntityLevel.N2, {"agent": "gpt4", "parallel": True})
+    content_generator = erm.add_entity("ContentGenerator", EntityLevel.N2, {"agent": "gpt4", "parallel": True, "items": "headings"})
 
     # N3: Outputs
     top_results = erm.add_entity("TopResults", EntityLevel.N3, {"type": "urls"})
@@ -225,6 +1037,7 @@ def create_seo_blog_entity_map() -> EntityRelationMap:
     erm.add_relation(user_intent, title_generator, RelationType.HIGH)
     erm.add_relation(title_generator, article_title, RelationType.HIGH)
     erm.add_relation(article_title, structure_generator, RelationType.HIGH)
+    erm.add_relation(user_intent, structure_generator, RelationType.HIGH)
     erm.add_relation(structure_generator, headings, RelationType.HIGH)
     erm.add_relation(headings, content_generator, RelationType.HIGH)
     erm.add_relation(content_generator, article_content, RelationType.HIGH)
@@ -240,3 +1053,15 @@ if __name__ == "__main__":
     print("Execution Order:")
     for i, entity in enumerate(erm.get_execution_order(), 1):
         print(f"  {i}. {entity}")
+
+    # Round-trip through the notation
+    parsed = parse_notation(erm.to_notation())
+    print(f"\nParsed back: {len(parsed.entities)} entities, {len(parsed.relations)} relations, "
+          f"identical notation: {parsed.to_notation() == erm.to_notation()}")
+
+    # Impact analysis: what to re-run after editing the title
+    stale = erm.get_recompute_set(["N3:ArticleTitle"], levels=[EntityLevel.N2])
+    print(f"Recompute after ArticleTitle changes: {', '.join(entity.name for entity in stale)}")
+
+    # Prompt-sized excerpt around one entity
+    print(f"\nWithin 40 tokens of ArticleTitle:\n{erm.to_notation(max_tokens=40, focus='N3:ArticleTitle')}")
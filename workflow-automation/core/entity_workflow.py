@@ -0,0 +1,197 @@
+"""
+Entity Map Compiler
+===================
+
+Turns an EntityRelationMap into an executable WorkflowArchitecture, so the
+map that documents a pipeline is also what runs it.
+
+Mapping:
+- N2 (processing) entities become nodes with the entity name as node id.
+  Each binds to an executor from the registry, looked up by entity name,
+  then by ``metadata["executor"]``, then by ``metadata["agent"]``.
+- N1 (input) entities are initial context keys; they add no dependencies.
+- N3 (output) entities are the data handed between steps: ``A → N3:X → B``
+  makes node B depend on node A (chains of N3 entities are followed).
+- ``$H`` edges become required dependencies and ``$L`` edges optional ones
+  (a path is only as strong as its weakest edge; any ``$H`` path wins).
+  ``←`` reverses an edge: ``A $L← B`` means B feeds A.
+- ``metadata["parallel"]`` turns the node into a map node fanning out over
+  the result of its required upstream node (``metadata["source"]`` picks
+  one if there are several); ``metadata["items"]`` names the key or
+  attribute holding the items, ``metadata["reduce"]`` a registry entry
+  combining the child results.
+- ``metadata["stage"]`` (a WorkflowStage value) sets the stage, and
+  ``agent_resources`` maps ``metadata["agent"]`` to a resource pool.
+
+Each node's result is published under its node id, so executors read
+upstream results as ``ctx["SerpQuery"]``.
+
+Example:
+  workflow = compile_entity_map(
+      create_seo_blog_entity_map(),
+      executors={"SerpQuery": fetch_serp, "WebScraper": scrape, ...},
+      agent_resources={"serp": "serp", "scraper": "scraper", "gpt4": "openai"},
+      resource_limits={"serp": 2, "scraper": 5, "openai": 3},
+  )
+  result = await workflow.execute({"Keyword": "AI automation"})
+"""
+
+import os
+import sys
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.entity_mapping import Entity, EntityLevel, EntityRelationMap, RelationType
+from core.task_queue import resolve_executor
+from core.workflow_architecture import WorkflowArchitecture, WorkflowStage
+
+
+def _flow_edges(erm: EntityRelationMap) -> Dict[Entity, List[Tuple[Entity, bool]]]:
+    """Incoming data-flow edges per entity as (upstream, required)."""
+    incoming: Dict[Entity, List[Tuple[Entity, bool]]] = {entity: [] for entity in erm.entities.values()}
+    for relation in erm.relations:
+        upstream, downstream = relation.data_flow
+        incoming[downstream].append((upstream, relation.relation_type == RelationType.HIGH))
+    return incoming
+
+
+def _producers(
+    entity: Entity,
+    incoming: Dict[Entity, List[Tuple[Entity, bool]]]
+) -> Dict[str, bool]:
+    """
+    N2 entities feeding ``entity`` directly or through N3 entities.
+
+    Returns:
+        Node id -> required (True if reachable over $H edges only)
+    """
+    found: Dict[str, bool] = {}
+    # (entity, required so far); an entity is revisited only if reached more strongly
+    best: Dict[Entity, bool] = {}
+    stack = [(upstream, required) for upstream, required in incoming[entity]]
+    while stack:
+        current, required = stack.pop()
+        if current in best and (best[current] or not required):
+            continue
+        best[current] = required
+        if current.level == EntityLevel.N2:
+            found[current.name] = found.get(current.name, False) or required
+        elif current.level == EntityLevel.N3:
+            stack.extend((upstream, required and edge_required) for upstream, edge_required in incoming[current])
+    return found
+
+
+def _items_getter(key: str) -> Callable[[Any], Any]:
+    def items(value: Any) -> Any:
+        return value[key] if isinstance(value, Mapping) else getattr(value, key)
+    return items
+
+
+def _bind(entity: Entity, executors: Dict[str, Callable]) -> Optional[Callable]:
+    if entity.name in executors:
+        return executors[entity.name]
+    ref = entity.metadata.get("executor")
+    if ref is not None:
+        return executors[ref] if ref in executors else resolve_executor(ref)
+    return executors.get(entity.metadata.get("agent"))
+
+
+def compile_entity_map(
+    erm: EntityRelationMap,
+    executors: Dict[str, Callable],
+    name: str = "Entity Workflow",
+    agent_resources: Optional[Dict[str, str]] = None,
+    default_stage: WorkflowStage = WorkflowStage.IMPLEMENTATION,
+    **workflow_kwargs
+) -> WorkflowArchitecture:
+    """
+    Compile an entity map into a validated workflow.
+
+    Args:
+        erm: Entity map to compile
+        executors: Callables by entity name, ``metadata["executor"]`` or
+            ``metadata["agent"]`` (also holds reduce functions)
+        name: Workflow name
+        agent_resources: Resource pool per agent, e.g. {"gpt4": "openai"}
+        default_stage: Stage for entities without ``metadata["stage"]``
+        **workflow_kwargs: Passed to WorkflowArchitecture (resource_limits, cache, ...)
+
+    Returns:
+        Workflow with one node per N2 entity
+
+    Raises:
+        ValueError: Unbound N2 entities, an ambiguous fan-out source, cycles
+            or unknown resource pools
+    """
+    incoming = _flow_edges(erm)
+    processors = [entity for entity in erm.entities.values() if entity.level == EntityLevel.N2]
+    unbound = [entity.name for entity in processors if _bind(entity, executors) is None]
+    if unbound:
+        raise ValueError(f"No executor registered for N2 entit(ies): {', '.join(unbound)}")
+
+    workflow = WorkflowArchitecture(name, **workflow_kwargs)
+    agent_resources = agent_resources or {}
+    for entity in processors:
+        metadata = entity.metadata
+        producers = _producers(entity, incoming)
+        producers.pop(entity.name, None)  # Self-loops through N3 entities are not dependencies
+        required = [node_id for node_id, is_required in producers.items() if is_required]
+        optional = [node_id for node_id, is_required in producers.items() if not is_required]
+        agent = metadata.get("agent")
+        resources = [agent_resources[agent]] if agent in agent_resources else list(metadata.get("resources", []))
+        options: Dict[str, Any] = {"resources": resources, "optional_dependencies": optional}
+        stage = WorkflowStage(metadata["stage"]) if "stage" in metadata else default_stage
+        executor = _bind(entity, executors)
+
+        if metadata.get("parallel"):
+            source = metadata.get("source")
+            if source is None and len(required) == 1:
+                source = required[0]
+            if source not in required:
+                raise ValueError(
+                    f"Parallel entity {entity} needs metadata['source'] naming one of its required "
+                    f"upstream N2 entities ({', '.join(required) or 'none'})"
+                )
+            reduce = executors[metadata["reduce"]] if "reduce" in metadata else None
+            items = _items_getter(metadata["items"]) if "items" in metadata else None
+            workflow.add_map_node(
+                entity.name, entity.name, stage, source, executor,
+                items=items, reduce=reduce, dependencies=required, **options
+            )
+        else:
+            workflow.add_node(entity.name, entity.name, stage, executor, dependencies=required, **options)
+
+    workflow.compute_execution_order()
+    workflow.validate_resources()
+    return workflow
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    from core.entity_mapping import create_seo_blog_entity_map
+
+    def step(entity_name: str):
+        async def executor(ctx, *item):
+            await asyncio.sleep(0.05)
+            upstream = [key for key in ctx if not key.startswith("_")]
+            label = f"{entity_name}[{item[0]}]" if item else entity_name
+            return f"{label} <- {', '.join(upstream)}"
+        return executor
+
+    async def write_structure(ctx):
+        await asyncio.sleep(0.05)
+        return {"headings": ["Intro", "Benefits", "Conclusion"]}
+
+    erm = create_seo_blog_entity_map()
+    registry = {entity.name: step(entity.name) for entity in erm.entities.values()}
+    registry["StructureGenerator"] = write_structure
+    workflow = compile_entity_map(erm, registry, name="SEO Blog (compiled)")
+    print(workflow.visualize_dag())
+
+    result = asyncio.run(workflow.execute({"Keyword": "AI automation"}))
+    print(f"\nSuccess: {result.success} in {result.total_duration_ms:.0f}ms")
+    for line in result.results["ContentGenerator"]:
+        print(f"  {line}")
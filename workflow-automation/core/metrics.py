@@ -0,0 +1,329 @@
+"""
+Workflow Metrics
+================
+
+Live counters, gauges and histograms for running workflows, rendered in the
+Prometheus text exposition format.
+
+WorkflowMetricsExporter is a SpanExporter, so it plugs into the existing
+tracer and sees every run, node, attempt and skip while they happen:
+
+  workflow_runs_active{workflow}                 gauge
+  workflow_runs_total{workflow,status}           counter (ok / error)
+  workflow_run_duration_seconds{workflow}        histogram
+  workflow_nodes_total{workflow,status}          counter (completed / failed / cancelled / skipped / cached)
+  workflow_nodes_queued{workflow}                gauge   (waiting for a pool slot)
+  workflow_nodes_in_flight{workflow}             gauge   (executing right now)
+  workflow_node_duration_seconds{workflow,stage} histogram
+  workflow_node_queue_wait_seconds{workflow}     histogram
+  workflow_node_retries_total{workflow}          counter
+  workflow_pool_in_use{pool} / workflow_pool_waiting{pool}   gauges (track_pools)
+
+Example:
+  metrics = WorkflowMetricsExporter()
+  tracer = Tracer([ConsoleSpanExporter(), metrics])
+  workflow = WorkflowArchitecture("SEO Blog", tracer=tracer, resource_limits={"openai": 3})
+  metrics.track_pools(workflow)
+  start_metrics_server(metrics.registry, port=9108)   # GET /metrics
+"""
+
+import bisect
+import math
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.tracing import Span, SpanEvent, SpanExporter
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(values: Dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in values.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+
+    def samples(self) -> Iterable[Tuple[str, Labels, float, Optional[Tuple[str, str]]]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _labels(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name, labels, value, None
+
+
+class Gauge(_Metric):
+    """Value that can go up and down per label set."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self.values: Dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[_labels(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _labels(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name, labels, value, None
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = sorted(buckets)
+        self.values: Dict[Labels, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _labels(labels)
+        counts, total, count = self.values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(counts):
+            counts[index] += 1
+        self.values[key] = (counts, total + value, count + 1)
+
+    def samples(self):
+        for labels, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", labels, cumulative, ("le", _format_value(bound))
+            yield f"{self.name}_bucket", labels, count, ("le", "+Inf")
+            yield f"{self.name}_sum", labels, total, None
+            yield f"{self.name}_count", labels, count, None
+
+
+class MetricsRegistry:
+    """
+    Holds metrics and renders them in Prometheus text format.
+
+    Updates and rendering are serialized by a lock, so the registry can be
+    scraped from an HTTP thread while the event loop updates it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges right before each render."""
+        self._collectors.append(collector)
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if existing.kind != metric.kind:
+                raise ValueError(f"Metric '{metric.name}' already registered as a {existing.kind}")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition (version 0.0.4)."""
+        lines = []
+        with self.lock:
+            for collector in self._collectors:
+                collector()
+            for metric in self._metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                for name, labels, value, extra in metric.samples():
+                    lines.append(f"{name}{_format_labels(labels, extra)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class WorkflowMetricsExporter(SpanExporter):
+    """Turns workflow/node spans into live metrics."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.runs_active = r.gauge("workflow_runs_active", "Workflow runs currently executing")
+        self.runs_total = r.counter("workflow_runs_total", "Finished workflow runs by status")
+        self.run_duration = r.histogram("workflow_run_duration_seconds", "Workflow run duration", buckets)
+        self.nodes_total = r.counter("workflow_nodes_total", "Finished nodes by status")
+        self.nodes_queued = r.gauge("workflow_nodes_queued", "Nodes waiting for a pool slot")
+        self.nodes_in_flight = r.gauge("workflow_nodes_in_flight", "Nodes executing right now")
+        self.node_duration = r.histogram("workflow_node_duration_seconds", "Node duration by stage", buckets)
+        self.queue_wait = r.histogram("workflow_node_queue_wait_seconds", "Time a node attempt waited for pools", buckets)
+        self.retries = r.counter("workflow_node_retries_total", "Node retries")
+        self.hedges = r.counter("workflow_node_hedges_total", "Hedged duplicate attempts by outcome")
+        self.pool_in_use = r.gauge("workflow_pool_in_use", "Resource pool slots held")
+        self.pool_waiting = r.gauge("workflow_pool_waiting", "Callers queued on a resource pool")
+
+        self._workflow_names: Dict[str, str] = {}  # workflow span id -> name
+        self._node_state: Dict[str, Tuple[str, str]] = {}  # node span id -> (workflow, "queued"/"running")
+
+    def track_pools(self, owner) -> None:
+        """
+        Report pool usage of a WorkflowArchitecture or WorkflowRuntime at scrape time.
+
+        Pools registered on ``owner`` later are picked up too.
+        """
+        def collect():
+            pools = list(owner.resource_pools.values())
+            if owner.concurrency_pool is not None:
+                pools.append(owner.concurrency_pool)
+            for pool in pools:
+                self.pool_in_use.set(pool.in_use, pool=pool.name)
+                self.pool_waiting.set(pool.waiting, pool=pool.name)
+
+        self.registry.add_collector(collect)
+
+    def on_start(self, span: Span) -> None:
+        with self.registry.lock:
+            if span.parent_id is None:
+                workflow = span.attributes.get("workflow.name", "")
+                self._workflow_names[span.span_id] = workflow
+                self.runs_active.inc(workflow=workflow)
+                return
+            if "node.map_source" in span.attributes:
+                return  # Map nodes only wait for their children
+            workflow = self._workflow_names.get(span.parent_id, "")
+            self._node_state[span.span_id] = (workflow, "queued")
+            self.nodes_queued.inc(workflow=workflow)
+
+    def on_event(self, span: Span, event: SpanEvent) -> None:
+        with self.registry.lock:
+            state = self._node_state.get(span.span_id)
+            if state is None:
+                return
+            workflow, phase = state
+            if event.name == "attempt.start":
+                if phase == "queued":
+                    self.nodes_queued.dec(workflow=workflow)
+                    self.nodes_in_flight.inc(workflow=workflow)
+                    self._node_state[span.span_id] = (workflow, "running")
+                self.queue_wait.observe(event.attributes.get("queue_wait_ms", 0.0) / 1000, workflow=workflow)
+            elif event.name == "hedge":
+                self.hedges.inc(workflow=workflow, outcome="started")
+            elif event.name in ("hedge.win", "hedge.denied"):
+                self.hedges.inc(workflow=workflow, outcome=event.name.split(".")[1])
+            elif event.name == "retry":
+                self.retries.inc(workflow=workflow)
+                if phase == "running":
+                    # Backing off, then queued for pools again
+                    self.nodes_in_flight.dec(workflow=workflow)
+                    self.nodes_queued.inc(workflow=workflow)
+                    self._node_state[span.span_id] = (workflow, "queued")
+
+    def on_end(self, span: Span) -> None:
+        attrs = span.attributes
+        with self.registry.lock:
+            if span.parent_id is None:
+                workflow = self._workflow_names.pop(span.span_id, attrs.get("workflow.name", ""))
+                self.runs_active.dec(workflow=workflow)
+                self.runs_total.inc(workflow=workflow, status=span.status)
+                if span.duration_ms is not None:
+                    self.run_duration.observe(span.duration_ms / 1000, workflow=workflow)
+                return
+
+            workflow = self._workflow_names.get(span.parent_id, "")
+            state = self._node_state.pop(span.span_id, None)
+            if state is not None:
+                if state[1] == "queued":
+                    self.nodes_queued.dec(workflow=workflow)
+                else:
+                    self.nodes_in_flight.dec(workflow=workflow)
+
+            status = attrs.get("node.status", "unknown")
+            if attrs.get("node.cached"):
+                status = "cached"
+            self.nodes_total.inc(workflow=workflow, status=status)
+            duration_ms = attrs.get("node.duration_ms")
+            if duration_ms is not None and status == "completed":
+                self.node_duration.observe(duration_ms / 1000, workflow=workflow, stage=attrs.get("node.stage", ""))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = None
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the console
+
+
+def start_metrics_server(registry: MetricsRegistry, port: int = 9108, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve ``/metrics`` from a daemon thread.
+
+    Returns:
+        The server; call ``shutdown()`` to stop it
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="workflow-metrics", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,313 @@
+"""
+Node Result Cache
+=================
+
+Content-addressed memoization for workflow node results.
+
+Keys are a SHA-256 over the node id, the executor version and the inputs
+the node reads, so re-running a workflow after a late-stage failure reuses
+the SERP, scrape and intent results instead of paying for them again.
+
+Tiers:
+- In-memory LRU (bounded number of entries)
+- Optional on-disk pickle store (survives process restarts)
+
+Both tiers honour the same TTL. The workflow uses aget()/aset(), which
+read, unpickle and write the disk tier in a worker thread so large results
+never block the event loop. Inputs that cannot be fingerprinted
+stably (objects without a value representation) make the node uncacheable
+for that run rather than risk a wrong hit.
+"""
+
+import asyncio
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+
+# <project root>/.cache/workflow
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".cache",
+    "workflow"
+)
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Make common non-JSON values hashable in a stable way.
+
+    Raises:
+        TypeError: No stable representation; objects can provide one with
+            a ``__cache_key__()`` method
+    """
+    cache_key = getattr(value, "__cache_key__", None)
+    if callable(cache_key):
+        return [type(value).__qualname__, cache_key()]
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    # A default repr embeds the object's address: unstable across runs, and
+    # reused addresses would make different inputs collide
+    raise TypeError(f"Cannot fingerprint {type(value).__qualname__} (add a __cache_key__() method)")
+
+
+# Marks values JSON would otherwise merge with a plain one: (1, 2) vs [1, 2],
+# {1: x} vs {"1": x}, {1, 2} vs [1, 2]
+_TAG = "__type__"
+
+
+def _canonical(value: Any, active: set) -> Any:
+    """JSON-safe form of ``value`` in which distinct inputs never coincide."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if id(value) in active:
+        raise ValueError("Circular reference detected")
+    active.add(id(value))
+    try:
+        if isinstance(value, list):
+            return [_canonical(item, active) for item in value]
+        if isinstance(value, tuple):
+            return {_TAG: "tuple", "items": [_canonical(item, active) for item in value]}
+        if isinstance(value, dict):
+            if all(isinstance(key, str) for key in value):
+                items = {key: _canonical(item, active) for key, item in value.items()}
+                # A plain dict that happens to use the tag key is escaped
+                return {_TAG: "dict", "items": items} if _TAG in items else items
+            pairs = [
+                [_canonical(key, active), _canonical(item, active)] for key, item in value.items()
+            ]
+            pairs.sort(key=lambda pair: json.dumps(pair[0], sort_keys=True, ensure_ascii=False))
+            return {_TAG: "pairs", "items": pairs}
+        if isinstance(value, (set, frozenset)):
+            items = [_canonical(item, active) for item in value]
+            items.sort(key=lambda item: json.dumps(item, sort_keys=True, ensure_ascii=False))
+            return {_TAG: "set", "items": items}
+        return _canonical(_json_default(value), active)
+    finally:
+        active.discard(id(value))
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Stable SHA-256 hex digest of a (JSON-like) value.
+
+    Tuples, sets and dicts with non-string keys are tagged, so they never
+    share a digest with the list or string-keyed dict JSON would turn
+    them into.
+
+    Raises:
+        TypeError: A value (or dict key) has no stable representation
+        ValueError: The value contains a circular reference
+    """
+    payload = json.dumps(_canonical(value, set()), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class NodeResultCache:
+    """
+    Two-tier (memory LRU + disk) cache for node results with TTL eviction.
+
+    Usage:
+        cache = NodeResultCache(ttl=3600, cache_dir=DEFAULT_CACHE_DIR)
+        workflow = WorkflowArchitecture("SEO Blog", cache=cache)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: Optional[float] = 3600,
+        cache_dir: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            ttl: Time-to-live in seconds (None = never expires)
+            cache_dir: Directory for the on-disk tier (None = memory only)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(node_id: str, version: str, inputs: Dict[str, Any]) -> Optional[str]:
+        """
+        Build the content address for a node run.
+
+        Returns:
+            The key, or None if the inputs cannot be fingerprinted (the run
+            is then uncacheable)
+        """
+        try:
+            return fingerprint({"node": node_id, "version": version, "inputs": inputs})
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached result.
+
+        Returns:
+            (hit, value) tuple; value is None on a miss
+        """
+        now = time.time()
+        hit, value = self._get_memory(key, now)
+        if not hit and self.cache_dir:
+            hit, value = self._promote(key, self._load_disk(key, now))
+        return self._count(hit, value)
+
+    async def aget(self, key: str) -> Tuple[bool, Any]:
+        """get() that reads the disk tier in a worker thread."""
+        now = time.time()
+        hit, value = self._get_memory(key, now)
+        if not hit and self.cache_dir:
+            hit, value = self._promote(key, await asyncio.to_thread(self._load_disk, key, now))
+        return self._count(hit, value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a result in both tiers."""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        self._remember(key, expires_at, value)
+        self._write_disk(key, expires_at, value)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """set() that pickles and writes the disk tier in a worker thread."""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        self._remember(key, expires_at, value)
+        if self.cache_dir:
+            await asyncio.to_thread(self._write_disk, key, expires_at, value)
+
+    def evict_expired(self) -> int:
+        """Drop expired entries from both tiers. Returns the number removed."""
+        now = time.time()
+        removed = 0
+
+        for key in [k for k, (expires_at, _) in self._memory.items() if expires_at is not None and expires_at <= now]:
+            del self._memory[key]
+            removed += 1
+
+        if self.cache_dir:
+            for root, _, files in os.walk(self.cache_dir):
+                for filename in files:
+                    if not filename.endswith(".pkl"):
+                        continue
+                    entry = self._read_disk(filename[:-4])
+                    if entry is None or (entry[0] is not None and entry[0] <= now):
+                        self._remove_disk(filename[:-4])
+                        removed += 1
+
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        self._memory.clear()
+        if self.cache_dir:
+            for root, _, files in os.walk(self.cache_dir):
+                for filename in files:
+                    if filename.endswith(".pkl"):
+                        os.remove(os.path.join(root, filename))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for reporting."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_entries": len(self._memory)
+        }
+
+    def _get_memory(self, key: str, now: float) -> Tuple[bool, Any]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > now:
+                self._memory.move_to_end(key)
+                return True, value
+            del self._memory[key]
+        return False, None
+
+    def _load_disk(self, key: str, now: float) -> Optional[Tuple[Optional[float], Any]]:
+        """Fresh disk entry for ``key`` (expired ones are removed). Thread-safe."""
+        entry = self._read_disk(key)
+        if entry is not None and entry[0] is not None and entry[0] <= now:
+            self._remove_disk(key)
+            return None
+        return entry
+
+    def _promote(self, key: str, entry: Optional[Tuple[Optional[float], Any]]) -> Tuple[bool, Any]:
+        if entry is None:
+            return False, None
+        self._remember(key, *entry)
+        return True, entry[1]
+
+    def _count(self, hit: bool, value: Any) -> Tuple[bool, Any]:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hit, value
+
+    def _remember(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def _read_disk(self, key: str) -> Optional[Tuple[Optional[float], Any]]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Corrupt or stale entry (e.g. class moved); treat as a miss
+            self._remove_disk(key)
+            return None
+
+    def _write_disk(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Unpicklable results stay memory-only
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _remove_disk(self, key: str) -> None:
+        try:
+            os.remove(self._disk_path(key))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,117 @@
+"""
+Resource Pools
+==============
+
+Named async capacity limiters for workflow nodes.
+
+A pool caps how many nodes may hold it at once (e.g. ``openai: 3``). Nodes
+declare the pools they need and the executor acquires all of them before the
+node runs, so wide fan-outs cannot exceed provider rate limits or exhaust
+sockets. When a pool is full, waiters are served highest priority first
+(FIFO among equal priorities), which lets the scheduler favour nodes on the
+critical path.
+
+Example:
+  pools = {"openai": ResourcePool("openai", 3), "serp": ResourcePool("serp", 2)}
+  async with hold_resources([pools["openai"]]):
+      await call_gpt4(...)
+"""
+
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, List, Tuple
+
+
+class ResourcePool:
+    """
+    Async capacity limiter with priority hand-off.
+
+    Attributes:
+        name: Pool identifier (e.g. "openai", "serp", "scraper")
+        limit: Maximum number of concurrent holders
+        in_use: Number of slots currently held
+    """
+
+    def __init__(self, name: str, limit: int):
+        if limit < 1:
+            raise ValueError(f"Resource pool '{name}' needs a limit of at least 1, got {limit}")
+        self.name = name
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: List[Tuple[float, int, asyncio.Future]] = []  # (-priority, seq, future) heap
+        self._sequence = itertools.count()
+        self._pending = 0  # Live (not cancelled) entries in the heap
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers currently queued for a slot."""
+        return self._pending
+
+    async def acquire(self, priority: float = 0.0) -> None:
+        """
+        Wait for a free slot.
+
+        Args:
+            priority: Higher values are served first when the pool is full
+        """
+        if self.in_use < self.limit and not self._pending:
+            self.in_use += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._sequence), waiter))
+        self._pending += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed to us just before cancellation; pass it on
+                self.release()
+            else:
+                # The entry stays in the heap and is skipped by release()
+                self._pending -= 1
+            raise
+
+    def release(self) -> None:
+        """Return a slot, handing it directly to the best waiter if any."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._pending -= 1
+                waiter.set_result(None)
+                return
+        if self.in_use <= 0:
+            raise RuntimeError(f"Resource pool '{self.name}' released more times than acquired")
+        self.in_use -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __repr__(self) -> str:
+        return f"ResourcePool({self.name!r}, in_use={self.in_use}/{self.limit})"
+
+
+@asynccontextmanager
+async def hold_resources(pools: Iterable[ResourcePool], priority: float = 0.0) -> AsyncIterator[None]:
+    """
+    Acquire several pools at once.
+
+    Pools are always taken in name order so two nodes that need the same set
+    cannot deadlock, and released in reverse order.
+    """
+    ordered = sorted(pools, key=lambda pool: pool.name)
+    acquired: List[ResourcePool] = []
+    try:
+        for pool in ordered:
+            await pool.acquire(priority)
+            acquired.append(pool)
+        yield
+    finally:
+        for pool in reversed(acquired):
+            pool.release()
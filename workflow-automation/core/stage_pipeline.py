@@ -0,0 +1,164 @@
+"""
+Stage Pipeline
+==============
+
+Pipelined batch execution across WorkflowStage boundaries.
+
+Running a batch of keyword jobs with asyncio.gather() moves them in lockstep:
+every job hits the SERP provider at once, then every job waits on the LLM,
+while the other providers sit idle. StagePipeline runs each job as a clone
+of a template workflow and gates the clones stage by stage:
+- Each stage has a number of workers (slots shared by all jobs)
+- A job enters a stage when its previous stage has finished and a worker
+  of the new stage is free, and keeps that worker until the stage is done
+- Jobs are served first come, first served per stage
+
+So while job A is in IMPLEMENTATION (content generation), job B can already
+run its REQUIREMENT (SERP) nodes, and every stage stays busy.
+
+Nodes may only depend on nodes of the same or an earlier stage.
+
+Example:
+  pipeline = StagePipeline(blog_workflow, stage_workers={
+      WorkflowStage.REQUIREMENT: 2,     # SERP + keyword research
+      WorkflowStage.DESIGN: 2,          # scraping + outline
+      WorkflowStage.IMPLEMENTATION: 4,  # section generation
+  })
+  results = await pipeline.run([{"keyword": kw} for kw in keywords])
+"""
+
+import asyncio
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.resource_pool import ResourcePool
+from core.workflow_architecture import WorkflowArchitecture, WorkflowResult, WorkflowStage
+
+
+class StagePipeline:
+    """
+    Runs many jobs of one workflow as a stage-gated pipeline.
+
+    Jobs are clones of the template, so named resource pools (``openai``,
+    ``serp``, ...) and the global concurrency cap are shared across jobs in
+    addition to the stage workers.
+    """
+
+    def __init__(
+        self,
+        workflow: WorkflowArchitecture,
+        stage_workers: Optional[Dict[Union[WorkflowStage, str], int]] = None,
+        default_workers: Optional[int] = 1
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            workflow: Template workflow (not executed itself)
+            stage_workers: Workers per stage, keyed by WorkflowStage or its value
+            default_workers: Workers for stages not listed (None = unlimited)
+
+        Raises:
+            ValueError: A node depends on a node of a later stage
+        """
+        workflow.validate_stages()
+        workers: Dict[WorkflowStage, Optional[int]] = {stage: default_workers for stage in WorkflowStage}
+        for stage, count in (stage_workers or {}).items():
+            workers[WorkflowStage(stage)] = count
+
+        self.workflow = workflow
+        self.stage_pools: Dict[WorkflowStage, ResourcePool] = {
+            stage: ResourcePool(f"stage:{stage.value}", count)
+            for stage, count in workers.items() if count is not None
+        }
+        self.completed = 0
+        self.failed = 0
+
+    async def run(
+        self,
+        contexts: Iterable[Dict[str, Any]],
+        timeout: Optional[float] = None
+    ) -> List[WorkflowResult]:
+        """
+        Run one job per initial context through the pipeline.
+
+        Args:
+            contexts: Initial context of each job
+            timeout: Deadline per job in seconds, counted from the job's
+                start (so it includes waiting for stage workers)
+
+        Returns:
+            WorkflowResult per job, in input order
+
+        Jobs run under the template's name; each job's workflow span carries
+        its input index as the ``pipeline.job`` attribute.
+        """
+        jobs = []
+        for index, context in enumerate(contexts):
+            # Jobs keep the template name so metrics stay labelled per workflow
+            job = self.workflow.clone()
+            job.span_attributes["pipeline.job"] = index
+            job.stage_pools = self.stage_pools
+            jobs.append(self._run_job(job, context, timeout))
+        return list(await asyncio.gather(*jobs))
+
+    async def _run_job(
+        self,
+        job: WorkflowArchitecture,
+        context: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> WorkflowResult:
+        async with job:  # Shuts down executors the job created for itself
+            result = await job.execute(context, timeout=timeout)
+        if result.success:
+            self.completed += 1
+        else:
+            self.failed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage worker usage and job counters."""
+        return {
+            "stages": {
+                stage.value: {"workers": pool.limit, "busy": pool.in_use, "waiting": pool.waiting}
+                for stage, pool in self.stage_pools.items()
+            },
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+if __name__ == "__main__":
+    import time
+
+    def sleeper(seconds: float):
+        async def executor(ctx):
+            await asyncio.sleep(seconds)
+            return seconds
+        return executor
+
+    template = WorkflowArchitecture("Blog Batch")
+    template.add_node("serp", "Fetch SERP", WorkflowStage.REQUIREMENT, sleeper(0.1))
+    template.add_node("outline", "Outline", WorkflowStage.DESIGN, sleeper(0.1), dependencies=["serp"])
+    template.add_node("write", "Write", WorkflowStage.IMPLEMENTATION, sleeper(0.2), dependencies=["outline"])
+
+    async def main():
+        keywords = [{"keyword": f"keyword {i}"} for i in range(6)]
+
+        start = time.perf_counter()
+        for context in keywords:
+            await template.clone().execute(context)
+        sequential = time.perf_counter() - start
+
+        pipeline = StagePipeline(template, stage_workers={WorkflowStage.IMPLEMENTATION: 2})
+        start = time.perf_counter()
+        results = await pipeline.run(keywords)
+        pipelined = time.perf_counter() - start
+
+        print(f"{len(results)} jobs: sequential {sequential:.2f}s, pipelined {pipelined:.2f}s")
+        print(pipeline.stats())
+
+    asyncio.run(main())
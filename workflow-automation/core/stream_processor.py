@@ -36,24 +36,36 @@ class StreamProcessor:
     - Error handling and recovery
     """
 
-    def __init__(self, api_key: str, base_url: str = "https://api.openai.com/v1"):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.openai.com/v1",
+        session: Optional[aiohttp.ClientSession] = None
+    ):
+        """
+        Args:
+            api_key: OpenAI API key
+            base_url: API base URL
+            session: Shared aiohttp session (e.g. from WorkflowRuntime); not closed on exit
+        """
         self.api_key = api_key
         self.base_url = base_url
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
 
     async def __aenter__(self):
-        """Context manager entry - create session"""
-        self.session = aiohttp.ClientSession(
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-        )
+        """Context manager entry - create session unless a shared one was given"""
+        if self._owns_session:
+            self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - close session"""
-        if self.session:
+        """Context manager exit - close own session"""
+        if self.session and self._owns_session:
             await self.session.close()
 
     async def stream_completion(
@@ -101,7 +113,8 @@ class StreamProcessor:
         try:
             async with self.session.post(
                 f"{self.base_url}/chat/completions",
-                json=payload
+                json=payload,
+                headers=self._headers
             ) as response:
                 response.raise_for_status()
 
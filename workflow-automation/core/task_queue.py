@@ -0,0 +1,546 @@
+"""
+Task Queue & Workers
+====================
+
+Runs REMOTE workflow nodes in worker processes via a local queue broker.
+
+The workflow stays the coordinator: it drives the DAG, and for every ready
+REMOTE node it enqueues a task (executor reference + pickled inputs) and
+waits for the result. Worker processes pull tasks, run them and write the
+result back. No external service is needed:
+- SQLiteTaskQueue: single SQLite file (WAL mode); every process on the
+  same host can coordinate or work. WAL relies on shared memory, so the
+  file must be on a local filesystem, not a network share
+
+Claims are leased, and workers renew the lease while a task runs. A task
+whose worker dies is handed to another worker once its lease expires; after
+``max_attempts`` claims it is marked failed instead of being re-leased.
+Results are only accepted from the worker currently holding the claim, so a
+worker whose lease expired cannot overwrite the task's new owner.
+
+Limitation: this spreads work over processes of ONE host. A SQLite file
+cannot be shared safely between machines (WAL needs shared memory, and
+network filesystems break its locking), so running workers on several
+machines needs a networked TaskQueue backend (e.g. Redis or Postgres)
+implementing the same methods.
+
+Usage:
+    queue = SQLiteTaskQueue(".cache/workflow/tasks.db")
+    workflow = WorkflowArchitecture("SEO Blog", task_queue=queue)
+    workflow.add_node("clean", "Clean HTML", WorkflowStage.IMPLEMENTATION,
+                      clean_html, kind=ExecutorKind.REMOTE)
+
+    # In other terminals on the same host (from workflow-automation/):
+    python core/task_queue.py .cache/workflow/tasks.db --workers 8
+"""
+
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import inspect
+import multiprocessing
+import os
+import pickle
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class TaskStatus:
+    """Task lifecycle values"""
+    QUEUED = "queued"
+    CLAIMED = "claimed"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class RemoteTaskError(RuntimeError):
+    """A task failed in a worker; carries the worker-side traceback."""
+
+    def __init__(self, message: str, worker_traceback: Optional[str] = None):
+        super().__init__(message)
+        self.worker_traceback = worker_traceback
+
+
+@dataclass
+class Task:
+    """A node execution request pulled by a worker"""
+    task_id: str
+    run_id: Optional[str]
+    node_id: str
+    executor_ref: str
+    inputs: Dict[str, Any]
+    attempts: int
+    args: Tuple[Any, ...] = ()
+
+
+def executor_ref(func: Callable) -> str:
+    """
+    Importable reference for a function: "module:qualname".
+
+    Functions defined in a script run as __main__ are referenced by file path
+    so workers can load them too. Lambdas and nested functions are rejected.
+    """
+    qualname = getattr(func, "__qualname__", "")
+    if not qualname or "<" in qualname:
+        raise ValueError(
+            f"Remote executor {func!r} must be a module-level function so workers can import it"
+        )
+    module = func.__module__
+    if module == "__main__":
+        main_file = getattr(sys.modules["__main__"], "__file__", None)
+        if not main_file:
+            raise ValueError(f"Remote executor {qualname} is defined in an interactive session")
+        module = os.path.abspath(main_file)
+    return f"{module}:{qualname}"
+
+
+_resolved: Dict[str, Callable] = {}
+
+
+def resolve_executor(ref: str) -> Callable:
+    """Import the function behind an executor_ref() string."""
+    func = _resolved.get(ref)
+    if func is not None:
+        return func
+
+    module_name, _, qualname = ref.rpartition(":")
+    if module_name.endswith(".py"):
+        spec = importlib.util.spec_from_file_location("__workflow_main__", module_name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(module_name)
+
+    func = module
+    for part in qualname.split("."):
+        func = getattr(func, part)
+    _resolved[ref] = func
+    return func
+
+
+class TaskQueue:
+    """
+    Base class for queue backends.
+
+    Coordinator side: enqueue, result, cancel. Worker side: claim, complete, fail.
+    """
+
+    def enqueue(
+        self,
+        node_id: str,
+        executor: str,
+        inputs: Dict[str, Any],
+        run_id: Optional[str] = None,
+        args: Tuple[Any, ...] = ()
+    ) -> str:
+        """Add a task and return its id (the worker calls ``executor(inputs, *args)``)."""
+        raise NotImplementedError
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Task]:
+        """Take the oldest available task (or one whose lease expired)."""
+        raise NotImplementedError
+
+    def renew(self, task_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a claim; returns False if the worker no longer holds it."""
+        raise NotImplementedError
+
+    def complete(self, task_id: str, worker_id: str, result: Any) -> bool:
+        """Store a task's result; returns False (and stores nothing) if the worker no longer holds the claim."""
+        raise NotImplementedError
+
+    def fail(self, task_id: str, worker_id: str, error: str, worker_traceback: Optional[str] = None) -> bool:
+        """Mark a task as failed; returns False (and changes nothing) if the worker no longer holds the claim."""
+        raise NotImplementedError
+
+    def result(self, task_id: str) -> Optional[Any]:
+        """
+        Poll a task.
+
+        Returns:
+            None while pending, otherwise ("done", result) or ("failed", RemoteTaskError)
+        """
+        raise NotImplementedError
+
+    def cancel(self, task_id: str) -> None:
+        """Withdraw a task that is no longer needed."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Number of tasks per status."""
+        raise NotImplementedError
+
+    async def wait(self, task_id: str, poll_interval: float = 0.1) -> Any:
+        """
+        Wait for a task's result without blocking the event loop.
+
+        Raises:
+            RemoteTaskError: The worker reported a failure
+        """
+        delay = min(0.01, poll_interval)
+        try:
+            while True:
+                outcome = await asyncio.to_thread(self.result, task_id)
+                if outcome is not None:
+                    status, value = outcome
+                    if status == TaskStatus.FAILED:
+                        raise value
+                    return value
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, poll_interval)
+        except asyncio.CancelledError:
+            # Off the event loop like every other queue call; shielded so a
+            # repeated cancellation cannot skip withdrawing the task
+            await asyncio.shield(asyncio.to_thread(self.cancel, task_id))
+            raise
+
+
+class SQLiteTaskQueue(TaskQueue):
+    """SQLite-backed queue, safe to share between processes and threads of one host."""
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        """
+        Initialize queue.
+
+        Args:
+            path: Database file on a local filesystem
+            max_attempts: Claims a task gets; once the last lease expires
+                (its worker keeps dying) the task is marked failed
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " task_id TEXT PRIMARY KEY,"
+                " run_id TEXT,"
+                " node_id TEXT NOT NULL,"
+                " executor TEXT NOT NULL,"
+                " inputs BLOB NOT NULL,"
+                " status TEXT NOT NULL,"
+                " worker TEXT,"
+                " lease_until REAL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " result BLOB,"
+                " error TEXT,"
+                " created_at REAL NOT NULL,"
+                " finished_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, created_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections are not thread-safe
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._connection())
+
+    def enqueue(
+        self,
+        node_id: str,
+        executor: str,
+        inputs: Dict[str, Any],
+        run_id: Optional[str] = None,
+        args: Tuple[Any, ...] = ()
+    ) -> str:
+        task_id = uuid.uuid4().hex
+        payload = pickle.dumps((inputs, tuple(args)), protocol=pickle.HIGHEST_PROTOCOL)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO tasks (task_id, run_id, node_id, executor, inputs, status, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (task_id, run_id, node_id, executor, payload, TaskStatus.QUEUED, time.time())
+            )
+        return task_id
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Task]:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, finished_at = ?"
+                " WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (
+                    TaskStatus.FAILED,
+                    f"Lease expired on each of {self.max_attempts} attempt(s) (worker crashed or was killed)",
+                    now, TaskStatus.CLAIMED, now, self.max_attempts
+                )
+            )
+            row = conn.execute(
+                "SELECT task_id, run_id, node_id, executor, inputs, attempts FROM tasks"
+                " WHERE status = ? OR (status = ? AND lease_until < ?)"
+                " ORDER BY created_at LIMIT 1",
+                (TaskStatus.QUEUED, TaskStatus.CLAIMED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1"
+                " WHERE task_id = ?",
+                (TaskStatus.CLAIMED, worker_id, now + lease_seconds, row[0])
+            )
+        inputs, args = pickle.loads(row[4])
+        return Task(
+            task_id=row[0],
+            run_id=row[1],
+            node_id=row[2],
+            executor_ref=row[3],
+            inputs=inputs,
+            attempts=row[5] + 1,
+            args=args
+        )
+
+    def renew(self, task_id: str, worker_id: str, lease_seconds: float) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_until = ? WHERE task_id = ? AND status = ? AND worker = ?",
+                (time.time() + lease_seconds, task_id, TaskStatus.CLAIMED, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: str, worker_id: str, result: Any) -> bool:
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = ?, result = ?, finished_at = ?"
+                " WHERE task_id = ? AND status = ? AND worker = ?",
+                (TaskStatus.DONE, payload, time.time(), task_id, TaskStatus.CLAIMED, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, task_id: str, worker_id: str, error: str, worker_traceback: Optional[str] = None) -> bool:
+        payload = pickle.dumps(worker_traceback, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, result = ?, finished_at = ?"
+                " WHERE task_id = ? AND status = ? AND worker = ?",
+                (TaskStatus.FAILED, error, payload, time.time(), task_id, TaskStatus.CLAIMED, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def result(self, task_id: str) -> Optional[Any]:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT status, result, error FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown task: {task_id}")
+        status, payload, error = row
+        if status == TaskStatus.DONE:
+            return TaskStatus.DONE, pickle.loads(payload)
+        if status == TaskStatus.FAILED:
+            return TaskStatus.FAILED, RemoteTaskError(error, pickle.loads(payload) if payload else None)
+        if status == TaskStatus.CANCELLED:
+            return TaskStatus.FAILED, RemoteTaskError("Task was cancelled")
+        return None
+
+    def cancel(self, task_id: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, finished_at = ? WHERE task_id = ? AND status IN (?, ?)",
+                (TaskStatus.CANCELLED, time.time(), task_id, TaskStatus.QUEUED, TaskStatus.CLAIMED)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._transaction() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+    def purge(self, older_than: float = 3600) -> int:
+        """Delete finished tasks older than ``older_than`` seconds; returns the count."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM tasks WHERE status IN (?, ?, ?) AND finished_at < ?",
+                (TaskStatus.DONE, TaskStatus.FAILED, TaskStatus.CANCELLED, time.time() - older_than)
+            )
+        return cursor.rowcount
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT around a block, so claims are atomic across processes."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class TaskWorker:
+    """
+    Pulls tasks from a queue and executes them.
+
+    Executors receive the node inputs, like THREAD/PROCESS nodes. Sync and
+    async functions are both supported. While a task runs, a heartbeat
+    thread renews its lease, so long tasks are not handed to a second worker.
+    Outcomes the queue refuses (the claim was lost, e.g. the lease expired
+    and another worker took the task, or it was cancelled) are counted in
+    ``discarded``.
+    """
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 0.2,
+        lease_seconds: float = 600
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            queue: Queue to pull from
+            worker_id: Identifier stored with claims (default: host:pid)
+            poll_interval: Sleep between polls when the queue is empty
+            lease_seconds: How long a claim stays valid without a heartbeat
+                before another worker may take over (renewed every third of it)
+        """
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.processed = 0
+        self.discarded = 0
+        self._stop = threading.Event()
+
+    def run_one(self) -> bool:
+        """Claim and execute one task; returns False if the queue was empty."""
+        task = self.queue.claim(self.worker_id, self.lease_seconds)
+        if task is None:
+            return False
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(task.task_id, done), daemon=True)
+        heartbeat.start()
+        try:
+            func = resolve_executor(task.executor_ref)
+            result = func(task.inputs, *task.args)
+            if inspect.isawaitable(result):
+                result = asyncio.run(result)
+            accepted = self.queue.complete(task.task_id, self.worker_id, result)
+        except Exception as e:
+            accepted = self.queue.fail(
+                task.task_id, self.worker_id, f"{type(e).__name__}: {e}", traceback.format_exc()
+            )
+        finally:
+            done.set()
+            heartbeat.join()
+        if not accepted:
+            self.discarded += 1
+        self.processed += 1
+        return True
+
+    def _heartbeat(self, task_id: str, done: threading.Event) -> None:
+        """Renew the lease until the task finishes, or stop once the claim is lost (e.g. cancelled)."""
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                if not self.queue.renew(task_id, self.worker_id, self.lease_seconds):
+                    return
+            except sqlite3.Error:
+                continue  # Busy database; the next beat retries well within the lease
+
+    def run(self, max_tasks: Optional[int] = None, idle_timeout: Optional[float] = None) -> int:
+        """
+        Process tasks until stopped.
+
+        Args:
+            max_tasks: Stop after this many tasks (None = no limit)
+            idle_timeout: Stop after the queue has been empty this long (None = never)
+
+        Returns:
+            Number of tasks processed
+        """
+        idle_since = time.time()
+        while not self._stop.is_set():
+            if max_tasks is not None and self.processed >= max_tasks:
+                break
+            if self.run_one():
+                idle_since = time.time()
+                continue
+            if idle_timeout is not None and time.time() - idle_since >= idle_timeout:
+                break
+            self._stop.wait(self.poll_interval)
+        return self.processed
+
+    def stop(self) -> None:
+        """Ask run() to return after the current task."""
+        self._stop.set()
+
+
+def _worker_main(path: str, poll_interval: float, lease_seconds: float, idle_timeout: Optional[float]) -> None:
+    worker = TaskWorker(SQLiteTaskQueue(path), poll_interval=poll_interval, lease_seconds=lease_seconds)
+    try:
+        worker.run(idle_timeout=idle_timeout)
+    except KeyboardInterrupt:
+        pass
+
+
+def start_workers(
+    path: str,
+    workers: int = 0,
+    poll_interval: float = 0.2,
+    lease_seconds: float = 600,
+    idle_timeout: Optional[float] = None
+) -> list:
+    """
+    Start worker processes for a SQLite queue.
+
+    Args:
+        path: Queue database path
+        workers: Number of processes (0 = CPU count)
+
+    Returns:
+        The started multiprocessing.Process objects
+    """
+    processes = []
+    for _ in range(workers or os.cpu_count() or 1):
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(path, poll_interval, lease_seconds, idle_timeout),
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+    return processes
+
+
+if __name__ == "__main__":
+    # Make project modules (core.*, agents.*) importable for executors
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    parser = argparse.ArgumentParser(description="Run workflow task workers against a SQLite queue")
+    parser.add_argument("queue", help="Path to the queue database")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument("--poll-interval", type=float, default=0.2)
+    parser.add_argument("--lease", type=float, default=600, help="Claim lease in seconds")
+    parser.add_argument("--idle-timeout", type=float, default=None,
+                        help="Exit after the queue has been empty this long")
+    args = parser.parse_args()
+
+    procs = start_workers(args.queue, args.workers, args.poll_interval, args.lease, args.idle_timeout)
+    print(f"Started {len(procs)} worker(s) on {args.queue}")
+    try:
+        for proc in procs:
+            proc.join()
+    except KeyboardInterrupt:
+        for proc in procs:
+            proc.terminate()
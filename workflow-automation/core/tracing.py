@@ -0,0 +1,349 @@
+"""
+Workflow Tracing
+================
+
+OpenTelemetry-style spans and events for workflow execution.
+
+The engine reports through a Tracer instead of printing. Exporters decide
+what happens with the data:
+- ConsoleSpanExporter: human-readable progress lines (the classic output)
+- JsonlSpanExporter: one JSON object per finished span in .ai/trace-logs/
+  (written by a background thread, never on the event loop)
+
+Span model:
+  workflow:<name>            (one per run; trace_id = run id when checkpointing)
+    └─ node:<node_id>        (one per node; events: attempt.start, attempt.error,
+                              retry, cache.hit, skipped)
+
+Example:
+  tracer = Tracer([ConsoleSpanExporter(), JsonlSpanExporter()])
+  workflow = WorkflowArchitecture("SEO Blog", tracer=tracer)
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+# <repo root>/.ai/trace-logs
+DEFAULT_TRACE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".ai",
+    "trace-logs"
+)
+
+
+class SpanStatus:
+    """Span status values (OpenTelemetry semantics)"""
+    UNSET = "unset"
+    OK = "ok"
+    ERROR = "error"
+
+
+@dataclass
+class SpanEvent:
+    """Timestamped event attached to a span"""
+    name: str
+    timestamp: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "timestamp": self.timestamp, "attributes": self.attributes}
+
+
+@dataclass
+class Span:
+    """
+    A timed operation (a workflow run or a node).
+
+    Attributes:
+        name: Span name, e.g. "workflow:SEO Blog" or "node:fetch_serp"
+        trace_id: Shared by all spans of one workflow run
+        span_id: Unique span identifier
+        parent_id: Parent span id (None for the workflow span)
+        attributes: Key/value data (node id, stage, attempts, ...)
+        events: Point-in-time events (retries, errors, cache hits)
+    """
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    end_time: Optional[float] = None
+    status: str = SpanStatus.UNSET
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    events: List[SpanEvent] = field(default_factory=list)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Span duration in milliseconds."""
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize span to dictionary."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": [event.to_dict() for event in self.events]
+        }
+
+
+class SpanExporter:
+    """Base class for span exporters. Override the hooks you need."""
+
+    def on_start(self, span: Span) -> None:
+        """Called when a span starts."""
+
+    def on_event(self, span: Span, event: SpanEvent) -> None:
+        """Called when an event is added to a span."""
+
+    def on_end(self, span: Span) -> None:
+        """Called when a span ends."""
+
+    def flush(self) -> None:
+        """Block until everything exported so far is written (may do I/O)."""
+
+    def shutdown(self) -> None:
+        """Flush buffers and release resources."""
+
+
+# Handed out by a tracer without exporters: nobody can observe the span, so
+# nothing is allocated, recorded or timed for it
+_SILENT_SPAN = Span(name="", trace_id="", span_id="", parent_id=None, start_time=0.0)
+
+
+class Tracer:
+    """
+    Creates spans and fans them out to exporters.
+
+    A tracer without exporters is free: start_span() returns one shared
+    inert span and events on it are dropped.
+    """
+
+    def __init__(self, exporters: Optional[List[SpanExporter]] = None):
+        self.exporters: List[SpanExporter] = list(exporters or [])
+
+    @property
+    def recording(self) -> bool:
+        """Whether spans are observed at all (hot paths skip building attributes otherwise)."""
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        """Register another exporter."""
+        self.exporters.append(exporter)
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        trace_id: Optional[str] = None
+    ) -> Span:
+        """Start a span (child of ``parent`` when given)."""
+        if not self.exporters:
+            return _SILENT_SPAN
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else (trace_id or uuid.uuid4().hex),
+            span_id=f"{random.getrandbits(64):016x}",  # Same 16-hex format as uuid4().hex[:16], without a urandom call per node
+            parent_id=parent.span_id if parent else None,
+            start_time=time.time(),
+            attributes=dict(attributes or {})
+        )
+        for exporter in self.exporters:
+            exporter.on_start(span)
+        return span
+
+    def add_event(self, span: Span, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Attach an event to a span."""
+        if span is _SILENT_SPAN:
+            return
+        event = SpanEvent(name=name, timestamp=time.time(), attributes=dict(attributes or {}))
+        span.events.append(event)
+        for exporter in self.exporters:
+            exporter.on_event(span, event)
+
+    def end_span(
+        self,
+        span: Span,
+        status: str = SpanStatus.OK,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Finish a span."""
+        if span is _SILENT_SPAN:
+            return
+        span.end_time = time.time()
+        span.status = status
+        if attributes:
+            span.attributes.update(attributes)
+        for exporter in self.exporters:
+            exporter.on_end(span)
+
+    def flush(self) -> None:
+        """
+        Block until all exporters have written their data.
+
+        May do file or network I/O; async callers run it in a worker thread.
+        """
+        for exporter in self.exporters:
+            exporter.flush()
+
+    def shutdown(self) -> None:
+        """Flush all exporters."""
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Prints workflow progress in the classic human-readable format."""
+
+    def on_start(self, span: Span) -> None:
+        attrs = span.attributes
+        if span.parent_id is None:
+            print(f"\n{'='*60}")
+            print(f"Executing Workflow: {attrs.get('workflow.name')}")
+            print(f"{'='*60}\n")
+            levels = attrs.get("workflow.levels", [])
+            print(f"Execution plan: {len(levels)} levels (dependency-driven)")
+            for i, size in enumerate(levels, 1):
+                print(f"  Level {i}: {size} nodes")
+            print()
+            if attrs.get("workflow.restored"):
+                print(f"Resuming run {attrs.get('workflow.run_id')}: "
+                      f"{attrs['workflow.restored']}/{attrs.get('workflow.nodes')} nodes restored\n")
+
+    def on_event(self, span: Span, event: SpanEvent) -> None:
+        name = span.attributes.get("node.name")
+        node_id = span.attributes.get("node.id")
+        attrs = event.attributes
+        if event.name == "attempt.start":
+            print(f"  ▸ Executing: {name} ({node_id})")
+        elif event.name == "retry":
+            print(f"  ↻ Retrying: {name} in {attrs['delay_s']:.2f}s "
+                  f"(attempt {attrs['attempt']} failed: {attrs['error']})")
+        elif event.name == "cache.hit":
+            print(f"  ↺ Cached: {name} ({node_id})")
+        elif event.name == "skipped":
+            print(f"  ⊘ {name} ({node_id}) - {attrs['reason']}")
+        elif event.name == "deadline.exceeded":
+            print(f"  ✗ Workflow deadline exceeded, cancelled {attrs['cancelled']} node(s)")
+        elif event.name == "checkpoint.skipped":
+            print(f"  ! Checkpoint skipped for {attrs['node.id']}: result is not picklable ({attrs['error']})")
+
+    def on_end(self, span: Span) -> None:
+        attrs = span.attributes
+        if span.parent_id is None:
+            print()
+            print(f"{'='*60}")
+            print(f"Workflow Completed: {attrs.get('workflow.name')}")
+            print(f"  Total Duration: {span.duration_ms:.2f}ms")
+            print(f"  Nodes Completed: {attrs.get('workflow.nodes_completed')}/{attrs.get('workflow.nodes')}")
+            print(f"  Nodes Failed: {attrs.get('workflow.nodes_failed')}")
+            print(f"  Nodes Skipped: {attrs.get('workflow.nodes_skipped')}")
+            print(f"{'='*60}\n")
+        elif attrs.get("node.status") == "completed" and not attrs.get("node.cached"):
+            attempts = attrs.get("node.attempts", 1)
+            retries = f", {attempts} attempts" if attempts > 1 else ""
+            print(f"  ✓ Completed: {attrs.get('node.name')} ({attrs.get('node.duration_ms', 0):.2f}ms{retries})")
+        elif attrs.get("node.status") == "failed":
+            print(f"  ✗ Failed: {attrs.get('node.name')} - {attrs.get('node.error')}")
+
+
+class JsonlSpanExporter(SpanExporter):
+    """
+    Appends finished spans as JSON lines to a daily file.
+
+    Spans are buffered and handed to a writer thread every ``buffer_size``
+    spans and whenever a workflow span ends, so the exporter never does
+    file I/O on the event loop. flush() blocks until the writer has caught
+    up; WorkflowArchitecture calls it (in a worker thread) before execute()
+    returns, so a run's trace is complete on disk by then.
+    """
+
+    def __init__(self, directory: str = DEFAULT_TRACE_DIR, buffer_size: int = 100):
+        """
+        Initialize the exporter.
+
+        Args:
+            directory: Output directory (defaults to <repo>/.ai/trace-logs)
+            buffer_size: Spans buffered before writing
+        """
+        self.directory = directory
+        self.buffer_size = buffer_size
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        # (lines, done) batches; None stops the writer
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        """Current output file."""
+        return os.path.join(self.directory, f"workflow-spans-{datetime.now().strftime('%Y%m%d')}.jsonl")
+
+    def on_end(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.buffer_size or span.parent_id is None:
+                self._hand_off(None)
+
+    def flush(self) -> None:
+        """Write buffered spans to disk and wait until they are written."""
+        done = threading.Event()
+        with self._lock:
+            self._hand_off(done)
+        done.wait()
+
+    def shutdown(self) -> None:
+        self.flush()
+        with self._lock:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                self._queue.put(None)
+        if writer is not None:
+            writer.join()
+
+    def _hand_off(self, done: Optional[threading.Event]) -> None:
+        # Caller holds self._lock, which keeps batches in span order
+        lines, self._buffer = self._buffer, []
+        if not lines and done is None:
+            return
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="jsonl-span-writer", daemon=True)
+            self._writer.start()
+        self._queue.put((lines, done))
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            lines, done = batch
+            try:
+                if lines:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+            except OSError:
+                # Tracing must never take the workflow down; the batch is lost
+                pass
+            finally:
+                if done is not None:
+                    done.set()
@@ -8,16 +8,111 @@ Inspired by AGI2 architecture for autonomous agent orchestration.
 Features:
 - DAG (Directed Acyclic Graph) workflow execution
 - Parallel task execution with async/await
+- Global concurrency cap and named resource pools (e.g. openai, serp, scraper)
+- Per-node and whole-workflow deadlines with jittered exponential retries
+- Opt-in hedged attempts for long-tail nodes, with a budget on extra load
+- Failure policies: fail-fast, skip failed branches, or continue
+- Opt-in content-addressed result cache (memory LRU + disk, with TTL)
+- Pluggable checkpointing with resume of incomplete runs
+- Critical-path analysis and longest-remaining-path priority scheduling
+- Structured tracing (spans/events) with pluggable exporters instead of print()
+- Thread/process pool offload for CPU-bound synchronous nodes
 - WBS (Work Breakdown Structure) for task decomposition
-- Stage-based execution (Requirement → Design → Implementation → Testing → Deployment)
+- Stage-based execution (Requirement → Design → Implementation → Testing → Deployment),
+  optionally stage-gated with per-stage worker slots for pipelined batch jobs
 """
 
 import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import ContextVar
+import copy
+import dataclasses
+import inspect
+import itertools
+import pickle
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Callable, Awaitable
+from typing import List, Dict, Optional, Any, Callable, Awaitable, FrozenSet, Iterable, Mapping, Tuple, Type
 from enum import Enum
+import random
 import time
+import uuid
 from datetime import datetime
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.resource_pool import ResourcePool, hold_resources
+from core.node_cache import NodeResultCache
+from core.checkpoint import CheckpointStore, NodeCheckpoint
+from core.duration_history import DurationHistory
+from core.task_queue import TaskQueue, executor_ref
+from core.tracing import Tracer, Span, SpanStatus, ConsoleSpanExporter
+from core.workflow_context import WorkflowContext
+
+
+# Context keys starting with "_" are reserved for the engine and never treated as inputs
+# Context key holding the workflow deadline (epoch seconds) while a run is active
+DEADLINE_KEY = "_deadline"
+# Inputs key holding a map child's item (so each item gets its own cache entry)
+MAP_ITEM_KEY = "_map_item"
+
+# Graph version tokens: unique across instances, so clones can share one plan cache
+_graph_versions = itertools.count()
+# Run plans kept per plan cache (graph version x initial context keys x pools)
+MAX_RUN_PLANS = 16
+
+# Deadline of the node attempt running in the current task (includes the workflow deadline)
+_node_deadline: ContextVar[Optional[float]] = ContextVar("workflow_node_deadline", default=None)
+
+
+def remaining_time(context: Optional[Dict[str, Any]] = None) -> Optional[float]:
+    """
+    Seconds left before the current node or workflow deadline.
+
+    Executors call this with the context they received to cut work short
+    (e.g. scrape fewer URLs) when the budget is running out.
+
+    Returns:
+        Remaining seconds (never negative), or None when no deadline applies
+    """
+    deadlines = [
+        deadline
+        for deadline in (_node_deadline.get(), (context or {}).get(DEADLINE_KEY))
+        if deadline is not None
+    ]
+    if not deadlines:
+        return None
+    return max(0.0, min(deadlines) - time.time())
+
+
+class ExecutorKind(Enum):
+    """Where a node's executor runs"""
+    ASYNC = "async"      # Coroutine on the event loop: executor(context)
+    THREAD = "thread"    # Sync callable in the workflow's thread pool: executor(inputs)
+    PROCESS = "process"  # Sync, picklable callable in the process pool: executor(inputs)
+    REMOTE = "remote"    # Module-level callable run by a task queue worker: executor(inputs)
+
+
+class FailurePolicy(Enum):
+    """How the workflow reacts when a node fails"""
+    FAIL_FAST = "fail_fast"              # Cancel in-flight nodes and skip everything left
+    SKIP_DEPENDENTS = "skip_dependents"  # Skip only transitive dependents of the failed node
+    CONTINUE = "continue"                # Run every node regardless of failed dependencies
+
+
+class WorkflowCycleError(ValueError):
+    """Raised when the workflow graph contains a dependency cycle."""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"Circular dependency detected in workflow: {' → '.join(cycle)}")
+
+
+class NodeTimeoutError(TimeoutError):
+    """Raised when a node attempt exceeds its timeout or the workflow deadline."""
 
 
 class WorkflowStage(Enum):
@@ -38,6 +133,72 @@ class NodeStatus(Enum):
     SKIPPED = "skipped"
 
 
+@dataclass
+class RetryPolicy:
+    """
+    Retry behaviour for failed node attempts.
+
+    Delays grow exponentially from ``base_delay`` up to ``max_delay``. With
+    ``jitter`` enabled the actual delay is drawn uniformly from [0, delay]
+    ("full jitter") so retries from parallel nodes do not arrive in lockstep.
+    """
+    max_retries: int = 0
+    base_delay: float = 0.5  # seconds
+    max_delay: float = 30.0  # seconds
+    jitter: bool = True
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay in seconds before retrying after the given (1-based) attempt."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def should_retry(self, attempt: int, error: BaseException) -> bool:
+        """Whether another attempt is allowed after ``attempt`` failed with ``error``."""
+        return attempt <= self.max_retries and isinstance(error, self.retry_on)
+
+
+@dataclass
+class HedgePolicy:
+    """
+    Speculative duplicate attempts for nodes with long-tail latency.
+
+    When an attempt has been running for longer than the node's historical
+    ``percentile`` duration (from the workflow's DurationHistory), a duplicate
+    attempt is started; the first one to succeed wins and the others are
+    cancelled. Duplicates hold the node's resource pools like any attempt.
+
+    The budget caps extra load per run: across every node sharing this
+    policy, hedged attempts may not exceed ``budget`` times the number of
+    hedge-eligible executions so far, with at least one hedge allowed per
+    run (0.1 = at most 10% extra calls on large runs; 0 = never hedge;
+    None = no cap). The counts are kept by the workflow and reset on every
+    run, so clones and compiled templates never share a budget.
+
+    Cancelling the loser stops ASYNC and REMOTE attempts; THREAD/PROCESS
+    calls keep their worker busy until they return.
+    """
+    percentile: float = 95.0
+    max_hedges: int = 1  # Duplicates per attempt
+    budget: Optional[float] = 0.1
+    min_samples: int = 10  # History needed before hedging (ignored with a fixed delay)
+    delay: Optional[float] = None  # Fixed hedge delay in seconds instead of the percentile
+
+    def hedge_delay(self, history: Optional[DurationHistory], node_id: str) -> Optional[float]:
+        """Seconds to wait before hedging (None = not enough history to hedge)."""
+        if self.delay is not None:
+            return self.delay
+        if history is None or len(history.samples(node_id)) < self.min_samples:
+            return None
+        return history.percentile(node_id, self.percentile) / 1000
+
+    def allow_hedge(self, executions: int, hedges: int) -> bool:
+        """Whether one more hedge fits the budget, given the run's counts so far."""
+        if self.budget is None:
+            return True
+        return self.budget > 0 and hedges < max(1.0, self.budget * executions)
+
+
 @dataclass
 class WorkflowNode:
     """
@@ -49,19 +210,57 @@ class WorkflowNode:
         stage: Workflow stage this node belongs to
         executor: Async function to execute this node
         dependencies: List of node IDs this node depends on
+        optional_dependencies: Subset of ``dependencies`` that only order the
+            node: if one fails (or is skipped) the node still runs, without
+            that result in its context
         parallel_group: Optional group ID for parallel execution
+        resources: Names of resource pools held while the node runs
+        timeout: Per-attempt timeout in seconds (None = only the workflow deadline)
+        retry_policy: Retry policy (None = workflow default)
+        hedge_policy: Start duplicate attempts when an attempt runs past its
+            historical percentile (None = never hedge)
+        version: Executor version; bump it to invalidate cached results
+        cacheable: Whether results may be served from the workflow cache
+        kind: Where the executor runs; THREAD/PROCESS executors are sync
+            callables receiving only the node's inputs (see node_inputs)
+        map_source: For map nodes, the dependency whose result is fanned out
+        map_items: Extracts the items from the source result (None = iterate it)
+        reduce: Combines the ordered child results (None = return the list)
+        inputs: Context keys the node reads (None = initial context plus its
+            dependencies' outputs)
+        outputs: Keys of the (dict) result published to the context (None = the
+            whole result under the node id)
+        map_parent: For map children, the map node they were expanded from
+        map_item: For map children, the item passed as the executor's second argument
     """
     id: str
     name: str
     stage: WorkflowStage
     executor: Callable[[Dict[str, Any]], Awaitable[Any]]
     dependencies: List[str] = field(default_factory=list)
+    optional_dependencies: List[str] = field(default_factory=list)
     parallel_group: Optional[str] = None
+    resources: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+    retry_policy: Optional[RetryPolicy] = None
+    hedge_policy: Optional[HedgePolicy] = None
+    version: str = "1"
+    cacheable: bool = True
+    kind: ExecutorKind = ExecutorKind.ASYNC
+    map_source: Optional[str] = None
+    map_items: Optional[Callable[[Any], Iterable[Any]]] = None
+    reduce: Optional[Callable[[List[Any]], Any]] = None
+    inputs: Optional[List[str]] = None
+    outputs: Optional[List[str]] = None
+    map_parent: Optional[str] = None
+    map_item: Any = None
     status: NodeStatus = NodeStatus.PENDING
     result: Optional[Any] = None
     error: Optional[str] = None
     start_time: Optional[float] = None
     end_time: Optional[float] = None
+    attempts: int = 0
+    cached: bool = False
 
     @property
     def duration_ms(self) -> Optional[float]:
@@ -78,8 +277,14 @@ class WorkflowNode:
             "stage": self.stage.value,
             "status": self.status.value,
             "dependencies": self.dependencies,
+            "optional_dependencies": self.optional_dependencies,
             "parallel_group": self.parallel_group,
+            "resources": self.resources,
+            "kind": self.kind.value,
+            "map_source": self.map_source,
             "duration_ms": self.duration_ms,
+            "attempts": self.attempts,
+            "cached": self.cached,
             "error": self.error
         }
 
@@ -93,6 +298,141 @@ class WorkflowResult:
     nodes_failed: int
     results: Dict[str, Any]
     errors: List[str]
+    nodes_skipped: int = 0
+    run_id: Optional[str] = None
+
+
+class _Completions:
+    """
+    Inbox the ready-queue scheduler drains, filled by done-callbacks.
+
+    Cheaper than an asyncio.Queue per finished node: a report is a deque
+    append, and the scheduler is woken once per burst of completions.
+    """
+
+    __slots__ = ("_items", "_waiter")
+
+    def __init__(self):
+        self._items: deque = deque()
+        self._waiter: Optional[asyncio.Future] = None
+
+    def put(self, item: Any) -> None:
+        self._items.append(item)
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def drain(self) -> List[Any]:
+        """Everything reported so far (waits for the first report)."""
+        if not self._items:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        items = list(self._items)
+        self._items.clear()
+        return items
+
+
+class _StageGate:
+    """
+    Stage-by-stage admission for one run (see WorkflowArchitecture.stage_pools).
+
+    The run enters its stages in WorkflowStage order, holding one slot of the
+    current stage's pool. Ready nodes of later stages wait until every node of
+    the current stage has finished and a slot of their stage was acquired, so
+    runs sharing the pools form a pipeline: one run's DESIGN nodes can execute
+    while another run is still in REQUIREMENT.
+    """
+
+    def __init__(self, workflow: "WorkflowArchitecture"):
+        self.workflow = workflow
+        self.members: Dict[WorkflowStage, List[WorkflowNode]] = {}
+        for node in workflow.nodes.values():
+            if node.status != NodeStatus.COMPLETED:  # Restored nodes need no slot
+                self.members.setdefault(node.stage, []).append(node)
+        self.stages = [stage for stage in WorkflowStage if stage in self.members]
+        self.current: Optional[WorkflowStage] = None
+        self.held: Optional[ResourcePool] = None
+        self.entering: Optional[asyncio.Task] = None  # Acquiring the next stage's slot
+        self._next: Optional[Tuple[WorkflowStage, ResourcePool, float]] = None
+        self.waiting: List[str] = []  # Ready nodes of stages not entered yet
+
+    @property
+    def pending(self) -> bool:
+        """Whether nodes are still held back or a slot is being acquired."""
+        return bool(self.waiting) or self.entering is not None
+
+    def admit(self, node_id: str) -> bool:
+        """Whether a ready node may start now (otherwise it is held back)."""
+        if self.workflow.nodes[node_id].stage is self.current:
+            return True
+        self.waiting.append(node_id)
+        return False
+
+    def advance(self) -> List[str]:
+        """
+        Move to the next stage once the current one has finished.
+
+        Returns:
+            Held-back node ids that may start now
+        """
+        if self.entering is not None:
+            if not self.entering.done():
+                return []
+            stage, pool, queued_at = self._next
+            self.entering = None
+            self.held = pool
+            return self._enter(stage, queued_at)
+        if self.current is not None and self._unfinished(self.current):
+            return []
+
+        if self.held is not None:
+            self.held.release()
+            self.held = None
+        self.current = None
+        while self.stages:
+            stage = self.stages.pop(0)
+            if not self._unfinished(stage):
+                self._release_waiting(stage)  # Everything there was skipped
+                continue
+            pool = (self.workflow.stage_pools or {}).get(stage)
+            if pool is None:
+                return self._enter(stage, time.time())
+            self._next = (stage, pool, time.time())
+            self.entering = asyncio.ensure_future(pool.acquire())
+            return []
+        self.waiting = []
+        return []
+
+    def close(self) -> None:
+        """Give back the held slot and abandon a pending acquisition."""
+        if self.entering is not None:
+            if self.entering.done() and not self.entering.cancelled() and self.entering.exception() is None:
+                self._next[1].release()
+            else:
+                self.entering.cancel()
+            self.entering = None
+        if self.held is not None:
+            self.held.release()
+            self.held = None
+
+    def _enter(self, stage: WorkflowStage, queued_at: float) -> List[str]:
+        self.current = stage
+        self.workflow._trace_event("stage.enter", {
+            "stage": stage.value,
+            "queue_wait_ms": (time.time() - queued_at) * 1000
+        })
+        return self._release_waiting(stage)
+
+    def _release_waiting(self, stage: WorkflowStage) -> List[str]:
+        released = [node_id for node_id in self.waiting if self.workflow.nodes[node_id].stage is stage]
+        self.waiting = [node_id for node_id in self.waiting if self.workflow.nodes[node_id].stage is not stage]
+        return released
+
+    def _unfinished(self, stage: WorkflowStage) -> bool:
+        return any(node.status in (NodeStatus.PENDING, NodeStatus.RUNNING) for node in self.members[stage])
 
 
 class WorkflowArchitecture:
@@ -102,14 +442,204 @@ class WorkflowArchitecture:
     Supports:
     - Automatic dependency resolution
     - Parallel execution of independent nodes
-    - Stage-based execution
+    - Bounded concurrency with per-resource pools
+    - Timeouts, retries with backoff and deadline propagation
+    - Configurable failure policies
+    - Node result caching
+    - Checkpoint/resume
+    - Critical-path priority scheduling from historical durations
+    - Span-based tracing of runs, nodes, queue waits and retries
+    - Managed thread/process pools for CPU-bound nodes
+    - Queue-based execution of REMOTE nodes by worker processes
+    - Map nodes that fan out over an upstream result at runtime
+    - Stage-based execution, optionally stage-gated for pipelined batches
     - WBS task decomposition
     """
 
-    def __init__(self, name: str):
+    def __init__(
+        self,
+        name: str,
+        concurrency: Optional[int] = None,
+        resource_limits: Optional[Dict[str, int]] = None,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        failure_policy: FailurePolicy = FailurePolicy.SKIP_DEPENDENTS,
+        cache: Optional[NodeResultCache] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        duration_history: Optional[DurationHistory] = None,
+        tracer: Optional[Tracer] = None,
+        thread_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        task_queue: Optional[TaskQueue] = None,
+        release_intermediates: bool = False,
+        stage_pools: Optional[Dict[WorkflowStage, ResourcePool]] = None
+    ):
+        """
+        Initialize a workflow.
+
+        Args:
+            name: Workflow name
+            concurrency: Maximum number of nodes running at once (None = unbounded)
+            resource_limits: Capacity per named resource pool, e.g. {"openai": 3}
+            timeout: Whole-workflow deadline in seconds (None = no deadline)
+            retry_policy: Default retry policy for nodes without their own
+            failure_policy: What to do with the rest of the DAG when a node fails
+            cache: Result cache for cacheable nodes (None = caching disabled)
+            checkpoint_store: Backend persisting node results per run (None = disabled)
+            duration_history: Per-node duration samples used for priorities (recorded after each run)
+            tracer: Receives workflow/node spans (None = silent tracer without exporters)
+            thread_workers: Size of the pool for THREAD nodes (None = Python default)
+            process_workers: Size of the pool for PROCESS nodes (None = CPU count)
+            task_queue: Queue broker for REMOTE nodes, drained by TaskWorker processes
+            release_intermediates: Drop a node's result once every reader finished
+                (it is then also absent from WorkflowResult.results)
+            stage_pools: Worker slots per stage, usually shared by the runs of a
+                StagePipeline. When set, a run executes its stages one after
+                another, holding a slot of its current stage (stages without a
+                pool are unlimited)
+        """
         self.name = name
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_policy = failure_policy
+        self.cache = cache
+        self.checkpoint_store = checkpoint_store
+        self._checkpoint_writes: Optional[asyncio.Future] = None  # Last queued checkpoint write
+        self.run_id: Optional[str] = None  # Id of the current/last run
+        self.duration_history = duration_history
+        self._priorities: Dict[str, float] = {}
+        # id(HedgePolicy) -> [hedge-eligible executions, hedges] for the current run
+        self._hedge_counts: Dict[int, List[int]] = {}
+        self.tracer = tracer or Tracer()
+        self._workflow_span: Optional[Span] = None
+        # Extra attributes of the workflow span (not used as metric labels)
+        self.span_attributes: Dict[str, Any] = {}
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        # Created lazily on first use; may also be assigned to share pools
+        self.thread_pool: Optional[Executor] = None
+        self.process_pool: Optional[Executor] = None
+        self._own_pools: List[Executor] = []  # Executors created by this instance (shut down by close)
+        self.task_queue = task_queue
+        self.release_intermediates = release_intermediates
+        self.stage_pools = stage_pools
+        self._read_keys: Dict[str, FrozenSet[str]] = {}  # Context keys visible to each node (current run)
+        self._producers: Dict[str, str] = {}  # Published key -> node id (current run)
         self.nodes: Dict[str, WorkflowNode] = {}
         self.execution_order: List[List[str]] = []  # List of parallel batches
+        self._dependents: Dict[str, List[str]] = {}  # Reverse adjacency, kept up to date by add_node
+        self._levels: Dict[str, int] = {}  # Batch index per node for the cached plan
+        self._plan_valid = False
+        self._graph_version = next(_graph_versions)  # Changes on every graph mutation
+        # Validated run plans by graph version; shared with clones (see _prepare_run)
+        self._run_plans: Dict[Tuple[Any, ...], Any] = {}
+        self.map_children: Dict[str, List[WorkflowNode]] = {}  # Expanded children per map node (last run)
+        self.concurrency_pool: Optional[ResourcePool] = (
+            ResourcePool("workflow", concurrency) if concurrency else None
+        )
+        self.resource_pools: Dict[str, ResourcePool] = {}
+        for pool_name, limit in (resource_limits or {}).items():
+            self.add_resource_pool(pool_name, limit)
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> "WorkflowArchitecture":
+        """
+        Create a workflow from a parsed workflow_config.yaml.
+
+        Reads ``workflow.concurrency``, ``workflow.resource_limits``,
+        ``workflow.timeout``, ``workflow.retry_on_failure``,
+        ``workflow.max_retries``, ``workflow.failure_policy`` and the
+        ``performance`` caching, duration history and
+        ``release_intermediates`` settings.
+        """
+        workflow_config = config.get("workflow", {})
+        performance_config = config.get("performance", {})
+        cache = None
+        if performance_config.get("enable_caching"):
+            cache = NodeResultCache(
+                ttl=performance_config.get("cache_ttl"),
+                cache_dir=_project_path(performance_config.get("cache_dir"))
+            )
+        retry_policy = None
+        if workflow_config.get("retry_on_failure"):
+            retry_policy = RetryPolicy(max_retries=workflow_config.get("max_retries", 2))
+        return cls(
+            name,
+            concurrency=workflow_config.get("concurrency"),
+            resource_limits=workflow_config.get("resource_limits"),
+            timeout=workflow_config.get("timeout"),
+            retry_policy=retry_policy,
+            failure_policy=FailurePolicy(
+                workflow_config.get("failure_policy", FailurePolicy.SKIP_DEPENDENTS.value)
+            ),
+            cache=cache,
+            duration_history=(
+                DurationHistory(_project_path(performance_config["duration_history"]))
+                if performance_config.get("duration_history") else None
+            ),
+            release_intermediates=performance_config.get("release_intermediates", False)
+        )
+
+    def clone(self, name: Optional[str] = None, share_pools: bool = True) -> "WorkflowArchitecture":
+        """
+        Copy the graph and settings with fresh node state.
+
+        Cache, checkpoint store, duration history, tracer, task queue and
+        executor pools are shared with the original, and so are the resource
+        pools unless ``share_pools`` is False (then the clone gets its own
+        pools with the same limits). The cached plan is reused.
+        """
+        twin = copy.copy(self)
+        twin.name = name or self.name
+        # Fresh policy copies (one per shared policy), so the clone's runs
+        # can never touch the original's policy objects
+        hedge_policies = {
+            id(node.hedge_policy): dataclasses.replace(node.hedge_policy)
+            for node in self.nodes.values() if node.hedge_policy is not None
+        }
+        twin.nodes = {
+            node_id: dataclasses.replace(
+                node,
+                hedge_policy=hedge_policies.get(id(node.hedge_policy)),
+                dependencies=list(node.dependencies),
+                optional_dependencies=list(node.optional_dependencies),
+                resources=list(node.resources),
+                status=NodeStatus.PENDING,
+                result=None,
+                error=None,
+                start_time=None,
+                end_time=None,
+                attempts=0,
+                cached=False
+            )
+            for node_id, node in self.nodes.items()
+        }
+        if share_pools:
+            twin.resource_pools = dict(self.resource_pools)
+        else:
+            twin.resource_pools = {
+                pool_name: ResourcePool(pool_name, pool.limit) for pool_name, pool in self.resource_pools.items()
+            }
+            if self.concurrency_pool is not None:
+                twin.concurrency_pool = ResourcePool(self.concurrency_pool.name, self.concurrency_pool.limit)
+        twin._dependents = {node_id: list(ids) for node_id, ids in self._dependents.items()}
+        twin.execution_order = [list(batch) for batch in self.execution_order]
+        twin._levels = dict(self._levels)
+        twin._priorities = {}
+        twin._hedge_counts = {}
+        twin.map_children = {}
+        twin._workflow_span = None
+        twin._checkpoint_writes = None
+        twin.span_attributes = dict(self.span_attributes)
+        twin._own_pools = []
+        twin.run_id = None
+        return twin
+
+    def add_resource_pool(self, name: str, limit: int) -> ResourcePool:
+        """Register a named resource pool that nodes can declare."""
+        pool = ResourcePool(name, limit)
+        self.resource_pools[name] = pool
+        return pool
 
     def add_node(
         self,
@@ -118,150 +648,1312 @@ class WorkflowArchitecture:
         stage: WorkflowStage,
         executor: Callable[[Dict[str, Any]], Awaitable[Any]],
         dependencies: Optional[List[str]] = None,
-        parallel_group: Optional[str] = None
+        parallel_group: Optional[str] = None,
+        resources: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        kind: ExecutorKind = ExecutorKind.ASYNC,
+        inputs: Optional[List[str]] = None,
+        outputs: Optional[List[str]] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        optional_dependencies: Optional[List[str]] = None
     ) -> WorkflowNode:
-        """Register a new node in the workflow."""
+        """
+        Register a new node in the workflow.
+
+        ``inputs`` narrows what the node can read (and what its cache key
+        covers); ``outputs`` publishes selected keys of a dict result instead
+        of the whole result under the node id. ``optional_dependencies`` are
+        waited for like dependencies, but their failure does not skip the
+        node.
+        """
+        if kind == ExecutorKind.REMOTE:
+            executor_ref(executor)  # Fail now, not in a worker, if it cannot be imported
+        elif kind == ExecutorKind.PROCESS:
+            try:
+                pickle.dumps(executor)
+            except Exception as e:
+                raise ValueError(
+                    f"Node '{node_id}' runs in a process pool, so its executor must be "
+                    f"picklable (a module-level function): {e}"
+                ) from e
+        optional = list(optional_dependencies or [])
+        dependencies = list(dependencies or [])
+        dependencies.extend(dep_id for dep_id in optional if dep_id not in dependencies)
         node = WorkflowNode(
             id=node_id,
             name=name,
             stage=stage,
             executor=executor,
-            dependencies=dependencies or [],
-            parallel_group=parallel_group
+            dependencies=dependencies,
+            optional_dependencies=optional,
+            parallel_group=parallel_group,
+            resources=resources or [],
+            timeout=timeout,
+            retry_policy=retry_policy,
+            hedge_policy=hedge_policy,
+            kind=kind,
+            inputs=list(inputs) if inputs is not None else None,
+            outputs=list(outputs) if outputs else None
         )
+        replaced = self.nodes.get(node_id)
+        if replaced is not None:
+            for dep_id in replaced.dependencies:
+                self._dependents[dep_id].remove(node_id)
+
         self.nodes[node_id] = node
+        self._graph_version = next(_graph_versions)
+        self._dependents.setdefault(node_id, [])
+        for dep_id in node.dependencies:
+            self._dependents.setdefault(dep_id, []).append(node_id)
+
+        self._extend_plan(node, forward_referenced=replaced is None and bool(self._dependents[node_id]))
+        return node
+
+    def add_map_node(
+        self,
+        node_id: str,
+        name: str,
+        stage: WorkflowStage,
+        source: str,
+        executor: Callable[..., Any],
+        items: Optional[Callable[[Any], Iterable[Any]]] = None,
+        reduce: Optional[Callable[[List[Any]], Any]] = None,
+        dependencies: Optional[List[str]] = None,
+        parallel_group: Optional[str] = None,
+        resources: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        kind: ExecutorKind = ExecutorKind.ASYNC,
+        inputs: Optional[List[str]] = None,
+        outputs: Optional[List[str]] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        optional_dependencies: Optional[List[str]] = None
+    ) -> WorkflowNode:
+        """
+        Register a node that fans out over the result of ``source``.
+
+        When ``source`` completes, the node expands into one child per item
+        (ids ``<node_id>[0]``, ``<node_id>[1]``, ...). Each child runs
+        ``executor(context, item)`` (``executor(inputs, item)`` for
+        THREAD/PROCESS/REMOTE kinds) under the node's resources, timeout,
+        retry policy and the workflow cache, like any other node. The node's
+        result is ``reduce(results)``, or the ordered list of child results.
+
+        Args:
+            source: Dependency whose result provides the items
+            items: Extracts the items from the source result, e.g. ``lambda o: o["headings"]``
+            reduce: Combines the ordered child results (sync or async)
+            dependencies: Further dependencies besides ``source``
+            inputs: Context keys the children read (``source`` is always included)
+        """
+        deps = [source] + [dep_id for dep_id in (dependencies or []) if dep_id != source]
+        if inputs is not None and source not in inputs:
+            inputs = [source] + list(inputs)
+        node = self.add_node(
+            node_id, name, stage, executor,
+            dependencies=deps,
+            parallel_group=parallel_group,
+            resources=resources,
+            timeout=timeout,
+            retry_policy=retry_policy,
+            kind=kind,
+            inputs=inputs,
+            outputs=outputs,
+            hedge_policy=hedge_policy,
+            optional_dependencies=optional_dependencies
+        )
+        node.map_source = source
+        node.map_items = items
+        node.reduce = reduce
         return node
 
+    def _extend_plan(self, node: WorkflowNode, forward_referenced: bool) -> None:
+        """
+        Keep the cached plan valid when a node is appended.
+
+        A new node whose dependencies are all planned and that no existing node
+        already refers to can be slotted in at 1 + its deepest dependency in
+        O(deg). Anything else (replacements, forward references, unknown
+        dependencies) falls back to a full recompute on the next call.
+        """
+        if not self._plan_valid or forward_referenced or node.id in self._levels:
+            self.invalidate_plan()
+            return
+        if any(dep_id not in self._levels for dep_id in node.dependencies):
+            self.invalidate_plan()
+            return
+
+        level = max((self._levels[dep_id] + 1 for dep_id in node.dependencies), default=0)
+        if level == len(self.execution_order):
+            self.execution_order.append([])
+        self.execution_order[level].append(node.id)
+        self._levels[node.id] = level
+
+    def invalidate_plan(self) -> None:
+        """Drop the cached plan (call after mutating nodes or their dependencies directly)."""
+        self._plan_valid = False
+        self._levels = {}
+        self._graph_version = next(_graph_versions)
+
     def compute_execution_order(self) -> List[List[str]]:
         """
         Compute execution order using topological sort with parallel batching.
 
+        Kahn's algorithm over a FIFO queue, O(V + E). The plan is cached and
+        kept valid incrementally by add_node, so repeated calls are free.
+
         Returns:
             List of batches, where each batch contains node IDs that can run in parallel.
+
+        Raises:
+            ValueError: If a node depends on an unknown node
+            WorkflowCycleError: If the graph has a cycle (includes the cycle path)
         """
-        in_degree = {node_id: 0 for node_id in self.nodes}
-        adjacency = {node_id: [] for node_id in self.nodes}
+        if self._plan_valid:
+            return self.execution_order
 
-        # Build adjacency list and compute in-degrees
+        in_degree: Dict[str, int] = {}
         for node_id, node in self.nodes.items():
             for dep_id in node.dependencies:
-                adjacency[dep_id].append(node_id)
-                in_degree[node_id] += 1
+                if dep_id not in self.nodes:
+                    raise ValueError(f"Node '{node_id}' depends on unknown node '{dep_id}'")
+            in_degree[node_id] = len(node.dependencies)
+
+        levels: Dict[str, int] = {}
+        batches: List[List[str]] = []
+        queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
+        for node_id in queue:
+            levels[node_id] = 0
+
+        while queue:
+            node_id = queue.popleft()
+            level = levels[node_id]
+            if level == len(batches):
+                batches.append([])
+            batches[level].append(node_id)
+
+            for dependent_id in self._dependents[node_id]:
+                levels[dependent_id] = max(levels.get(dependent_id, 0), level + 1)
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    queue.append(dependent_id)
+
+        if len(levels) < len(self.nodes) or any(in_degree.values()):
+            raise WorkflowCycleError(self._find_cycle(in_degree))
 
-        batches = []
-        remaining = set(self.nodes.keys())
+        self.execution_order = batches
+        self._levels = levels
+        self._plan_valid = True
+        return batches
 
-        while remaining:
-            # Find all nodes with no dependencies (in_degree == 0)
-            ready = [node_id for node_id in remaining if in_degree[node_id] == 0]
+    def node_priorities(self, estimates: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """
+        Longest remaining path (ms) from each node to the end of the DAG.
 
-            if not ready:
-                raise ValueError("Circular dependency detected in workflow!")
+        Includes the node's own estimated duration. Nodes without an estimate
+        cost the mean of the known estimates (or 1.0 when nothing is known),
+        which degrades to "most hops remaining" on a cold start.
 
-            batches.append(ready)
+        Args:
+            estimates: Duration per node id in ms (defaults to duration history)
+        """
+        estimates = self._duration_estimates() if estimates is None else estimates
+        known = [value for value in estimates.values() if value is not None]
+        fallback = sum(known) / len(known) if known else 1.0
+
+        remaining: Dict[str, float] = {}
+        dependents = self._dependents
+        for batch in reversed(self.compute_execution_order()):
+            for node_id in batch:
+                own = estimates.get(node_id)
+                downstream = dependents[node_id]
+                tail = max([remaining[d] for d in downstream]) if downstream else 0.0
+                remaining[node_id] = (own if own is not None else fallback) + tail
+        return remaining
+
+    def critical_path(self, estimates: Optional[Dict[str, float]] = None) -> Tuple[List[str], float]:
+        """
+        Longest (estimated) path through the DAG.
 
-            # Remove processed nodes and update in-degrees
-            for node_id in ready:
-                remaining.remove(node_id)
-                for neighbor in adjacency[node_id]:
-                    in_degree[neighbor] -= 1
+        Args:
+            estimates: Duration per node id in ms (defaults to duration history)
 
-        self.execution_order = batches
-        return batches
+        Returns:
+            (node ids along the path, path length in ms)
+        """
+        remaining = self.node_priorities(estimates)
+        if not remaining:
+            return [], 0.0
+
+        node_id = max(
+            (n for n in remaining if not self.nodes[n].dependencies),
+            key=lambda n: remaining[n]
+        )
+        path = [node_id]
+        while self._dependents[node_id]:
+            node_id = max(self._dependents[node_id], key=lambda n: remaining[n])
+            path.append(node_id)
+        return path, remaining[path[0]]
+
+    def _duration_estimates(self) -> Dict[str, float]:
+        if self.duration_history is None:
+            return {}
+        return {
+            node_id: estimate
+            for node_id, estimate in (
+                (node_id, self.duration_history.estimate(node_id)) for node_id in self.nodes
+            )
+            if estimate is not None
+        }
+
+    def _record_durations(self) -> None:
+        """Feed this run's measured (non-cached) durations into the history."""
+        if self.duration_history is None:
+            return
+        for node in self.nodes.values():
+            if node.status == NodeStatus.COMPLETED and not node.cached and node.duration_ms is not None:
+                self.duration_history.record(node.id, node.duration_ms)
+        self.duration_history.save()
+
+    def _find_cycle(self, in_degree: Dict[str, int]) -> List[str]:
+        """Return one dependency cycle among the nodes Kahn's algorithm could not place."""
+        blocked = [node_id for node_id, degree in in_degree.items() if degree > 0]
+        visiting: Dict[str, int] = {}  # node -> index on the current path
+        finished = set()
+
+        for start in blocked:
+            if start in finished:
+                continue
+            path = [start]
+            visiting[start] = 0
+            iterators = [iter(self.nodes[start].dependencies)]
+
+            while iterators:
+                next_id = next(iterators[-1], None)
+                if next_id is None:
+                    done_id = path.pop()
+                    del visiting[done_id]
+                    finished.add(done_id)
+                    iterators.pop()
+                    continue
+                if next_id in visiting:
+                    cycle = path[visiting[next_id]:] + [next_id]
+                    cycle.reverse()  # Report in execution direction: dependency → dependent
+                    return cycle
+                if next_id in finished or in_degree.get(next_id, 0) == 0:
+                    continue
+                visiting[next_id] = len(path)
+                path.append(next_id)
+                iterators.append(iter(self.nodes[next_id].dependencies))
+
+        return blocked
 
     async def execute_node(
         self,
         node: WorkflowNode,
         context: Dict[str, Any]
     ) -> Any:
-        """Execute a single node with error handling."""
-        print(f"  ▸ Executing: {node.name} ({node.id})")
-        node.status = NodeStatus.RUNNING
+        """Execute a single node with timeouts, retries and error handling."""
+        if node.map_source is not None:
+            return await self._execute_map(node, context)
+
+        policy = node.retry_policy or self.retry_policy
+        node.attempts = 0
+        node.error = None
+        node.start_time = None
+        node.cached = False
+
+        recording = self.tracer.recording
+        span = self.tracer.start_span(
+            f"node:{node.id}",
+            parent=self._workflow_span,
+            attributes={
+                "node.id": node.id,
+                "node.name": node.name,
+                "node.stage": node.stage.value,
+                "node.resources": node.resources
+            } if recording else None
+        )
+        span_status = "failed"
+        try:
+            cache_key = None
+            if self.cache is not None and node.cacheable:
+                cache_key = self.cache.make_key(node.id, node.version, self.node_inputs(node, context))
+                if cache_key is None:
+                    self.tracer.add_event(span, "cache.uncacheable")
+                hit, result = await self.cache.aget(cache_key) if cache_key is not None else (False, None)
+                if hit:
+                    node.result = result
+                    node.status = NodeStatus.COMPLETED
+                    node.cached = True
+                    node.start_time = node.end_time = time.time()
+                    self.tracer.add_event(span, "cache.hit")
+                    span_status = "completed"
+                    return result
+
+            while True:
+                node.attempts += 1
+                try:
+                    if node.hedge_policy is not None:
+                        result = await self._execute_hedged(node, context, span)
+                    else:
+                        result = await self._execute_attempt(node, context, span)
+                    break
+
+                except asyncio.CancelledError:
+                    node.error = "Cancelled"
+                    node.status = NodeStatus.FAILED
+                    node.end_time = time.time()
+                    span_status = "cancelled"
+                    raise
+
+                except Exception as e:
+                    self.tracer.add_event(span, "attempt.error", {"attempt": node.attempts, "error": str(e)})
+                    delay = policy.backoff(node.attempts) if policy.should_retry(node.attempts, e) else None
+                    budget = remaining_time(context)
+                    if delay is None or (budget is not None and delay >= budget):
+                        node.error = str(e)
+                        node.status = NodeStatus.FAILED
+                        node.end_time = time.time()
+                        raise
+
+                    self.tracer.add_event(
+                        span, "retry", {"attempt": node.attempts, "delay_s": delay, "error": str(e)}
+                    )
+                    await asyncio.sleep(delay)
+
+            if cache_key is not None:
+                # The executor already succeeded; a store failure only costs a future hit
+                try:
+                    await self.cache.aset(cache_key, result)
+                except Exception as e:
+                    self.tracer.add_event(span, "cache.store_error", {"error": str(e)})
+            node.result = result
+            node.status = NodeStatus.COMPLETED
+            node.end_time = time.time()
+            span_status = "completed"
+            return result
+        except Exception as e:
+            # Failures outside an attempt (cache lookup) fail the node too
+            if node.status != NodeStatus.FAILED:
+                node.error = str(e)
+                node.status = NodeStatus.FAILED
+                node.end_time = time.time()
+            raise
+        finally:
+            self.tracer.end_span(
+                span,
+                status=SpanStatus.OK if span_status == "completed" else SpanStatus.ERROR,
+                attributes={
+                    "node.status": span_status,
+                    "node.duration_ms": node.duration_ms,
+                    "node.attempts": node.attempts,
+                    "node.cached": node.cached,
+                    "node.error": node.error,
+                    "node.queue_wait_ms": sum(
+                        event.attributes.get("queue_wait_ms", 0.0)
+                        for event in span.events if event.name == "attempt.start"
+                    )
+                } if recording else None
+            )
+
+    def node_inputs(self, node: WorkflowNode, context: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Inputs a node can read, as a plain dict.
+
+        During a run ``context`` is the node's ContextView (its declared
+        inputs, or the initial context plus its dependencies' outputs). Other
+        nodes' results and reserved ``_``-prefixed keys are excluded, so
+        unrelated branches do not change the cache key and THREAD/PROCESS
+        nodes only receive (and pickle) what they need.
+        """
+        inputs = {
+            key: value
+            for key, value in context.items()
+            if not key.startswith("_") and (key not in self.nodes or key in node.dependencies)
+        }
+        if node.map_parent is not None:
+            inputs[MAP_ITEM_KEY] = node.map_item  # Part of each child's cache key
+        return inputs
+
+    async def _execute_map(self, node: WorkflowNode, context: Dict[str, Any]) -> Any:
+        """Expand a map node into one child per item, run the children and reduce."""
+        node.attempts = 0
+        node.error = None
+        node.cached = False
         node.start_time = time.time()
+        node.end_time = None
+        node.status = NodeStatus.RUNNING
 
+        span = self.tracer.start_span(
+            f"node:{node.id}",
+            parent=self._workflow_span,
+            attributes={
+                "node.id": node.id,
+                "node.name": node.name,
+                "node.stage": node.stage.value,
+                "node.map_source": node.map_source
+            }
+        )
+        span_status = "failed"
         try:
-            result = await node.executor(context)
+            source = context.get(node.map_source)
+            items = list(node.map_items(source) if node.map_items else source)
+            children = [
+                dataclasses.replace(
+                    node,
+                    id=f"{node.id}[{index}]",
+                    name=f"{node.name} [{index}]",
+                    dependencies=list(node.dependencies),
+                    resources=list(node.resources),
+                    map_source=None,
+                    map_items=None,
+                    reduce=None,
+                    map_parent=node.id,
+                    map_item=item,
+                    status=NodeStatus.PENDING,
+                    result=None,
+                    start_time=None
+                )
+                for index, item in enumerate(items)
+            ]
+            self.map_children[node.id] = children
+            priority = self._priorities.get(node.id, 0.0)
+            for child in children:
+                self._priorities[child.id] = priority
+            self.tracer.add_event(span, "map.expand", {"items": len(children)})
+
+            tasks = [asyncio.ensure_future(self.execute_node(child, context)) for child in children]
+            try:
+                if tasks:
+                    # Under fail-fast the first failed item cancels its siblings;
+                    # otherwise every item finishes (and is cached) before the map fails
+                    fail_fast = self.failure_policy == FailurePolicy.FAIL_FAST
+                    await asyncio.wait(
+                        tasks, return_when=asyncio.FIRST_EXCEPTION if fail_fast else asyncio.ALL_COMPLETED
+                    )
+            finally:
+                pending = [task for task in tasks if not task.done()]
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+            failures = [(child, task.exception()) for child, task in zip(children, tasks)
+                        if not task.cancelled() and task.exception() is not None]
+            if failures:
+                child, error = failures[0]
+                cancelled = sum(1 for task in tasks if task.cancelled())
+                raise RuntimeError(
+                    f"{len(failures)}/{len(children)} map item(s) failed"
+                    + (f" ({cancelled} cancelled)" if cancelled else "")
+                    + f"; first: {child.id}: {error}"
+                )
+
+            node.attempts = 1
+            result = [task.result() for task in tasks]
+            if node.reduce is not None:
+                result = node.reduce(result)
+                if inspect.isawaitable(result):
+                    result = await result
             node.result = result
             node.status = NodeStatus.COMPLETED
-            node.end_time = time.time()
-            print(f"  ✓ Completed: {node.name} ({node.duration_ms:.2f}ms)")
+            node.cached = bool(children) and all(child.cached for child in children)
+            span_status = "completed"
             return result
 
+        except asyncio.CancelledError:
+            node.error = "Cancelled"
+            node.status = NodeStatus.FAILED
+            span_status = "cancelled"
+            raise
+
         except Exception as e:
             node.error = str(e)
             node.status = NodeStatus.FAILED
-            node.end_time = time.time()
-            print(f"  ✗ Failed: {node.name} - {e}")
             raise
 
+        finally:
+            node.end_time = time.time()
+            self.tracer.end_span(
+                span,
+                status=SpanStatus.OK if span_status == "completed" else SpanStatus.ERROR,
+                attributes={
+                    "node.status": span_status,
+                    "node.duration_ms": node.duration_ms,
+                    "node.attempts": node.attempts,
+                    "node.cached": node.cached,
+                    "node.error": node.error,
+                    "node.map_items": len(self.map_children.get(node.id, []))
+                }
+            )
+
+    async def _execute_hedged(self, node: WorkflowNode, context: Dict[str, Any], span: Span) -> Any:
+        """
+        Run one attempt, hedging it with duplicates if it outlives the hedge delay.
+
+        The delay counts from when the first attempt acquired its pools. The
+        first successful attempt wins and the rest are cancelled; the attempt
+        fails only when every started copy failed.
+        """
+        policy = node.hedge_policy
+        # Map children have no history of their own; they only hedge with a fixed delay
+        delay = policy.hedge_delay(self.duration_history, node.id)
+        if delay is None:
+            return await self._execute_attempt(node, context, span)
+
+        counts = self._hedge_counts.setdefault(id(policy), [0, 0])
+        counts[0] += 1
+        started = asyncio.Event()
+        primary = asyncio.ensure_future(self._execute_attempt(node, context, span, started))
+        tasks = [primary]
+        try:
+            # The clock starts once the primary is running, not while it queues for pools
+            waiter = asyncio.ensure_future(started.wait())
+            try:
+                await asyncio.wait([primary, waiter], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+            launched_at = time.time()
+            hedged = 0
+            error: Optional[BaseException] = None
+
+            while tasks:
+                hedge_timeout = None
+                if hedged < policy.max_hedges and delay is not None:
+                    hedge_timeout = max(0.0, launched_at + delay - time.time())
+                done, _ = await asyncio.wait(tasks, timeout=hedge_timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    if not policy.allow_hedge(counts[0], counts[1]):
+                        self.tracer.add_event(span, "hedge.denied", {"attempt": node.attempts})
+                        delay = None  # Budget spent; just wait for what is running
+                        continue
+                    counts[1] += 1
+                    hedged += 1
+                    self.tracer.add_event(span, "hedge", {
+                        "attempt": node.attempts,
+                        "hedge": hedged,
+                        "after_ms": (time.time() - launched_at) * 1000
+                    })
+                    tasks.append(asyncio.ensure_future(self._execute_attempt(node, context, span)))
+                    launched_at = time.time()
+                    continue
+
+                for task in done:
+                    tasks.remove(task)
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.tracer.add_event(span, "hedge.win", {"attempt": node.attempts})
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _execute_attempt(
+        self,
+        node: WorkflowNode,
+        context: Dict[str, Any],
+        span: Span,
+        started: Optional[asyncio.Event] = None
+    ) -> Awaitable[Any]:
+        """
+        Run one attempt of a node under its pools and deadline (``started`` is set once pools are held).
+
+        Without pools this returns _run_attempt() itself rather than wrapping
+        it, which saves a suspended coroutine per in-flight node.
+        """
+        queued_at = time.time()
+        if not node.resources and self.concurrency_pool is None:
+            return self._run_attempt(node, context, span, started, queued_at)
+        return self._run_pooled_attempt(node, context, span, started, queued_at)
+
+    async def _run_pooled_attempt(
+        self,
+        node: WorkflowNode,
+        context: Dict[str, Any],
+        span: Span,
+        started: Optional[asyncio.Event],
+        queued_at: float
+    ) -> Any:
+        # Named pools first, then the global cap, so a node queued on a busy
+        # provider does not sit on a global slot
+        named_pools = [self.resource_pools[name] for name in node.resources]
+        global_pools = [self.concurrency_pool] if self.concurrency_pool else []
+        priority = self._priorities.get(node.id, 0.0)
+        async with hold_resources(named_pools, priority), hold_resources(global_pools, priority):
+            return await self._run_attempt(node, context, span, started, queued_at)
+
+    async def _run_attempt(
+        self,
+        node: WorkflowNode,
+        context: Dict[str, Any],
+        span: Span,
+        started: Optional[asyncio.Event],
+        queued_at: float
+    ) -> Any:
+        """Body of _execute_attempt, once the node's pools are held."""
+        now = time.time()
+        if self.tracer.recording:
+            self.tracer.add_event(span, "attempt.start", {
+                "attempt": node.attempts,
+                "queue_wait_ms": (now - queued_at) * 1000
+            })
+        node.status = NodeStatus.RUNNING
+        if node.start_time is None:
+            node.start_time = now
+        if started is not None:
+            started.set()
+
+        deadline = context.get(DEADLINE_KEY)
+        if node.timeout is not None:
+            node_deadline = now + node.timeout
+            deadline = node_deadline if deadline is None else min(deadline, node_deadline)
+
+        if deadline is None:
+            return await self._invoke(node, context, deadline)
+        if deadline <= now:
+            raise NodeTimeoutError(f"Node '{node.id}' has no time left before the workflow deadline")
+
+        token = _node_deadline.set(deadline)
+        try:
+            # Note: a timed-out THREAD/PROCESS call keeps its worker busy until it returns
+            return await asyncio.wait_for(self._invoke(node, context, deadline), timeout=deadline - now)
+        except asyncio.TimeoutError as e:
+            raise NodeTimeoutError(
+                f"Node '{node.id}' timed out after {deadline - now:.2f}s"
+            ) from e
+        finally:
+            _node_deadline.reset(token)
+
+    def _invoke(self, node: WorkflowNode, context: Dict[str, Any], deadline: Optional[float]) -> Awaitable[Any]:
+        """Start the node's executor on the event loop or in its pool."""
+        args = () if node.map_parent is None else (node.map_item,)
+        if node.kind == ExecutorKind.ASYNC:
+            return node.executor(context, *args)
+
+        inputs = self.node_inputs(node, context)
+        if deadline is not None:
+            # Absolute epoch time, so remaining_time(inputs) also works in a worker process
+            inputs[DEADLINE_KEY] = deadline
+        if node.kind == ExecutorKind.REMOTE:
+            return self._invoke_remote(node, inputs, args)
+        return asyncio.get_running_loop().run_in_executor(
+            self._pool_for(node.kind), node.executor, inputs, *args
+        )
+
+    async def _invoke_remote(self, node: WorkflowNode, inputs: Dict[str, Any], args: Tuple[Any, ...] = ()) -> Any:
+        """Enqueue the node for a worker and wait for its result (cancels the task on timeout)."""
+        task_id = await asyncio.to_thread(
+            self.task_queue.enqueue, node.id, executor_ref(node.executor), inputs, self.run_id, args
+        )
+        return await self.task_queue.wait(task_id)
+
+    def _pool_for(self, kind: ExecutorKind) -> Executor:
+        if kind == ExecutorKind.PROCESS:
+            if self.process_pool is None:
+                self.process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+                self._own_pools.append(self.process_pool)
+            return self.process_pool
+        if self.thread_pool is None:
+            self.thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_workers, thread_name_prefix=f"workflow-{self.name}"
+            )
+            self._own_pools.append(self.thread_pool)
+        return self.thread_pool
+
+    def close(self) -> None:
+        """
+        Shut down the thread/process pools created by this workflow.
+
+        Pools assigned by the caller or inherited from the workflow this one
+        was cloned from are only dropped, not shut down. The workflow can
+        still run afterwards; it then creates new pools.
+        """
+        for pool in self._own_pools:
+            pool.shutdown(wait=True)
+        self._own_pools = []
+        self.thread_pool = None
+        self.process_pool = None
+
+    def __enter__(self) -> "WorkflowArchitecture":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "WorkflowArchitecture":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await asyncio.to_thread(self.close)
+
+    def validate_resources(self) -> None:
+        """Ensure every resource a node declares has a registered pool (and REMOTE nodes a queue)."""
+        for node in self.nodes.values():
+            missing = node.resources and [name for name in node.resources if name not in self.resource_pools]
+            if missing:
+                raise ValueError(
+                    f"Node '{node.id}' uses unknown resource pool(s): {', '.join(missing)}"
+                )
+            if node.kind == ExecutorKind.REMOTE and self.task_queue is None:
+                raise ValueError(f"Node '{node.id}' is REMOTE but the workflow has no task_queue")
+
+    def validate_stages(self) -> None:
+        """Ensure no node depends on a node of a later stage (required for stage gating)."""
+        order = list(WorkflowStage)
+        for node in self.nodes.values():
+            for dep_id in node.dependencies:
+                dep = self.nodes.get(dep_id)
+                if dep is not None and order.index(dep.stage) > order.index(node.stage):
+                    raise ValueError(
+                        f"Node '{node.id}' ({node.stage.value}) depends on '{dep_id}' "
+                        f"from the later stage {dep.stage.value}"
+                    )
+
+    def published_keys(self, node: WorkflowNode) -> List[str]:
+        """Context keys a node's result is published under."""
+        return list(node.outputs) if node.outputs else [node.id]
+
+    def _plan_context(self, initial_keys: Iterable[str]) -> None:
+        """
+        Resolve which context keys each node reads and who produces them.
+
+        Raises:
+            ValueError: Two nodes publish the same key, a declared input is
+                produced by a node that is not a dependency, or a map source
+                publishes named outputs
+        """
+        producers: Dict[str, str] = {}
+        for node in self.nodes.values():
+            for key in self.published_keys(node):
+                if key in producers:
+                    raise ValueError(
+                        f"Context key '{key}' is published by both '{producers[key]}' and '{node.id}'"
+                    )
+                producers[key] = node.id
+
+        initial = frozenset(key for key in initial_keys if not key.startswith("_") and key not in producers)
+        read_keys: Dict[str, FrozenSet[str]] = {}
+        # Nodes with the same dependencies (fan-outs) share one key set
+        by_dependencies: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+        for node in self.nodes.values():
+            if node.map_source is not None and self.nodes[node.map_source].outputs:
+                raise ValueError(
+                    f"Map node '{node.id}' needs source '{node.map_source}' to publish its whole result"
+                )
+            if node.inputs is None:
+                dependencies = tuple(node.dependencies)
+                keys = by_dependencies.get(dependencies)
+                if keys is None:
+                    keys = initial.union(*(self.published_keys(self.nodes[dep_id]) for dep_id in dependencies))
+                    by_dependencies[dependencies] = keys
+                read_keys[node.id] = keys
+                continue
+            for key in node.inputs:
+                producer = producers.get(key)
+                if producer is not None and producer not in node.dependencies:
+                    raise ValueError(
+                        f"Node '{node.id}' reads '{key}' from '{producer}', which is not one of its dependencies"
+                    )
+            read_keys[node.id] = frozenset(node.inputs)
+
+        self._producers = producers
+        self._read_keys = read_keys
+
+    def _prepare_run(self, initial_keys: Iterable[str]) -> None:
+        """
+        Validate the graph and resolve every node's context keys for a run.
+
+        The result is cached per graph version, initial context keys and
+        pools, in a cache clones share with their template. Repeated runs
+        (and every run of a compiled spec) therefore skip the O(V + E)
+        validation and planning.
+        """
+        self.compute_execution_order()
+        initial = frozenset(key for key in initial_keys if not key.startswith("_"))
+        key = (
+            "context", self._graph_version, initial, frozenset(self.resource_pools),
+            self.task_queue is not None, self.stage_pools is not None
+        )
+        plan = self._run_plans.get(key)
+        if plan is None:
+            self.validate_resources()
+            if self.stage_pools is not None:
+                self.validate_stages()
+            self._plan_context(initial)
+            plan = (self._producers, self._read_keys)
+            self._cache_run_plan(key, plan)
+        self._producers, self._read_keys = plan
+
+    def _run_priorities(self) -> Dict[str, float]:
+        """node_priorities() for a run (cached per graph version without a duration history)."""
+        if self.duration_history is not None:
+            # Estimates move with every recorded run
+            return self.node_priorities()
+        key = ("priorities", self._graph_version)
+        priorities = self._run_plans.get(key)
+        if priorities is None:
+            priorities = self.node_priorities()
+            self._cache_run_plan(key, priorities)
+        # Map nodes add their children's priorities during the run
+        return dict(priorities)
+
+    def _cache_run_plan(self, key: Tuple[Any, ...], plan: Any) -> None:
+        if len(self._run_plans) >= MAX_RUN_PLANS:
+            self._run_plans.clear()
+        self._run_plans[key] = plan
+
+    def _publish(self, node: WorkflowNode, result: Any, store: WorkflowContext) -> None:
+        """Publish a finished node's result to the run's context."""
+        if not node.outputs:
+            store.publish(node.id, result)
+            return
+        if not isinstance(result, Mapping):
+            raise ValueError(
+                f"Node '{node.id}' declares outputs {node.outputs} but returned {type(result).__name__}"
+            )
+        missing = [key for key in node.outputs if key not in result]
+        if missing:
+            raise ValueError(f"Node '{node.id}' did not return declared output(s): {', '.join(missing)}")
+        for key in node.outputs:
+            store.publish(key, result[key])
+
+    def _release_inputs(self, node_id: str, store: WorkflowContext, all_results: Dict[str, Any]) -> None:
+        """Record that a node is done reading; drop intermediates nobody needs anymore."""
+        if not store.release:
+            return
+        for key in store.consume(self._read_keys.get(node_id, ())):
+            producer_id = self._producers.get(key)
+            if producer_id is None:
+                continue
+            producer = self.nodes[producer_id]
+            if any(other in store for other in self.published_keys(producer)):
+                continue
+            all_results.pop(producer_id, None)
+            producer.result = None
+            for child in self.map_children.get(producer_id, []):
+                child.result = None
+
     async def execute_batch(
         self,
         batch: List[str],
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Execute a batch of nodes in parallel."""
+        """
+        Execute a batch of nodes in parallel (bounded by the workflow's pools).
+
+        Nodes read through read-only views; results are published into
+        ``context`` (under their ``outputs`` keys, if declared).
+        """
+        self._prepare_run(context.keys())
+        store = WorkflowContext(context, copy=False)
         nodes = [self.nodes[node_id] for node_id in batch]
-        tasks = [self.execute_node(node, context) for node in nodes]
+        tasks = [self.execute_node(node, store.view(self._read_keys[node.id])) for node in nodes]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Store results in context
         batch_results = {}
-        for node_id, result in zip(batch, results):
-            if isinstance(result, Exception):
-                batch_results[node_id] = {"error": str(result)}
-            else:
-                batch_results[node_id] = result
-                context[node_id] = result  # Make result available to dependent nodes
+        for node, result in zip(nodes, results):
+            if not isinstance(result, Exception):
+                try:
+                    self._publish(node, result, store)
+                except ValueError as e:
+                    result = e
+            batch_results[node.id] = {"error": str(result)} if isinstance(result, Exception) else result
 
         return batch_results
 
-    async def execute(self, initial_context: Optional[Dict[str, Any]] = None) -> WorkflowResult:
+    async def _execute_ready_queue(
+        self,
+        store: WorkflowContext,
+        all_results: Dict[str, Any],
+        errors: List[str],
+        gate: Optional[_StageGate] = None
+    ) -> None:
+        """
+        Run every node through a ready queue keyed on remaining dependencies.
+
+        A node is launched the moment its last dependency finishes, so a slow
+        node only delays its own descendants rather than every node in the
+        following batch. When the workflow deadline passes, in-flight nodes
+        are cancelled and nodes that never started are marked failed. Node failures
+        are handled according to ``self.failure_policy``. Nodes that are
+        already COMPLETED (restored from a checkpoint) are not re-run. Each
+        node reads through its own view of ``store``; results are published
+        as nodes finish. With a ``gate``, ready nodes additionally wait until
+        the run has entered their stage.
+        """
+        dependents = self._dependents
+        nodes = self.nodes
+        if any(node.status == NodeStatus.COMPLETED for node in nodes.values()):
+            remaining_deps: Dict[str, int] = {
+                node_id: sum(1 for dep_id in node.dependencies if nodes[dep_id].status != NodeStatus.COMPLETED)
+                for node_id, node in nodes.items()
+            }
+        else:
+            remaining_deps = {node_id: len(node.dependencies) for node_id, node in nodes.items()}
+
+        ready = [
+            node_id for node_id, count in remaining_deps.items()
+            if count == 0 and nodes[node_id].status != NodeStatus.COMPLETED
+        ]
+        running: Dict[asyncio.Task, str] = {}
+        deadline = store.get(DEADLINE_KEY)
+        # Finished tasks (and the gate's slot acquisition) report here through
+        # done-callbacks, so a completion costs O(1) instead of re-waiting on
+        # every running task; None is put when the workflow deadline passes
+        completions = _Completions()
+        deadline_timer = asyncio.get_running_loop().call_later(
+            max(0.0, deadline - time.time()), completions.put, None
+        ) if deadline is not None else None
+        watched_entering: Optional[asyncio.Future] = None
+        # Hoisted out of the per-node loops below
+        ensure_future, report, view = asyncio.ensure_future, completions.put, store.view
+        priorities, read_keys = self._priorities, self._read_keys
+        checkpointing = self.checkpoint_store is not None and self.run_id is not None
+
+        while ready or running or (gate is not None and gate.pending):
+            if gate is not None:
+                ready.extend(gate.advance())
+            # Longest remaining path first, so capped pools serve the critical path
+            if len(ready) > 1:
+                ready.sort(key=lambda n: priorities.get(n, 0.0), reverse=True)
+            for node_id in ready:
+                node = nodes[node_id]
+                if node.status == NodeStatus.SKIPPED:
+                    continue
+                if gate is not None and not gate.admit(node_id):
+                    continue
+                task = ensure_future(self.execute_node(node, view(read_keys[node_id])))
+                task.add_done_callback(report)
+                running[task] = node_id
+            ready = []
+
+            if gate is not None and gate.entering is not None and gate.entering is not watched_entering:
+                watched_entering = gate.entering
+                watched_entering.add_done_callback(completions.put)
+            if not running and (gate is None or gate.entering is None):
+                continue  # Nothing in flight; gate.advance() decides on the next pass
+
+            done = await completions.drain()
+            if None in done:
+                done.remove(None)
+                if done:
+                    completions.put(None)  # Handle what finished first, then the deadline
+
+            if not done:
+                # Workflow deadline reached with nodes still queued or running
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+                for node_id in running.values():
+                    all_results[node_id] = {"error": "Workflow deadline exceeded"}
+                    errors.append(f"{node_id}: Workflow deadline exceeded")
+                    self._checkpoint_node(self.nodes[node_id])
+                # Nodes that never started (queued or held at the stage gate)
+                # fail too, otherwise the run would look successful
+                unstarted = [node for node in self.nodes.values() if node.status == NodeStatus.PENDING]
+                for node in unstarted:
+                    node.status = NodeStatus.FAILED
+                    node.error = "Workflow deadline exceeded before the node started"
+                    all_results[node.id] = {"error": node.error}
+                    errors.append(f"{node.id}: {node.error}")
+                    self._checkpoint_node(node)
+                errors.append(
+                    f"Workflow deadline exceeded ({len(running)} node(s) cancelled, "
+                    f"{len(unstarted)} never started)"
+                )
+                self._trace_event("deadline.exceeded", {"cancelled": len(running), "unstarted": len(unstarted)})
+                return
+
+            failed_ids = []
+            for task in done:
+                node_id = running.pop(task, None)
+                if node_id is None:
+                    continue  # The gate's slot acquisition, picked up by gate.advance() on the next pass
+                node = nodes[node_id]
+                error = task.exception()
+                if error is None:
+                    result = task.result()
+                    try:
+                        self._publish(node, result, store)
+                    except ValueError as e:
+                        error = e
+                        node.status = NodeStatus.FAILED
+                        node.error = str(e)
+                if error is not None and node.status != NodeStatus.FAILED:
+                    # Whatever raised, a node whose task failed fails the run
+                    node.status = NodeStatus.FAILED
+                    node.error = str(error)
+                    node.end_time = node.end_time or time.time()
+                if checkpointing:
+                    self._checkpoint_node(node)
+                if error is not None:
+                    all_results[node_id] = {"error": str(error)}
+                    errors.append(f"{node_id}: {error}")
+                    failed_ids.append(node_id)
+                else:
+                    all_results[node_id] = result
+                # A failed reader is done reading too; otherwise its inputs stay pinned
+                if store.release:
+                    self._release_inputs(node_id, store, all_results)
+                if error is not None and self.failure_policy != FailurePolicy.CONTINUE:
+                    continue
+
+                for dependent_id in dependents[node_id]:
+                    remaining_deps[dependent_id] -= 1
+                    if remaining_deps[dependent_id] == 0:
+                        ready.append(dependent_id)
+
+            if not failed_ids or self.failure_policy == FailurePolicy.CONTINUE:
+                continue
+
+            if self.failure_policy == FailurePolicy.FAIL_FAST:
+                reason = f"Cancelled: fail-fast after '{failed_ids[0]}' failed"
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+                for node_id in running.values():
+                    self._skip_node(self.nodes[node_id], reason)
+                    self._release_inputs(node_id, store, all_results)
+                for node in self.nodes.values():
+                    if node.status == NodeStatus.PENDING:
+                        self._skip_node(node, f"Skipped: fail-fast after '{failed_ids[0]}' failed")
+                        self._release_inputs(node.id, store, all_results)
+                break
+
+            # SKIP_DEPENDENTS: prune every branch downstream of the failures,
+            # except nodes that only depend on a pruned node optionally
+            stack = [(failed_id, failed_id) for failed_id in failed_ids]
+            while stack:
+                upstream_id, failed_id = stack.pop()
+                for node_id in dependents[upstream_id]:
+                    node = self.nodes[node_id]
+                    if node.status == NodeStatus.SKIPPED:
+                        continue
+                    if upstream_id in node.optional_dependencies:
+                        remaining_deps[node_id] -= 1
+                        if remaining_deps[node_id] == 0:
+                            ready.append(node_id)
+                        continue
+                    self._skip_node(node, f"Skipped: dependency '{failed_id}' failed")
+                    self._release_inputs(node_id, store, all_results)
+                    stack.append((node_id, failed_id))
+
+        if deadline_timer is not None:
+            deadline_timer.cancel()
+
+    def _skip_node(self, node: WorkflowNode, reason: str) -> None:
+        """Mark a node as skipped because of an upstream failure."""
+        node.status = NodeStatus.SKIPPED
+        node.error = reason
+        self._checkpoint_node(node)
+        span = self.tracer.start_span(
+            f"node:{node.id}",
+            parent=self._workflow_span,
+            attributes={"node.id": node.id, "node.name": node.name, "node.stage": node.stage.value}
+        )
+        self.tracer.add_event(span, "skipped", {"reason": reason})
+        self.tracer.end_span(span, SpanStatus.UNSET, {"node.status": "skipped", "node.error": reason})
+
+    def _trace_event(self, name: str, attributes: Dict[str, Any]) -> None:
+        """Attach an event to the current workflow span, if a run is active."""
+        if self._workflow_span is not None:
+            self.tracer.add_event(self._workflow_span, name, attributes)
+
+    def _checkpoint_node(self, node: WorkflowNode) -> None:
+        """
+        Persist a finished node's state for the current run.
+
+        The write runs in a worker thread so file/SQLite I/O never blocks
+        the event loop; writes are applied in order and flushed before the
+        run returns (see _flush_checkpoints).
+        """
+        if self.checkpoint_store is None or self.run_id is None:
+            return
+        checkpoint = NodeCheckpoint(
+            node_id=node.id,
+            status=node.status.value,
+            result=node.result,
+            error=node.error,
+            start_time=node.start_time,
+            end_time=node.end_time,
+            attempts=node.attempts
+        )
+        self._checkpoint_writes = asyncio.ensure_future(
+            self._save_checkpoint(self._checkpoint_writes, self.run_id, checkpoint)
+        )
+
+    async def _save_checkpoint(
+        self,
+        previous: Optional[asyncio.Future],
+        run_id: str,
+        checkpoint: NodeCheckpoint
+    ) -> None:
+        if previous is not None:
+            await previous
+        try:
+            await asyncio.to_thread(self.checkpoint_store.save_node, run_id, checkpoint)
+        except Exception as e:
+            # The node simply re-runs on resume
+            self._trace_event("checkpoint.skipped", {"node.id": checkpoint.node_id, "error": str(e)})
+
+    async def _flush_checkpoints(self) -> None:
+        """Wait for every queued checkpoint write (also while the run is being cancelled)."""
+        writes = self._checkpoint_writes
+        if writes is not None:
+            await asyncio.shield(writes)
+            if self._checkpoint_writes is writes:
+                self._checkpoint_writes = None
+
+    async def execute(
+        self,
+        initial_context: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        run_id: Optional[str] = None
+    ) -> WorkflowResult:
         """
         Execute the entire workflow.
 
         Args:
             initial_context: Initial data passed to first nodes
+            timeout: Whole-workflow deadline in seconds (overrides the workflow default)
+            run_id: Checkpoint run id (generated when a checkpoint store is set)
 
         Returns:
             WorkflowResult with execution summary
         """
-        print(f"\n{'='*60}")
-        print(f"Executing Workflow: {self.name}")
-        print(f"{'='*60}\n")
+        context = initial_context if initial_context is not None else {}
+        self.run_id = run_id
+        if self.checkpoint_store is not None:
+            self.run_id = run_id or uuid.uuid4().hex
+            await asyncio.to_thread(
+                self.checkpoint_store.save_run,
+                self.run_id,
+                self.name,
+                {key: value for key, value in context.items() if not key.startswith("_")}
+            )
+        return await self._run(context, timeout, restored={})
+
+    async def resume(
+        self,
+        run_id: str,
+        timeout: Optional[float] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> WorkflowResult:
+        """
+        Resume a checkpointed run, re-executing only its incomplete nodes.
 
-        # Compute execution order
-        self.compute_execution_order()
-        print(f"Execution plan: {len(self.execution_order)} batches")
-        for i, batch in enumerate(self.execution_order, 1):
-            print(f"  Batch {i}: {len(batch)} nodes (parallel)")
+        Reserved ``_`` keys (HTTP session, tenant, ...) are runtime objects
+        and are not checkpointed; pass them again in ``context``.
 
-        print()
+        Args:
+            run_id: Run id returned in a previous WorkflowResult
+            timeout: Deadline in seconds for the resumed part of the run
+            context: Values added to the checkpointed initial context
+
+        Returns:
+            WorkflowResult covering restored and newly executed nodes
+        """
+        if self.checkpoint_store is None:
+            raise RuntimeError("resume() requires a checkpoint_store")
+        checkpoint = await asyncio.to_thread(self.checkpoint_store.load_run, run_id)
+        if checkpoint is None:
+            raise KeyError(f"No checkpoint found for run '{run_id}'")
+
+        self.run_id = run_id
+        restored = {
+            node_id: node_checkpoint
+            for node_id, node_checkpoint in checkpoint.nodes.items()
+            if node_checkpoint.status == NodeStatus.COMPLETED.value and node_id in self.nodes
+        }
+        return await self._run({**checkpoint.initial_context, **(context or {})}, timeout, restored)
 
-        # Initialize context
-        context = initial_context or {}
+    async def _run(
+        self,
+        context: Dict[str, Any],
+        timeout: Optional[float],
+        restored: Dict[str, NodeCheckpoint]
+    ) -> WorkflowResult:
+        """Shared body of execute() and resume()."""
+        # Validate the DAG and plan context keys (cached per graph version)
+        self._prepare_run(context.keys())
+        self._priorities = self._run_priorities()
+        self.map_children = {}
+        self._hedge_counts = {}
+
+        # Initialize node state and context
+        for node in self.nodes.values():
+            node.status = NodeStatus.PENDING
+            node.result = None
+            node.error = None
+            node.start_time = None
+            node.end_time = None
+            node.attempts = 0
+            node.cached = False
         all_results = {}
         errors = []
-        workflow_start = time.time()
+        # The caller's dict is copied; nodes only ever see read-only views
+        store = WorkflowContext(context, release=self.release_intermediates)
 
-        # Execute batches sequentially, nodes within each batch in parallel
-        for batch_idx, batch in enumerate(self.execution_order, 1):
-            print(f"Batch {batch_idx}/{len(self.execution_order)} - {len(batch)} nodes")
-
-            try:
-                batch_results = await self.execute_batch(batch, context)
-                all_results.update(batch_results)
+        # Restore nodes that completed in a previous attempt of this run
+        for node_id, node_checkpoint in restored.items():
+            node = self.nodes[node_id]
+            node.status = NodeStatus.COMPLETED
+            node.result = node_checkpoint.result
+            node.start_time = node_checkpoint.start_time
+            node.end_time = node_checkpoint.end_time
+            node.attempts = node_checkpoint.attempts
+            self._publish(node, node_checkpoint.result, store)
+            all_results[node_id] = node_checkpoint.result
+
+        # Count the pending readers of every published key, so intermediates
+        # can be released once the last one finishes
+        if store.release:
+            readers: Dict[str, int] = {}
+            for node_id, keys in self._read_keys.items():
+                if node_id in restored:
+                    continue
+                for key in keys:
+                    if key in self._producers:
+                        readers[key] = readers.get(key, 0) + 1
+            store.set_readers(readers)
+
+        self._workflow_span = self.tracer.start_span(
+            f"workflow:{self.name}",
+            trace_id=self.run_id,
+            attributes={
+                "workflow.name": self.name,
+                "workflow.run_id": self.run_id,
+                "workflow.nodes": len(self.nodes),
+                "workflow.levels": [len(batch) for batch in self.execution_order],
+                "workflow.restored": len(restored),
+                **self.span_attributes
+            }
+        )
+        workflow_start = time.time()
 
-                # Check for errors
-                for node_id, result in batch_results.items():
-                    if isinstance(result, dict) and "error" in result:
-                        errors.append(f"{node_id}: {result['error']}")
+        # Publish the deadline so executors can read their remaining budget
+        workflow_timeout = timeout if timeout is not None else self.timeout
+        if workflow_timeout is not None:
+            store.publish(DEADLINE_KEY, workflow_start + workflow_timeout)
 
-            except Exception as e:
-                errors.append(f"Batch {batch_idx} failed: {str(e)}")
-                print(f"  ✗ Batch {batch_idx} failed: {e}")
-                break
+        # Dependency-driven scheduling: each node starts as soon as its own
+        # dependencies have finished instead of waiting for a whole batch
+        gate = _StageGate(self) if self.stage_pools is not None else None
+        try:
+            await self._execute_ready_queue(store, all_results, errors, gate)
+        finally:
+            if gate is not None:
+                gate.close()
+            await self._flush_checkpoints()
 
-            print()
+        self._record_durations()
 
         workflow_end = time.time()
         total_duration = (workflow_end - workflow_start) * 1000
@@ -269,21 +1961,34 @@ class WorkflowArchitecture:
         # Calculate statistics
         nodes_completed = sum(1 for n in self.nodes.values() if n.status == NodeStatus.COMPLETED)
         nodes_failed = sum(1 for n in self.nodes.values() if n.status == NodeStatus.FAILED)
-
-        print(f"{'='*60}")
-        print(f"Workflow Completed: {self.name}")
-        print(f"  Total Duration: {total_duration:.2f}ms")
-        print(f"  Nodes Completed: {nodes_completed}/{len(self.nodes)}")
-        print(f"  Nodes Failed: {nodes_failed}")
-        print(f"{'='*60}\n")
+        nodes_skipped = sum(1 for n in self.nodes.values() if n.status == NodeStatus.SKIPPED)
+        # A node left PENDING or RUNNING never finished, so the run did not either
+        finished = nodes_completed + nodes_skipped == len(self.nodes)
+
+        self.tracer.end_span(
+            self._workflow_span,
+            status=SpanStatus.OK if finished else SpanStatus.ERROR,
+            attributes={
+                "workflow.nodes_completed": nodes_completed,
+                "workflow.nodes_failed": nodes_failed,
+                "workflow.nodes_skipped": nodes_skipped,
+                "workflow.errors": errors
+            }
+        )
+        self._workflow_span = None
+        if self.tracer.exporters:
+            # Exporters may write files; wait for them off the event loop
+            await asyncio.to_thread(self.tracer.flush)
 
         return WorkflowResult(
-            success=nodes_failed == 0,
+            success=finished,
             total_duration_ms=total_duration,
             nodes_completed=nodes_completed,
             nodes_failed=nodes_failed,
             results=all_results,
-            errors=errors
+            errors=errors,
+            nodes_skipped=nodes_skipped,
+            run_id=self.run_id
         )
 
     def visualize_dag(self) -> str:
@@ -301,15 +2006,24 @@ class WorkflowArchitecture:
             if stage in stages:
                 output.append(f"\n{stage.value.upper()}:")
                 for node in stages[stage]:
-                    deps = ", ".join(node.dependencies) if node.dependencies else "None"
+                    deps = ", ".join(
+                        f"{dep_id} (optional)" if dep_id in node.optional_dependencies else dep_id
+                        for dep_id in node.dependencies
+                    ) or "None"
                     parallel = f" [Parallel: {node.parallel_group}]" if node.parallel_group else ""
-                    output.append(f"  • {node.id} ({node.name}){parallel}")
+                    resources = f" [Resources: {', '.join(node.resources)}]" if node.resources else ""
+                    kind = f" [Runs in: {node.kind.value}]" if node.kind != ExecutorKind.ASYNC else ""
+                    fan_out = f" [Map over: {node.map_source}]" if node.map_source else ""
+                    output.append(f"  • {node.id} ({node.name}){parallel}{resources}{kind}{fan_out}")
                     output.append(f"    Dependencies: {deps}")
 
         return "\n".join(output)
 
     def get_execution_summary(self) -> Dict[str, Any]:
         """Get summary of workflow execution statistics."""
+        critical_path, critical_path_ms = self.critical_path(
+            {n.id: n.duration_ms for n in self.nodes.values() if n.duration_ms is not None}
+        ) if self.nodes else ([], 0.0)
         return {
             "workflow_name": self.name,
             "total_nodes": len(self.nodes),
@@ -322,12 +2036,44 @@ class WorkflowArchitecture:
                 stage.value: sum(1 for n in self.nodes.values() if n.stage == stage)
                 for stage in WorkflowStage
             },
+            "cache_hits": sum(1 for n in self.nodes.values() if n.cached),
+            "critical_path": critical_path,
+            "critical_path_ms": critical_path_ms,
             "average_node_duration_ms": sum(
                 n.duration_ms for n in self.nodes.values() if n.duration_ms
             ) / len([n for n in self.nodes.values() if n.duration_ms]) if any(n.duration_ms for n in self.nodes.values()) else 0
         }
 
 
+# Configuration helpers
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CONFIG_PATH = os.path.join(PROJECT_ROOT, "config", "workflow_config.yaml")
+
+
+def _project_path(path: Optional[str]) -> Optional[str]:
+    """Resolve a config path relative to the project root (not the working directory)."""
+    return os.path.join(PROJECT_ROOT, path) if path else path
+
+
+def load_workflow_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load workflow_config.yaml (requires PyYAML).
+
+    Args:
+        path: Config file path (defaults to config/workflow_config.yaml)
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    try:
+        import yaml
+    except ImportError as e:
+        raise ImportError("PyYAML is required to load workflow config: pip install pyyaml") from e
+
+    with open(path or DEFAULT_CONFIG_PATH, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
 # Work Breakdown Structure (WBS) helpers
 def create_wbs_nodes(
     workflow: WorkflowArchitecture,
@@ -364,7 +2110,7 @@ def create_wbs_nodes(
 if __name__ == "__main__":
     # Demo: Simple workflow
     async def demo():
-        workflow = WorkflowArchitecture("Demo Workflow")
+        workflow = WorkflowArchitecture("Demo Workflow", tracer=Tracer([ConsoleSpanExporter()]))
 
         # Define sample executors
         async def fetch_data(ctx):
@@ -0,0 +1,166 @@
+"""
+Workflow Context
+================
+
+Scoped, read-only context for workflow nodes.
+
+Instead of one mutable dict that every node reads and writes, a run keeps a
+WorkflowContext store:
+- Each node reads through a ContextView limited to the keys it needs
+  (its declared ``inputs``, or the initial context plus its dependencies'
+  outputs). Views cannot be written to.
+- Node results are published to the store by the engine under the node id,
+  or under the node's declared ``outputs`` keys.
+- With release enabled, a published value is dropped as soon as every node
+  that reads it has finished, so large intermediate payloads (scraped HTML,
+  extracted text) do not stay alive for the whole run.
+
+Keys starting with "_" are reserved for the engine (deadline, shared
+session, tenant, ...) and are visible in every view.
+
+Example:
+  store = WorkflowContext({"keyword": "AI automation"})
+  store.publish("fetch_serp", serp_response)
+  view = store.view({"keyword", "fetch_serp"})
+  view["fetch_serp"]          # OK
+  view["other"] = 1           # TypeError: views are read-only
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+
+
+class ContextView(Mapping):
+    """
+    Read-only window onto a WorkflowContext.
+
+    Only the allowed keys (plus reserved ``_`` keys) are visible. Values are
+    shared, not copied: treat them as immutable and return new objects.
+    """
+
+    __slots__ = ("_data", "_keys", "_reserved")
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        keys: Optional[FrozenSet[str]],
+        reserved: Optional[Set[str]] = None
+    ):
+        self._data = data
+        self._keys = keys  # None = every key
+        # Reserved keys present in ``data`` (live, owned by the store), so
+        # iterating a keyed view never scans the whole store
+        self._reserved = reserved if reserved is not None else {key for key in data if key.startswith("_")}
+
+    def _visible(self, key: str) -> bool:
+        return self._keys is None or key in self._keys or key.startswith("_")
+
+    def __getitem__(self, key: str) -> Any:
+        if not self._visible(key):
+            raise KeyError(key)
+        return self._data[key]
+
+    # Mapping's get/__contains__ go through a raised KeyError for every miss;
+    # executors probe optional keys (the deadline, the session) on every call
+    def get(self, key: str, default: Any = None) -> Any:
+        if not self._visible(key):
+            return default
+        return self._data.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._visible(key) and key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        if self._keys is None:
+            return iter(list(self._data))
+        own = [key for key in self._keys if key in self._data and not key.startswith("_")]
+        return iter(own + list(self._reserved))
+
+    def __len__(self) -> int:
+        if self._keys is None:
+            return len(self._data)
+        return sum(1 for key in self._keys if key in self._data and not key.startswith("_")) + len(self._reserved)
+
+    def __repr__(self) -> str:
+        return f"ContextView({sorted(self)!r})"
+
+
+class WorkflowContext:
+    """
+    Store of initial values and published node outputs for one run.
+
+    Attributes:
+        release: Drop values once their last reader finished
+    """
+
+    def __init__(self, initial: Optional[Dict[str, Any]] = None, release: bool = False, copy: bool = True):
+        """
+        Initialize the store.
+
+        Args:
+            initial: Initial context (copied unless ``copy`` is False)
+            release: Drop published values once their last reader finished
+            copy: Copy ``initial``; with False, publishes write through to it
+        """
+        initial = initial if initial is not None else {}
+        self._data: Dict[str, Any] = dict(initial) if copy else initial
+        self._reserved: Set[str] = {key for key in self._data if key.startswith("_")}
+        self._readers: Dict[str, int] = {}
+        self.release = release
+        self.released: List[str] = []  # Keys dropped so far, in order
+
+    def view(self, keys: Optional[Iterable[str]] = None) -> ContextView:
+        """Read-only view of ``keys`` (None = all keys)."""
+        return ContextView(self._data, frozenset(keys) if keys is not None else None, self._reserved)
+
+    def publish(self, key: str, value: Any) -> None:
+        """Make a value available to readers."""
+        self._data[key] = value
+        if key.startswith("_"):
+            self._reserved.add(key)
+
+    def discard(self, key: str) -> None:
+        """Remove a key if present."""
+        self._data.pop(key, None)
+        self._reserved.discard(key)
+
+    def set_readers(self, readers: Dict[str, int]) -> None:
+        """
+        Register how many nodes read each key.
+
+        Only keys listed here are ever released; initial and reserved keys
+        should be left out.
+        """
+        self._readers = dict(readers)
+
+    def consume(self, keys: Iterable[str]) -> List[str]:
+        """
+        Record that one reader of ``keys`` has finished.
+
+        Returns:
+            Keys whose last reader finished (dropped when ``release`` is on)
+        """
+        finished = []
+        for key in keys:
+            count = self._readers.get(key)
+            if count is None:
+                continue
+            count -= 1
+            self._readers[key] = count
+            if count <= 0:
+                del self._readers[key]
+                finished.append(key)
+                if self.release:
+                    self.discard(key)
+                    self.released.append(key)
+        return finished
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Shallow copy of the current contents."""
+        return dict(self._data)
@@ -0,0 +1,457 @@
+"""
+Workflow Runtime
+================
+
+Long-lived host for many concurrent workflow runs in one process.
+
+A WorkflowArchitecture run is self-contained: it creates its own pools and
+its agents open their own HTTP sessions. Serving many article jobs that way
+multiplies connections and lets every run believe it owns the full provider
+rate limit. WorkflowRuntime keeps those resources in one place:
+- One event loop (the caller's, or a background thread via start())
+- One aiohttp ClientSession, exposed to nodes as context[SESSION_KEY]
+- Shared ResourcePools (global concurrency and named limits like openai: 3)
+- Shared thread/process pools for CPU-bound nodes
+- Fair admission across tenants (round-robin, optional per-tenant cap)
+
+Submitted workflows are templates: each submission runs a clone, so the same
+definition can be submitted many times concurrently.
+
+Example:
+  runtime = WorkflowRuntime(concurrency=20, resource_limits={"openai": 3, "serp": 2},
+                            max_active_workflows=50, per_tenant_limit=5)
+  async with runtime:
+      results = await asyncio.gather(*[
+          runtime.submit(blog_workflow, {"keyword": kw}, tenant=customer)
+          for kw, customer in jobs
+      ])
+
+  # From synchronous code (Streamlit, Flask, scripts)
+  runtime.start()
+  result = runtime.run(blog_workflow, {"keyword": "AI automation"})
+  runtime.stop()
+"""
+
+import asyncio
+import sys
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.resource_pool import ResourcePool
+from core.tracing import Tracer
+from core.workflow_architecture import ExecutorKind, WorkflowArchitecture, WorkflowResult
+
+
+# Context key under which nodes find the shared aiohttp session
+SESSION_KEY = "_http_session"
+# Context key holding the tenant a run was submitted for
+TENANT_KEY = "_tenant"
+
+
+class TenantScheduler:
+    """
+    Admission control for workflow runs with round-robin fairness.
+
+    At most ``max_active`` runs execute at once. When the runtime is full,
+    waiting tenants take turns: one run is admitted per tenant per round, so
+    a tenant that submits 500 jobs cannot starve one that submits 5.
+    """
+
+    def __init__(self, max_active: int, per_tenant_limit: Optional[int] = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_active: Maximum number of concurrently running workflows
+            per_tenant_limit: Maximum running workflows per tenant (None = no cap)
+        """
+        if max_active < 1:
+            raise ValueError(f"max_active must be at least 1, got {max_active}")
+        self.max_active = max_active
+        self.per_tenant_limit = per_tenant_limit
+        self.active = 0
+        self.active_by_tenant: Dict[str, int] = {}
+        self._queues: Dict[str, Deque[asyncio.Future]] = {}
+        self._ring: Deque[str] = deque()  # Tenants with queued runs, in turn order
+
+    @property
+    def waiting(self) -> Dict[str, int]:
+        """Queued (not yet admitted) runs per tenant."""
+        return {
+            tenant: sum(1 for waiter in queue if not waiter.done())
+            for tenant, queue in self._queues.items()
+        }
+
+    async def admit(self, tenant: str) -> None:
+        """Wait until a run for ``tenant`` may start."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(tenant, deque()).append(waiter)
+        if tenant not in self._ring:
+            self._ring.append(tenant)
+        self._dispatch()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just before cancellation; give the slot back
+                self.release(tenant)
+            raise
+
+    def release(self, tenant: str) -> None:
+        """Mark a run for ``tenant`` as finished and admit the next one."""
+        self.active -= 1
+        self.active_by_tenant[tenant] -= 1
+        if not self.active_by_tenant[tenant]:
+            del self.active_by_tenant[tenant]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued runs, one per tenant per round, while capacity allows."""
+        while self.active < self.max_active and self._ring:
+            admitted = False
+            for _ in range(len(self._ring)):
+                tenant = self._ring[0]
+                self._ring.rotate(-1)
+                queue = self._queues[tenant]
+                while queue and queue[0].done():
+                    queue.popleft()  # Cancelled while waiting
+                if not queue:
+                    self._ring.remove(tenant)
+                    del self._queues[tenant]
+                    continue
+                if self.per_tenant_limit and self.active_by_tenant.get(tenant, 0) >= self.per_tenant_limit:
+                    continue
+
+                self.active += 1
+                self.active_by_tenant[tenant] = self.active_by_tenant.get(tenant, 0) + 1
+                queue.popleft().set_result(None)
+                admitted = True
+                break
+            if not admitted:
+                return
+
+
+class WorkflowRuntime:
+    """
+    Shared execution environment for concurrent workflow submissions.
+
+    Pools and the HTTP session belong to the runtime; attach() points a
+    workflow at them, so limits such as ``openai: 3`` hold across all runs
+    instead of per run.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        resource_limits: Optional[Dict[str, int]] = None,
+        max_active_workflows: int = 10,
+        per_tenant_limit: Optional[int] = None,
+        thread_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        tracer: Optional[Tracer] = None,
+        share_session: bool = True
+    ):
+        """
+        Initialize runtime.
+
+        Args:
+            concurrency: Maximum nodes running at once across all workflows (None = unlimited)
+            resource_limits: Shared named pool limits, e.g. {"openai": 3, "serp": 2}
+            max_active_workflows: Maximum workflow runs executing at once
+            per_tenant_limit: Maximum running workflows per tenant (None = no cap)
+            thread_workers: Shared thread pool size for THREAD nodes (None = executor default)
+            process_workers: Shared process pool size for PROCESS nodes (None = CPU count)
+            tracer: Tracer for all runs (None = keep each workflow's own tracer)
+            share_session: Open one aiohttp session and pass it to nodes as context[SESSION_KEY]
+        """
+        self.concurrency_pool: Optional[ResourcePool] = (
+            ResourcePool("workflow", concurrency) if concurrency else None
+        )
+        self.resource_pools: Dict[str, ResourcePool] = {
+            name: ResourcePool(name, limit) for name, limit in (resource_limits or {}).items()
+        }
+        self.scheduler = TenantScheduler(max_active_workflows, per_tenant_limit)
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.tracer = tracer
+        self.share_session = share_session
+
+        self.thread_pool: Optional[Executor] = None
+        self.process_pool: Optional[Executor] = None
+        self.session: Optional[Any] = None  # aiohttp.ClientSession, created on the runtime loop
+        self.completed = 0
+        self.failed = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def open(self) -> None:
+        """Create shared resources on the running loop."""
+        self._loop = asyncio.get_running_loop()
+        if self.thread_pool is None:
+            self.thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_workers, thread_name_prefix="workflow-runtime"
+            )
+        if self.share_session and self.session is None:
+            import aiohttp
+
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=10)
+            )
+
+    async def aclose(self) -> None:
+        """Close the shared session and shut down executor pools."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        for pool in (self.thread_pool, self.process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False)
+        self.thread_pool = None
+        self.process_pool = None
+        if self.tracer:
+            self.tracer.shutdown()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def add_resource_pool(self, name: str, limit: int) -> ResourcePool:
+        """Register (or resize) a shared named pool."""
+        pool = ResourcePool(name, limit)
+        self.resource_pools[name] = pool
+        return pool
+
+    def attach(self, workflow: WorkflowArchitecture) -> WorkflowArchitecture:
+        """
+        Point a workflow at the runtime's shared pools, executors and tracer.
+
+        Pools the runtime does not define stay per-workflow.
+        """
+        if self.concurrency_pool is not None:
+            workflow.concurrency_pool = self.concurrency_pool
+        workflow.resource_pools.update(self.resource_pools)
+        if self.thread_pool is not None:
+            workflow.thread_pool = self.thread_pool
+        workflow.process_pool = self._process_pool_if_needed(workflow)
+        if self.tracer is not None:
+            workflow.tracer = self.tracer
+        return workflow
+
+    async def submit(
+        self,
+        workflow: WorkflowArchitecture,
+        initial_context: Optional[Dict[str, Any]] = None,
+        tenant: str = "default",
+        timeout: Optional[float] = None
+    ) -> WorkflowResult:
+        """
+        Run a clone of ``workflow`` once the tenant is admitted.
+
+        Args:
+            workflow: Workflow definition (used as a template, never mutated)
+            initial_context: Initial context for the run
+            tenant: Fairness key (customer, user, project, ...)
+            timeout: Workflow deadline in seconds, counted from admission
+
+        Returns:
+            WorkflowResult of the run
+        """
+        context = dict(initial_context or {})
+        return await self._run_admitted(
+            workflow, tenant,
+            lambda run, runtime_context: run.execute({**context, **runtime_context}, timeout=timeout)
+        )
+
+    async def resume(
+        self,
+        workflow: WorkflowArchitecture,
+        run_id: str,
+        tenant: str = "default",
+        timeout: Optional[float] = None
+    ) -> WorkflowResult:
+        """
+        Resume a checkpointed run on a clone of ``workflow``.
+
+        The shared session and the tenant are not checkpointed; they are
+        injected again exactly as submit() does.
+
+        Args:
+            workflow: Workflow definition with the run's checkpoint_store
+            run_id: Run id of the interrupted run
+            tenant: Fairness key (customer, user, project, ...)
+            timeout: Deadline in seconds for the resumed part, counted from admission
+
+        Returns:
+            WorkflowResult covering restored and newly executed nodes
+        """
+        return await self._run_admitted(
+            workflow, tenant,
+            lambda run, runtime_context: run.resume(run_id, timeout=timeout, context=runtime_context)
+        )
+
+    async def _run_admitted(
+        self,
+        workflow: WorkflowArchitecture,
+        tenant: str,
+        start: Callable[[WorkflowArchitecture, Dict[str, Any]], Awaitable[WorkflowResult]]
+    ) -> WorkflowResult:
+        if self._loop is None:
+            await self.open()
+
+        await self.scheduler.admit(tenant)
+        run: Optional[WorkflowArchitecture] = None
+        try:
+            run = self.attach(workflow.clone())
+            runtime_context: Dict[str, Any] = {TENANT_KEY: tenant}
+            if self.session is not None:
+                runtime_context[SESSION_KEY] = self.session
+            result = await start(run, runtime_context)
+        finally:
+            self.scheduler.release(tenant)
+            if run is not None:
+                # Shuts down only pools the clone created itself; the runtime's stay up
+                await asyncio.to_thread(run.close)
+
+        if result.success:
+            self.completed += 1
+        else:
+            self.failed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load: running/queued runs and shared pool usage."""
+        return {
+            "active_workflows": self.scheduler.active,
+            "active_by_tenant": dict(self.scheduler.active_by_tenant),
+            "queued_by_tenant": self.scheduler.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pools": {
+                pool.name: {"in_use": pool.in_use, "limit": pool.limit, "waiting": pool.waiting}
+                for pool in ([self.concurrency_pool] if self.concurrency_pool else [])
+                + list(self.resource_pools.values())
+            }
+        }
+
+    def _process_pool_if_needed(self, workflow: WorkflowArchitecture) -> Optional[Executor]:
+        if any(node.kind == ExecutorKind.PROCESS for node in workflow.nodes.values()):
+            if self.process_pool is None:
+                self.process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+            return self.process_pool
+        return workflow.process_pool
+
+    # ------------------------------------------------------------------
+    # Background loop (for synchronous callers)
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Run the runtime's event loop in a daemon thread."""
+        if self._thread is not None:
+            return
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run_loop():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run_loop, name="workflow-runtime", daemon=True)
+        self._thread.start()
+        ready.wait()
+        asyncio.run_coroutine_threadsafe(self.open(), loop).result()
+
+    def call(self, coro: Awaitable[Any]) -> Future:
+        """Schedule a coroutine on the background loop (see start())."""
+        if self._thread is None or self._loop is None:
+            raise RuntimeError("WorkflowRuntime.start() must be called before call()")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def submit_threadsafe(
+        self,
+        workflow: WorkflowArchitecture,
+        initial_context: Optional[Dict[str, Any]] = None,
+        tenant: str = "default",
+        timeout: Optional[float] = None
+    ) -> Future:
+        """submit() from any thread; returns a concurrent.futures.Future."""
+        return self.call(self.submit(workflow, initial_context, tenant, timeout))
+
+    def run(
+        self,
+        workflow: WorkflowArchitecture,
+        initial_context: Optional[Dict[str, Any]] = None,
+        tenant: str = "default",
+        timeout: Optional[float] = None
+    ) -> WorkflowResult:
+        """Blocking submit() for synchronous code."""
+        return self.submit_threadsafe(workflow, initial_context, tenant, timeout).result()
+
+    def stop(self) -> None:
+        """Close shared resources and stop the background loop."""
+        if self._thread is None or self._loop is None:
+            return
+        loop = self._loop
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+        self._thread = None
+        self._loop = None
+
+
+if __name__ == "__main__":
+    import random
+
+    from core.workflow_architecture import WorkflowStage
+
+    async def fetch(context):
+        await asyncio.sleep(random.uniform(0.05, 0.15))
+        return f"serp:{context['keyword']}"
+
+    async def write(context):
+        await asyncio.sleep(random.uniform(0.05, 0.15))
+        return f"article:{context['fetch']}"
+
+    template = WorkflowArchitecture("Article Job")
+    template.add_node("fetch", "Fetch SERP", WorkflowStage.REQUIREMENT, fetch, resources=["serp"])
+    template.add_node("write", "Write Article", WorkflowStage.IMPLEMENTATION, write,
+                      dependencies=["fetch"], resources=["openai"])
+
+    async def main():
+        runtime = WorkflowRuntime(
+            resource_limits={"serp": 2, "openai": 3},
+            max_active_workflows=4,
+            per_tenant_limit=2,
+            share_session=False
+        )
+        async with runtime:
+            jobs = [("acme", f"keyword {i}") for i in range(6)] + [("globex", "one-off")]
+            results = await asyncio.gather(*[
+                runtime.submit(template, {"keyword": keyword}, tenant=tenant)
+                for tenant, keyword in jobs
+            ])
+            for (tenant, keyword), result in zip(jobs, results):
+                print(f"{tenant:8} {keyword:12} success={result.success} "
+                      f"{result.total_duration_ms:.0f}ms")
+            print(runtime.stats())
+
+    asyncio.run(main())
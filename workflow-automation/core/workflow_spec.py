@@ -0,0 +1,448 @@
+"""
+Declarative Workflow Specs
+==========================
+
+Compiles a YAML or JSON workflow definition into a validated
+WorkflowArchitecture.
+
+Spec format (``workflow`` and ``performance`` use the same keys as
+config/workflow_config.yaml):
+
+  name: SEO Blog
+  workflow:
+    concurrency: 5
+    resource_limits: {openai: 3, serp: 2}
+    timeout: 300
+    failure_policy: skip_dependents
+  nodes:
+    - id: fetch_serp
+      name: Fetch SERP Results
+      stage: design                       # WorkflowStage value or name
+      executor: pipelines.seo:fetch_serp  # "module:function", or a key of ``executors``
+      dependencies: [fetch_keyword]
+      optional_dependencies: [fetch_trends]  # failure does not skip this node
+      resources: [serp]
+      timeout: 30
+      retry: {max_retries: 2, base_delay: 0.5, max_delay: 10, jitter: true}
+      hedge: {percentile: 95, budget: 0.1}  # duplicate attempts past p95
+      kind: async                         # async, thread, process, remote
+    - id: sections
+      stage: implementation
+      executor: write_section
+      map: {source: structure, items_key: headings, reduce: assemble}
+
+Compiling builds the graph, computes the plan and validates dependencies,
+cycles, pools and context keys once. The result is cached by a hash of the
+spec (plus the executor registry), and every call returns a cheap clone,
+so spinning up thousands of identical workflows skips all of that work.
+
+Usage:
+  async with load_workflow_spec("config/workflows/seo_blog.yaml", executors={...}) as workflow:
+      result = await workflow.execute({"keyword": "AI automation"})
+
+Each compiled workflow creates its own THREAD/PROCESS executors on first
+use; close it (or use it as a context manager) to shut them down.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.node_cache import fingerprint
+from core.task_queue import resolve_executor
+from core.workflow_architecture import (
+    ExecutorKind,
+    FailurePolicy,
+    HedgePolicy,
+    RetryPolicy,
+    WorkflowArchitecture,
+    WorkflowStage,
+)
+
+
+NODE_KEYS = {
+    "id", "name", "stage", "executor", "dependencies", "optional_dependencies", "parallel_group",
+    "resources", "timeout", "retry", "hedge", "kind", "inputs", "outputs", "version", "cacheable", "map",
+}
+RETRY_KEYS = {"max_retries", "base_delay", "max_delay", "jitter"}
+HEDGE_KEYS = {"percentile", "max_hedges", "budget", "min_samples", "delay"}
+MAP_KEYS = {"source", "items_key", "items", "reduce"}
+
+# Compiled templates: cache key -> WorkflowArchitecture (LRU)
+_compiled: "OrderedDict[Tuple[str, Tuple[Tuple[str, int], ...]], WorkflowArchitecture]" = OrderedDict()
+_compiled_lock = threading.Lock()
+MAX_COMPILED = 128
+
+
+class WorkflowSpecError(ValueError):
+    """A workflow spec is malformed; the message names the offending field."""
+
+
+def spec_hash(spec: Dict[str, Any]) -> str:
+    """
+    SHA-256 of a spec (key order does not matter).
+
+    Callables embedded in the spec (executors, ``items``, ``reduce``) are
+    hashed by qualified name and identity, like the executor registry, so
+    two closures of the same function do not share a compiled template.
+    Such hashes are only stable within one process.
+
+    Raises:
+        WorkflowSpecError: The spec holds a value that is neither plain
+            data nor callable
+    """
+    try:
+        return fingerprint(_normalize(spec))
+    except (TypeError, ValueError) as e:
+        raise WorkflowSpecError(f"Cannot hash workflow spec: {e}") from e
+
+
+def _normalize(value: Any) -> Any:
+    """Replace callables in a spec with a JSON-safe reference."""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if callable(value):
+        target = getattr(value, "__qualname__", None) or type(value).__qualname__
+        module = getattr(value, "__module__", None) or type(value).__module__
+        return f"<callable {module}:{target} at {id(value):#x}>"
+    return value
+
+
+def read_spec(path: str) -> Dict[str, Any]:
+    """
+    Read a spec file (.json, or .yaml/.yml which requires PyYAML).
+
+    Raises:
+        WorkflowSpecError: The file does not contain a mapping
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            spec = json.load(f)
+        else:
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("PyYAML is required to load YAML workflow specs: pip install pyyaml") from e
+            spec = yaml.safe_load(f)
+    if not isinstance(spec, dict):
+        raise WorkflowSpecError(f"{path}: a workflow spec must be a mapping")
+    return spec
+
+
+def load_workflow_spec(
+    path: str,
+    executors: Optional[Dict[str, Callable]] = None,
+    name: Optional[str] = None
+) -> WorkflowArchitecture:
+    """Read and compile a spec file (see compile_workflow)."""
+    return compile_workflow(read_spec(path), executors, name)
+
+
+def compile_workflow(
+    spec: Dict[str, Any],
+    executors: Optional[Dict[str, Callable]] = None,
+    name: Optional[str] = None
+) -> WorkflowArchitecture:
+    """
+    Compile a spec into a ready-to-run workflow.
+
+    Args:
+        spec: Parsed spec
+        executors: Callables referenced by name from ``executor``, ``items``
+            and ``reduce`` (other values are imported as "module:function")
+        name: Workflow name (defaults to the spec's ``name``)
+
+    Returns:
+        A fresh clone of the cached, validated template with its own
+        resource pools. Close it when done (``close()`` or ``with``/``async
+        with``) to shut down the executors its THREAD/PROCESS nodes created
+
+    Raises:
+        WorkflowSpecError: Malformed spec or unresolvable executor
+        ValueError: Unknown dependency, cycle or unknown resource pool
+    """
+    executors = executors or {}
+    key = (spec_hash(spec), tuple(sorted((ref, id(func)) for ref, func in executors.items())))
+    with _compiled_lock:
+        template = _compiled.get(key)
+        if template is not None:
+            _compiled.move_to_end(key)
+
+    if template is None:
+        template = _build(spec, executors)
+        with _compiled_lock:
+            _compiled[key] = template
+            while len(_compiled) > MAX_COMPILED:
+                _compiled.popitem(last=False)
+
+    return template.clone(name=name, share_pools=False)
+
+
+def clear_compiled_cache() -> None:
+    """Forget all compiled templates."""
+    with _compiled_lock:
+        _compiled.clear()
+
+
+def _build(spec: Dict[str, Any], executors: Dict[str, Callable]) -> WorkflowArchitecture:
+    """Construct and validate a template workflow from a spec."""
+    if not isinstance(spec, dict):
+        raise WorkflowSpecError("A workflow spec must be a mapping")
+    nodes = spec.get("nodes")
+    if not isinstance(nodes, list) or not nodes:
+        raise WorkflowSpecError("nodes: expected a non-empty list")
+
+    _check_settings(spec)
+    workflow = WorkflowArchitecture.from_config(spec.get("name", "workflow"), spec)
+    for index, node_spec in enumerate(nodes):
+        _add_node(workflow, node_spec, f"nodes[{index}]", executors)
+
+    # Validate once; clones reuse the cached plan
+    workflow._prepare_run([])
+    return workflow
+
+
+def _add_node(
+    workflow: WorkflowArchitecture,
+    node_spec: Any,
+    where: str,
+    executors: Dict[str, Callable]
+) -> None:
+    if not isinstance(node_spec, dict):
+        raise WorkflowSpecError(f"{where}: expected a mapping")
+    unknown = set(node_spec) - NODE_KEYS
+    if unknown:
+        raise WorkflowSpecError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+    for required in ("id", "stage", "executor"):
+        if required not in node_spec:
+            raise WorkflowSpecError(f"{where}: missing '{required}'")
+
+    node_id = str(node_spec["id"])
+    where = f"{where} ({node_id})"
+    if node_id in workflow.nodes:
+        raise WorkflowSpecError(f"{where}: duplicate node id")
+
+    kwargs: Dict[str, Any] = {
+        "dependencies": _str_list(node_spec, "dependencies", where),
+        "optional_dependencies": _str_list(node_spec, "optional_dependencies", where),
+        "parallel_group": _check_str(node_spec, "parallel_group", where),
+        "resources": _str_list(node_spec, "resources", where),
+        "timeout": _check_number(node_spec, "timeout", where, positive=True, nullable=True),
+        "retry_policy": _retry_policy(node_spec.get("retry"), where),
+        "hedge_policy": _hedge_policy(node_spec.get("hedge"), where),
+        "kind": _enum(ExecutorKind, node_spec.get("kind", "async"), f"{where}.kind"),
+        "inputs": _str_list(node_spec, "inputs", where) if node_spec.get("inputs") is not None else None,
+        "outputs": _str_list(node_spec, "outputs", where) if node_spec.get("outputs") is not None else None,
+    }
+    stage = _enum(WorkflowStage, node_spec["stage"], f"{where}.stage")
+    executor = _resolve(node_spec["executor"], executors, f"{where}.executor")
+    name = node_spec.get("name", node_id)
+
+    map_spec = node_spec.get("map")
+    if map_spec is None:
+        node = workflow.add_node(node_id, name, stage, executor, **kwargs)
+    else:
+        if not isinstance(map_spec, dict) or "source" not in map_spec:
+            raise WorkflowSpecError(f"{where}.map: expected a mapping with 'source'")
+        unknown = set(map_spec) - MAP_KEYS
+        if unknown:
+            raise WorkflowSpecError(f"{where}.map: unknown field(s) {', '.join(sorted(unknown))}")
+        if "items" in map_spec and "items_key" in map_spec:
+            raise WorkflowSpecError(f"{where}.map: use either 'items' or 'items_key'")
+        items = None
+        if "items_key" in map_spec:
+            items_key = map_spec["items_key"]
+            items = lambda value: value[items_key]  # noqa: E731
+        elif "items" in map_spec:
+            items = _resolve(map_spec["items"], executors, f"{where}.map.items")
+        reduce = _resolve(map_spec["reduce"], executors, f"{where}.map.reduce") if "reduce" in map_spec else None
+        node = workflow.add_map_node(
+            node_id, name, stage, str(map_spec["source"]), executor, items=items, reduce=reduce, **kwargs
+        )
+
+    if "version" in node_spec:
+        node.version = str(node_spec["version"])
+    if "cacheable" in node_spec:
+        node.cacheable = _check_flag(node_spec, "cacheable", where)
+
+
+def _check_settings(spec: Dict[str, Any]) -> None:
+    """Type- and range-check the ``workflow``/``performance`` settings from_config() reads."""
+    settings = spec.get("workflow", {})
+    if not isinstance(settings, dict):
+        raise WorkflowSpecError("workflow: expected a mapping")
+    _check_number(settings, "concurrency", "workflow", integer=True, positive=True, nullable=True)
+    _check_number(settings, "timeout", "workflow", positive=True, nullable=True)
+    _check_flag(settings, "retry_on_failure", "workflow")
+    _check_number(settings, "max_retries", "workflow", integer=True)
+    limits = settings.get("resource_limits") or {}
+    if not isinstance(limits, dict):
+        raise WorkflowSpecError("workflow.resource_limits: expected a mapping of pool name to limit")
+    for pool in limits:
+        _check_number(limits, pool, "workflow.resource_limits", integer=True, positive=True)
+    if "failure_policy" in settings:
+        _enum(FailurePolicy, settings["failure_policy"], "workflow.failure_policy")
+
+    performance = spec.get("performance", {})
+    if not isinstance(performance, dict):
+        raise WorkflowSpecError("performance: expected a mapping")
+    _check_flag(performance, "enable_caching", "performance")
+    _check_number(performance, "cache_ttl", "performance", positive=True, nullable=True)
+    _check_flag(performance, "release_intermediates", "performance")
+    _check_str(performance, "cache_dir", "performance")
+    _check_str(performance, "duration_history", "performance")
+
+
+def _check_number(
+    mapping: Dict[str, Any],
+    key: str,
+    where: str,
+    integer: bool = False,
+    positive: bool = False,
+    maximum: Optional[float] = None,
+    nullable: bool = False
+) -> Any:
+    """
+    Return ``mapping[key]`` after checking it is a number in range.
+
+    Numbers must be >= 0 (> 0 with ``positive``) and <= ``maximum``.
+    Missing keys (and None when ``nullable``) return None unchecked.
+    """
+    value = mapping.get(key)
+    if value is None and (nullable or key not in mapping):
+        return None
+    kind = "an integer" if integer else "a number"
+    if isinstance(value, bool) or not isinstance(value, int if integer else (int, float)):
+        raise WorkflowSpecError(f"{where}.{key}: expected {kind}, got {value!r}")
+    if value < 0 or (positive and value == 0) or (maximum is not None and value > maximum):
+        bounds = "> 0" if positive else ">= 0"
+        if maximum is not None:
+            bounds += f" and <= {maximum:g}"
+        raise WorkflowSpecError(f"{where}.{key}: expected {kind} {bounds}, got {value!r}")
+    return value
+
+
+def _check_flag(mapping: Dict[str, Any], key: str, where: str) -> Optional[bool]:
+    value = mapping.get(key)
+    if key in mapping and not isinstance(value, bool):
+        raise WorkflowSpecError(f"{where}.{key}: expected true or false, got {value!r}")
+    return value
+
+
+def _check_str(mapping: Dict[str, Any], key: str, where: str) -> Optional[str]:
+    value = mapping.get(key)
+    if value is not None and not isinstance(value, str):
+        raise WorkflowSpecError(f"{where}.{key}: expected a string, got {value!r}")
+    return value
+
+
+def _str_list(node_spec: Dict[str, Any], key: str, where: str) -> List[str]:
+    value = node_spec.get(key) or []
+    if isinstance(value, str) or not isinstance(value, list):
+        raise WorkflowSpecError(f"{where}.{key}: expected a list")
+    return [str(item) for item in value]
+
+
+def _enum(enum_type, value: Any, where: str):
+    for member in enum_type:
+        if value == member.value or str(value).upper() == member.name:
+            return member
+    choices = ", ".join(member.value for member in enum_type)
+    raise WorkflowSpecError(f"{where}: unknown value '{value}' (choose from {choices})")
+
+
+def _retry_policy(value: Any, where: str) -> Optional[RetryPolicy]:
+    if value is None:
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return RetryPolicy(max_retries=_check_number({"retry": value}, "retry", where, integer=True))
+    if not isinstance(value, dict):
+        raise WorkflowSpecError(f"{where}.retry: expected a mapping or a retry count")
+    unknown = set(value) - RETRY_KEYS
+    if unknown:
+        raise WorkflowSpecError(f"{where}.retry: unknown field(s) {', '.join(sorted(unknown))}")
+    _check_number(value, "max_retries", f"{where}.retry", integer=True)
+    _check_number(value, "base_delay", f"{where}.retry")
+    _check_number(value, "max_delay", f"{where}.retry")
+    _check_flag(value, "jitter", f"{where}.retry")
+    return RetryPolicy(**value)
+
+
+def _hedge_policy(value: Any, where: str) -> Optional[HedgePolicy]:
+    if value is None or value is False:
+        return None
+    if value is True:
+        return HedgePolicy()
+    if not isinstance(value, dict):
+        raise WorkflowSpecError(f"{where}.hedge: expected a mapping or true")
+    unknown = set(value) - HEDGE_KEYS
+    if unknown:
+        raise WorkflowSpecError(f"{where}.hedge: unknown field(s) {', '.join(sorted(unknown))}")
+    _check_number(value, "percentile", f"{where}.hedge", positive=True, maximum=100)
+    _check_number(value, "max_hedges", f"{where}.hedge", integer=True)
+    _check_number(value, "budget", f"{where}.hedge", nullable=True)
+    _check_number(value, "min_samples", f"{where}.hedge", integer=True)
+    _check_number(value, "delay", f"{where}.hedge", nullable=True)
+    return HedgePolicy(**value)
+
+
+def _resolve(ref: Any, executors: Dict[str, Callable], where: str) -> Callable:
+    if callable(ref):
+        return ref
+    if ref in executors:
+        return executors[ref]
+    if isinstance(ref, str) and ":" in ref:
+        try:
+            return resolve_executor(ref)
+        except (ImportError, AttributeError) as e:
+            raise WorkflowSpecError(f"{where}: cannot import '{ref}' ({e})") from e
+    raise WorkflowSpecError(f"{where}: '{ref}' is not a registered executor or a 'module:function' reference")
+
+
+if __name__ == "__main__":
+    import asyncio
+    import time
+
+    async def fetch(ctx):
+        await asyncio.sleep(0.01)
+        return {"headings": ["Intro", "Benefits", "Conclusion"]}
+
+    async def write(ctx, heading):
+        await asyncio.sleep(0.01)
+        return f"## {heading}"
+
+    demo_spec = {
+        "name": "Spec Demo",
+        "workflow": {"resource_limits": {"openai": 2}, "failure_policy": "skip_dependents"},
+        "nodes": [
+            {"id": "outline", "stage": "design", "executor": "fetch"},
+            {"id": "sections", "stage": "implementation", "executor": "write", "resources": ["openai"],
+             "retry": {"max_retries": 1, "base_delay": 0.1},
+             "map": {"source": "outline", "items_key": "headings", "reduce": "join"}},
+        ],
+    }
+    registry = {"fetch": fetch, "write": write, "join": "\n\n".join}
+
+    start = time.perf_counter()
+    first = compile_workflow(demo_spec, registry)
+    cold = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for _ in range(1000):
+        compile_workflow(demo_spec, registry)
+    warm = (time.perf_counter() - start) / 1000 * 1000
+
+    print(f"spec {spec_hash(demo_spec)[:12]}: cold compile {cold:.2f}ms, cached {warm:.3f}ms per workflow")
+    print(first.visualize_dag())
+
+    async def run_first():
+        async with first:
+            return await first.execute({})
+
+    print(asyncio.run(run_first()).results["sections"])
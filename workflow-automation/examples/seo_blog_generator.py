@@ -25,9 +25,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agents.serp_agent import SerpAgent, print_serp_results
 from agents.scraper_agent import ScraperAgent
-from agents.content_generator import ContentGeneratorAgent
-from core.workflow_architecture import WorkflowArchitecture, WorkflowStage, WorkflowNode
+from agents.content_generator import ContentGeneratorAgent, GeneratedContent
 from core.entity_mapping import create_seo_blog_entity_map
+from core.entity_workflow import compile_entity_map
 
 
 # Page configuration
@@ -121,9 +121,6 @@ if st.checkbox("Show Entity Relation Map"):
 
 # Generate button
 if st.button("🚀 Generate Content", type="primary", disabled=not (keyword and openai_api_key and serpapi_key)):
-    # Create workflow
-    workflow = WorkflowArchitecture("SEO Blog Generator")
-
     # Status containers
     status_container = st.container()
     progress_bar = st.progress(0)
@@ -147,198 +144,224 @@ if st.button("🚀 Generate Content", type="primary", disabled=not (keyword and
 
     # Main async function
     async def generate_content():
-        """Main content generation workflow"""
+        """Main content generation workflow, compiled from the entity relation map"""
         try:
             # Update status
             status_container.info("🔄 Initializing agents...")
             progress_bar.progress(0.05)
 
-            # Context for sharing data between nodes
-            context = {"keyword": keyword}
-
-            # ========================================
-            # STAGE 1: SERP Research
-            # ========================================
-            status_container.info(f"🔍 Fetching top {num_competitors} Google results for '{keyword}'...")
-            progress_bar.progress(0.1)
-
-            async with SerpAgent(serpapi_key, results_limit=num_competitors) as serp_agent:
-                serp_response = await serp_agent.search(keyword)
-                context['serp_results'] = serp_response
-
-                # Display SERP results
-                serp_output = f"**Keyword:** {serp_response.keyword}\n\n"
-                serp_output += f"**Total Results:** {serp_response.total_results:,}\n\n"
-                for result in serp_response.results:
-                    serp_output += f"{result.position}. **{result.title}**\n"
-                    serp_output += f"   - URL: {result.url}\n"
-                    serp_output += f"   - Domain: {result.domain}\n\n"
-
-                serp_container.markdown(serp_output)
-
-            progress_bar.progress(0.2)
-
-            # ========================================
-            # STAGE 2: Web Scraping
-            # ========================================
-            status_container.info(f"📄 Scraping content from {len(serp_response.results)} URLs (parallel)...")
-            progress_bar.progress(0.25)
-
-            urls = [result.url for result in serp_response.results]
-
-            async with ScraperAgent(timeout=15) as scraper_agent:
-                scraped_contents = await scraper_agent.scrape_multiple(urls)
-                context['scraped_contents'] = scraped_contents
-
-                # Display scraper results
-                scraper_output = f"**Successfully scraped:** {sum(1 for c in scraped_contents if c.success)}/{len(scraped_contents)}\n\n"
-                for i, content in enumerate(scraped_contents, 1):
-                    if content.success:
-                        scraper_output += f"{i}. **{content.title}** ({content.word_count} words)\n"
-                    else:
-                        scraper_output += f"{i}. ❌ Failed: {content.error}\n"
-
-                scraper_container.markdown(scraper_output)
-
-            progress_bar.progress(0.4)
-
-            # ========================================
-            # STAGE 3: Content Generation with GPT-4
-            # ========================================
-            status_container.info("🤖 Initializing GPT-4 content generator...")
-
-            # Extract text from successful scrapes
-            competitor_texts = [
-                content.body_text
-                for content in scraped_contents
-                if content.success and content.body_text
-            ]
-
-            async with ContentGeneratorAgent(openai_api_key, model=model, temperature=temperature) as generator:
+            async with SerpAgent(serpapi_key, results_limit=num_competitors) as serp_agent, \
+                    ScraperAgent(timeout=15) as scraper_agent, \
+                    ContentGeneratorAgent(openai_api_key, model=model, temperature=temperature) as generator:
+
+                # ========================================
+                # STAGE 1: SERP Research
+                # ========================================
+                async def serp_query(ctx):
+                    status_container.info(f"🔍 Fetching top {num_competitors} Google results for '{ctx['Keyword']}'...")
+                    progress_bar.progress(0.1)
+                    serp_response = await serp_agent.search(ctx["Keyword"])
+
+                    # Display SERP results
+                    serp_output = f"**Keyword:** {serp_response.keyword}\n\n"
+                    serp_output += f"**Total Results:** {serp_response.total_results:,}\n\n"
+                    for result in serp_response.results:
+                        serp_output += f"{result.position}. **{result.title}**\n"
+                        serp_output += f"   - URL: {result.url}\n"
+                        serp_output += f"   - Domain: {result.domain}\n\n"
+
+                    serp_container.markdown(serp_output)
+                    progress_bar.progress(0.2)
+                    return serp_response
+
+                # ========================================
+                # STAGE 2: Web Scraping
+                # ========================================
+                async def web_scraper(ctx):
+                    serp_response = ctx["SerpQuery"]
+                    status_container.info(f"📄 Scraping content from {len(serp_response.results)} URLs (parallel)...")
+                    progress_bar.progress(0.25)
+
+                    urls = [result.url for result in serp_response.results]
+                    scraped_contents = await scraper_agent.scrape_multiple(urls)
+
+                    # Display scraper results
+                    scraper_output = f"**Successfully scraped:** {sum(1 for c in scraped_contents if c.success)}/{len(scraped_contents)}\n\n"
+                    for i, content in enumerate(scraped_contents, 1):
+                        if content.success:
+                            scraper_output += f"{i}. **{content.title}** ({content.word_count} words)\n"
+                        else:
+                            scraper_output += f"{i}. ❌ Failed: {content.error}\n"
+
+                    scraper_container.markdown(scraper_output)
+                    progress_bar.progress(0.4)
+                    return scraped_contents
+
+                # ========================================
+                # STAGE 3: Content Generation with GPT-4
+                # ========================================
 
                 # --- Step 3.1: Analyze Intent ---
-                status_container.info("🎯 Analyzing user intent with GPT-4...")
-                progress_bar.progress(0.45)
-
-                intent_placeholder = intent_container.empty()
-                intent_text = ""
-
-                def on_intent_chunk(chunk):
-                    nonlocal intent_text
-                    if not chunk.is_final:
-                        intent_text += chunk.content
-                        intent_placeholder.markdown(f"**Analysis (streaming):**\n\n{intent_text}")
-
-                user_intent = await generator.analyze_intent(
-                    keyword=keyword,
-                    competitor_contents=competitor_texts,
-                    on_chunk=on_intent_chunk
-                )
-                context['user_intent'] = user_intent
-
-                # Display final intent
-                intent_output = f"**Primary Intent:** {user_intent.primary_intent}\n\n"
-                intent_output += f"**Key Keywords:** {', '.join(user_intent.keywords)}\n\n"
-                intent_output += f"**User Questions:**\n"
-                for q in user_intent.questions:
-                    intent_output += f"- {q}\n"
-                intent_output += f"\n**Main Topics:**\n"
-                for t in user_intent.topics:
-                    intent_output += f"- {t}\n"
-
-                intent_container.markdown(intent_output)
-                progress_bar.progress(0.5)
+                async def intent_analyzer(ctx):
+                    status_container.info("🎯 Analyzing user intent with GPT-4...")
+                    progress_bar.progress(0.45)
+
+                    # Extract text from successful scrapes
+                    competitor_texts = [
+                        content.body_text
+                        for content in ctx["WebScraper"]
+                        if content.success and content.body_text
+                    ]
+
+                    intent_placeholder = intent_container.empty()
+                    intent_text = ""
+
+                    def on_intent_chunk(chunk):
+                        nonlocal intent_text
+                        if not chunk.is_final:
+                            intent_text += chunk.content
+                            intent_placeholder.markdown(f"**Analysis (streaming):**\n\n{intent_text}")
+
+                    user_intent = await generator.analyze_intent(
+                        keyword=ctx["Keyword"],
+                        competitor_contents=competitor_texts,
+                        on_chunk=on_intent_chunk
+                    )
+
+                    # Display final intent
+                    intent_output = f"**Primary Intent:** {user_intent.primary_intent}\n\n"
+                    intent_output += f"**Key Keywords:** {', '.join(user_intent.keywords)}\n\n"
+                    intent_output += f"**User Questions:**\n"
+                    for q in user_intent.questions:
+                        intent_output += f"- {q}\n"
+                    intent_output += f"\n**Main Topics:**\n"
+                    for t in user_intent.topics:
+                        intent_output += f"- {t}\n"
+
+                    intent_container.markdown(intent_output)
+                    progress_bar.progress(0.5)
+                    return user_intent
 
                 # --- Step 3.2: Generate Title ---
-                status_container.info("📝 Generating article title...")
-                progress_bar.progress(0.55)
-
-                title_text = ""
-                title_placeholder = title_container.empty()
-
-                def on_title_chunk(chunk):
-                    nonlocal title_text
-                    if not chunk.is_final:
-                        title_text += chunk.content
-                        title_placeholder.markdown(f"# {title_text}")
-
-                article_title = await generator.generate_title(
-                    keyword=keyword,
-                    user_intent=user_intent,
-                    on_chunk=on_title_chunk
-                )
-                context['article_title'] = article_title
-
-                title_container.markdown(f"# {article_title}")
-                progress_bar.progress(0.6)
-
-                # --- Step 3.3: Generate Structure ---
-                status_container.info("🏗️ Generating article structure...")
-                progress_bar.progress(0.65)
-
-                structure_text = ""
-                structure_placeholder = structure_container.empty()
-
-                def on_structure_chunk(chunk):
-                    nonlocal structure_text
-                    if not chunk.is_final:
-                        structure_text += chunk.content
-                        structure_placeholder.markdown(f"**Outline (streaming):**\n\n{structure_text}")
-
-                article_structure = await generator.generate_structure(
-                    title=article_title,
-                    keyword=keyword,
-                    user_intent=user_intent,
-                    target_word_count=target_word_count,
-                    on_chunk=on_structure_chunk
-                )
-                context['article_structure'] = article_structure
-
-                # Display structure
-                structure_output = "**Article Outline:**\n\n"
-                for heading in article_structure.headings:
-                    indent = "  " * (int(heading['level'][1]) - 2)
-                    structure_output += f"{indent}- {heading['text']}\n"
-
-                structure_container.markdown(structure_output)
-                progress_bar.progress(0.7)
-
-                # --- Step 3.4: Generate ALL Section Content in PARALLEL ---
-                status_container.info(f"🚀 Generating content for {len(article_structure.headings)} sections IN PARALLEL...")
-                progress_bar.progress(0.75)
+                async def title_generator(ctx):
+                    status_container.info("📝 Generating article title...")
+                    progress_bar.progress(0.55)
 
-                # Create containers for each section
-                st.markdown("---")
-                for i, heading in enumerate(article_structure.headings):
-                    level = heading['level']
-                    text = heading['text']
+                    title_text = ""
+                    title_placeholder = title_container.empty()
 
-                    handle_heading(level, text)
+                    def on_title_chunk(chunk):
+                        nonlocal title_text
+                        if not chunk.is_final:
+                            title_text += chunk.content
+                            title_placeholder.markdown(f"# {title_text}")
 
-                    # Create content container
-                    section_containers[i] = st.empty()
+                    article_title = await generator.generate_title(
+                        keyword=ctx["Keyword"],
+                        user_intent=ctx["IntentAnalyzer"],
+                        on_chunk=on_title_chunk
+                    )
 
-                # Callback for streaming updates
-                section_texts = {i: "" for i in range(len(article_structure.headings))}
+                    title_container.markdown(f"# {article_title}")
+                    progress_bar.progress(0.6)
+                    return article_title
 
-                def on_section_chunk(section_idx, chunk):
-                    if not chunk.is_final:
-                        section_texts[section_idx] += chunk.content
-                        section_containers[section_idx].markdown(section_texts[section_idx])
-
-                # Generate all sections in parallel!
-                generated_sections = await generator.generate_all_sections_parallel(
-                    structure=article_structure,
-                    keyword=keyword,
-                    on_chunk=on_section_chunk
+                # --- Step 3.3: Generate Structure ---
+                async def structure_generator(ctx):
+                    status_container.info("🏗️ Generating article structure...")
+                    progress_bar.progress(0.65)
+
+                    structure_text = ""
+                    structure_placeholder = structure_container.empty()
+
+                    def on_structure_chunk(chunk):
+                        nonlocal structure_text
+                        if not chunk.is_final:
+                            structure_text += chunk.content
+                            structure_placeholder.markdown(f"**Outline (streaming):**\n\n{structure_text}")
+
+                    article_structure = await generator.generate_structure(
+                        title=ctx["TitleGenerator"],
+                        keyword=ctx["Keyword"],
+                        user_intent=ctx["IntentAnalyzer"],
+                        target_word_count=target_word_count,
+                        on_chunk=on_structure_chunk
+                    )
+
+                    # Display structure
+                    structure_output = "**Article Outline:**\n\n"
+                    for heading in article_structure.headings:
+                        indent = "  " * (int(heading['level'][1]) - 2)
+                        structure_output += f"{indent}- {heading['text']}\n"
+
+                    structure_container.markdown(structure_output)
+                    progress_bar.progress(0.7)
+
+                    # Create containers for each section before the fan-out starts
+                    status_container.info(f"🚀 Generating content for {len(article_structure.headings)} sections IN PARALLEL...")
+                    progress_bar.progress(0.75)
+                    st.markdown("---")
+                    for heading in article_structure.headings:
+                        handle_heading(heading['level'], heading['text'])
+                        # Keyed by the heading object the map child receives, so
+                        # duplicate heading texts still get their own container
+                        section_containers[id(heading)] = st.empty()
+                    return article_structure
+
+                # --- Step 3.4: Generate ALL Section Content in PARALLEL (one map child per heading) ---
+                async def content_generator(ctx, heading):
+                    structure = ctx["StructureGenerator"]
+                    container = section_containers[id(heading)]
+                    section_text = ""
+
+                    def on_section_chunk(chunk):
+                        nonlocal section_text
+                        if not chunk.is_final:
+                            section_text += chunk.content
+                            container.markdown(section_text)
+
+                    try:
+                        section = await generator.generate_section_content(
+                            heading=heading,
+                            title=structure.title,
+                            keyword=ctx["Keyword"],
+                            context="",
+                            word_count=structure.estimated_word_count // len(structure.headings),
+                            on_chunk=on_section_chunk
+                        )
+                    except Exception as e:
+                        section = GeneratedContent(
+                            heading=heading['text'],
+                            content=f"[Content generation failed: {e}]",
+                            word_count=0,
+                            keywords_used=[]
+                        )
+                    container.markdown(section.content)
+                    return section
+
+                # The entity map drives execution: each N2 entity binds to its executor
+                workflow = compile_entity_map(
+                    create_seo_blog_entity_map(),
+                    executors={
+                        "SerpQuery": serp_query,
+                        "WebScraper": web_scraper,
+                        "IntentAnalyzer": intent_analyzer,
+                        "TitleGenerator": title_generator,
+                        "StructureGenerator": structure_generator,
+                        "ContentGenerator": content_generator,
+                    },
+                    name="SEO Blog Generator",
+                    agent_resources={"gpt4": "openai"},
+                    resource_limits={"openai": 5}
                 )
-                context['generated_sections'] = generated_sections
-
-                progress_bar.progress(0.95)
-
-                # Display final content
-                for i, section in enumerate(generated_sections):
-                    section_containers[i].markdown(section.content)
+                result = await workflow.execute({"Keyword": keyword})
+                if not result.success:
+                    raise RuntimeError("; ".join(result.errors))
+
+            article_title = result.results["TitleGenerator"]
+            article_structure = result.results["StructureGenerator"]
+            generated_sections = result.results["ContentGenerator"]
+            progress_bar.progress(0.95)
 
             # ========================================
             # COMPLETION
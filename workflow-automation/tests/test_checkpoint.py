@@ -0,0 +1,99 @@
+"""
+Tests for checkpointing and resuming interrupted workflow runs.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.checkpoint import FileCheckpointStore, SQLiteCheckpointStore
+from core.workflow_architecture import WorkflowArchitecture, WorkflowStage
+from core.workflow_runtime import TENANT_KEY
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileCheckpointStore(str(tmp_path / "checkpoints"))
+    return SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+def build(store, calls, hang_in_draft=False):
+    workflow = WorkflowArchitecture("article", checkpoint_store=store)
+
+    async def research(ctx):
+        calls.append("research")
+        return f"notes on {ctx['topic']}"
+
+    async def draft(ctx):
+        calls.append("draft")
+        if hang_in_draft:
+            await asyncio.Event().wait()
+        return f"draft from {ctx['research']}"
+
+    async def publish(ctx):
+        calls.append("publish")
+        return {"draft": ctx["draft"], "tenant": ctx[TENANT_KEY]}
+
+    workflow.add_node("research", "Research", WorkflowStage.REQUIREMENT, research)
+    workflow.add_node("draft", "Draft", WorkflowStage.IMPLEMENTATION, draft, dependencies=["research"])
+    workflow.add_node("publish", "Publish", WorkflowStage.DEPLOYMENT, publish, dependencies=["draft"])
+    return workflow
+
+
+async def crash_during_draft(store, calls):
+    workflow = build(store, calls, hang_in_draft=True)
+    run = asyncio.create_task(
+        workflow.execute({"topic": "AI", TENANT_KEY: "acme"}, run_id="run-1")
+    )
+    while "draft" not in calls:
+        await asyncio.sleep(0.01)
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+
+def test_resume_after_crash_skips_completed_nodes(store):
+    calls = []
+
+    async def main():
+        await crash_during_draft(store, calls)
+        # A fresh instance (new process) only shares the store
+        return await build(store, calls).resume("run-1", context={TENANT_KEY: "acme"})
+
+    result = asyncio.run(main())
+
+    assert result.success
+    assert calls == ["research", "draft", "draft", "publish"]
+    assert result.results["publish"] == {"draft": "draft from notes on AI", "tenant": "acme"}
+
+
+def test_reserved_keys_are_not_persisted(store):
+    asyncio.run(crash_during_draft(store, []))
+
+    checkpoint = store.load_run("run-1")
+    assert checkpoint.initial_context == {"topic": "AI"}
+    assert set(checkpoint.nodes) == {"research"}
+
+
+def test_checkpoint_writes_run_off_the_event_loop(store):
+    writers = []
+    save_node = store.save_node
+
+    def recording_save_node(run_id, checkpoint):
+        writers.append(threading.current_thread())
+        save_node(run_id, checkpoint)
+
+    store.save_node = recording_save_node
+    result = asyncio.run(build(store, []).execute({"topic": "AI", TENANT_KEY: "acme"}))
+
+    assert result.success
+    assert len(writers) == 3
+    assert threading.main_thread() not in writers
+    # Every write is flushed before execute() returns
+    assert set(store.load_run(result.run_id).nodes) == {"research", "draft", "publish"}
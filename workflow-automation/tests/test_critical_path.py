@@ -0,0 +1,74 @@
+"""
+Tests for critical-path priorities and the duration history behind them.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.duration_history import DurationHistory
+from core.workflow_architecture import WorkflowArchitecture, WorkflowStage
+
+
+def recorder(started, label):
+    async def executor(ctx):
+        started.append(label)
+        await asyncio.sleep(0.001)
+        return label
+    return executor
+
+
+def test_longest_path_is_dispatched_first():
+    started = []
+    workflow = WorkflowArchitecture("priority", concurrency=1)
+    for node_id in ["alpha", "beta", "gamma"]:
+        workflow.add_node(node_id, node_id, WorkflowStage.DESIGN, recorder(started, node_id))
+    workflow.add_node("outline", "Outline", WorkflowStage.DESIGN, recorder(started, "outline"))
+    workflow.add_node("draft", "Draft", WorkflowStage.DESIGN, recorder(started, "draft"), dependencies=["outline"])
+    workflow.add_node("edit", "Edit", WorkflowStage.DESIGN, recorder(started, "edit"), dependencies=["draft"])
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert result.success
+    assert started[0] == "outline"
+    assert workflow.critical_path() == (["outline", "draft", "edit"], 3.0)
+
+
+def test_recorded_durations_outrank_hop_counts():
+    started = []
+    history = DurationHistory()
+    for node_id, duration_ms in [("fetch", 2.0), ("parse", 2.0), ("render", 900.0)]:
+        history.record(node_id, duration_ms)
+    workflow = WorkflowArchitecture("priority", concurrency=1, duration_history=history)
+    workflow.add_node("fetch", "Fetch", WorkflowStage.DESIGN, recorder(started, "fetch"))
+    workflow.add_node("parse", "Parse", WorkflowStage.DESIGN, recorder(started, "parse"), dependencies=["fetch"])
+    workflow.add_node("render", "Render", WorkflowStage.DESIGN, recorder(started, "render"))
+
+    assert workflow.node_priorities() == {"fetch": 4.0, "parse": 2.0, "render": 900.0}
+    asyncio.run(workflow.execute({}))
+
+    assert started[0] == "render"
+
+
+def test_duration_history_persists_across_instances(tmp_path):
+    path = str(tmp_path / "history" / "durations.json")
+    history = DurationHistory(path, max_samples=3)
+    workflow = WorkflowArchitecture("history", duration_history=history)
+    workflow.add_node("fetch", "Fetch", WorkflowStage.DESIGN, recorder([], "fetch"))
+    workflow.add_node("parse", "Parse", WorkflowStage.DESIGN, recorder([], "parse"), dependencies=["fetch"])
+
+    for _ in range(4):
+        asyncio.run(workflow.execute({}))
+
+    with open(path, encoding="utf-8") as f:
+        assert set(json.load(f)["nodes"]) == {"fetch", "parse"}
+    reloaded = DurationHistory(path, max_samples=2)
+    assert len(reloaded.samples("fetch")) == 2
+    assert reloaded.samples("fetch") == history.samples("fetch")[-2:]
+    assert reloaded.estimate("parse") > 0
+    assert reloaded.estimate("unknown", default=5.0) == 5.0
+    assert reloaded.percentile("fetch", 100) == max(reloaded.samples("fetch"))
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".tmp")]
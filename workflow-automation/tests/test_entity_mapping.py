@@ -0,0 +1,148 @@
+"""
+Tests for EntityRelationMap storage and queries.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import entity_mapping
+from core.entity_mapping import (
+    Entity, EntityLevel, EntityRelationMap, Relation, RelationType, create_seo_blog_entity_map
+)
+from core.entity_workflow import compile_entity_map
+
+
+async def _noop(ctx):
+    return None
+
+
+def test_entities_and_relations_compare_by_value():
+    assert Entity("A", EntityLevel.N1) == Entity("A", EntityLevel.N1)
+    assert Entity("A", EntityLevel.N1) != Entity("A", EntityLevel.N1, {"type": "user_input"})
+    assert len({Entity("A", EntityLevel.N1), Entity("A", EntityLevel.N1)}) == 1
+
+    first, second = create_seo_blog_entity_map(), create_seo_blog_entity_map()
+    assert list(first.entities.values()) == list(second.entities.values())
+    assert list(first.relations) == list(second.relations)
+
+    keyword = Entity("Keyword", EntityLevel.N1, {"type": "user_input"})
+    serp_query = Entity("SerpQuery", EntityLevel.N2, {"agent": "serp"})
+    assert first.relations[0] == Relation(keyword, serp_query, RelationType.HIGH)
+    assert first.get_dependencies(Entity("Keyword", EntityLevel.N1)) == [serp_query]
+    assert first.entities["N2:SerpQuery"].metadata == {"agent": "serp"}
+
+
+def test_backward_relations_order_every_query_the_same_way():
+    erm = EntityRelationMap.from_notation(
+        "N1:Keyword $H→ N2:Draft $H→ N3:Article\n"
+        "N2:Draft $L← N2:StyleGuide"
+    )
+
+    order = [str(entity) for entity in erm.get_execution_order()]
+    assert order.index("N2:StyleGuide") < order.index("N2:Draft")
+    assert erm.reaches("N2:StyleGuide", "N3:Article")
+    assert not erm.reaches("N2:Draft", "N2:StyleGuide")
+    assert [str(entity) for entity in erm.get_recompute_set(["N2:StyleGuide"])] == ["N2:Draft", "N3:Article"]
+    assert [str(entity) for entity in erm.get_ancestors("N2:Draft")] == ["N1:Keyword", "N2:StyleGuide"]
+
+    workflow = compile_entity_map(erm, {"Draft": _noop, "StyleGuide": _noop})
+    assert workflow.nodes["Draft"].optional_dependencies == ["StyleGuide"]
+    assert workflow.execution_order.index(["StyleGuide"]) < workflow.execution_order.index(["Draft"])
+
+
+def test_reachability_on_cycles_includes_only_entities_on_the_cycle():
+    erm = EntityRelationMap.from_notation("N2:A $H→ N2:B $H→ N2:A\nN2:B $H→ N3:C")
+
+    assert [str(entity) for entity in erm.get_descendants("N2:A")] == ["N2:A", "N2:B", "N3:C"]
+    assert erm.get_descendants("N3:C") == []
+    assert erm.get_execution_order() == []
+
+
+def test_entities_and_relations_accept_writes_like_a_dict_and_list():
+    erm = EntityRelationMap()
+    source = erm.add_entity("Source", EntityLevel.N1)
+    erm.entities["N2:Step"] = Entity("Step", EntityLevel.N2, {"agent": "gpt4"})
+    step = erm.entities["N2:Step"]
+    erm.relations.append(Relation(source, step, RelationType.HIGH))
+    erm.relations.extend([Relation(step, Entity("Step", EntityLevel.N2), RelationType.LOW, "←")])
+
+    assert step.metadata == {"agent": "gpt4"}
+    assert [str(relation) for relation in erm.relations] == [
+        "N1:Source $H→ N2:Step", "N2:Step $L← N2:Step"
+    ]
+    assert erm.get_dependencies(source) == [step]
+
+    with pytest.raises(KeyError):
+        erm.entities["N2:Other"] = Entity("Step", EntityLevel.N2)
+    with pytest.raises(KeyError):
+        erm.relations.append(Relation(source, Entity("Missing", EntityLevel.N3), RelationType.HIGH))
+    with pytest.raises(TypeError):
+        del erm.entities["N2:Step"]
+
+
+def test_add_entity_replaces_an_existing_entity_and_keeps_its_relations():
+    erm = EntityRelationMap()
+    first = erm.add_entity("Writer", EntityLevel.N2, {"agent": "gpt3"})
+    output = erm.add_entity("Draft", EntityLevel.N3)
+    erm.add_relation(first, output, RelationType.HIGH)
+
+    second = erm.add_entity("Writer", EntityLevel.N2, {"agent": "gpt4"})
+
+    assert second is not first
+    assert erm.entities["N2:Writer"] is second
+    assert erm.relations[0].source is second
+    assert erm.get_dependencies(second) == [output]
+    assert len(erm.entities) == 2
+
+
+@pytest.mark.parametrize("bits_limit", [entity_mapping._REACH_BITS_LIMIT, 0])
+def test_reachability_is_cached_and_refreshed_after_mutation(monkeypatch, bits_limit):
+    # 0 forces the per-source walk used for maps too large for bitsets
+    monkeypatch.setattr(entity_mapping, "_REACH_BITS_LIMIT", bits_limit)
+    erm = create_seo_blog_entity_map()
+
+    stale = erm.get_recompute_set(["N3:ArticleTitle"], levels=[EntityLevel.N2])
+    assert [entity.name for entity in stale] == ["StructureGenerator", "ContentGenerator"]
+    assert erm.reaches("N1:Keyword", "N3:ArticleContent")
+    assert not erm.reaches("N3:ArticleContent", "N1:Keyword")
+    assert (erm._reach_bits.get((True, None)) is None) == (bits_limit == 0)
+
+    review = erm.add_entity("Reviewer", EntityLevel.N2)
+    erm.add_relation(erm.entities["N3:ArticleContent"], review, RelationType.HIGH)
+    assert erm.reaches("N3:ArticleTitle", "N2:Reviewer")
+    assert "Reviewer" in [entity.name for entity in erm.get_descendants("N1:Keyword")]
+
+
+def test_dependency_lookups_match_a_scan_while_the_map_grows():
+    rng = random.Random(7)
+    erm = EntityRelationMap()
+    entities = []
+
+    def expected(entity, outgoing, relation_type=None):
+        return [
+            relation.target if outgoing else relation.source
+            for relation in relations
+            if (relation.source if outgoing else relation.target) == entity
+            and relation_type in (None, relation.relation_type)
+        ]
+
+    # Small batches stay in the unindexed tail, large ones trigger a full re-index
+    for batch in [3, 1, 40, 2, 5000, 7]:
+        for _ in range(max(1, batch // 10)):
+            entities.append(erm.add_entity(f"E{len(entities)}", rng.choice(list(EntityLevel))))
+        for _ in range(batch):
+            relation_type = rng.choice(list(RelationType))
+            erm.add_relation(rng.choice(entities), rng.choice(entities), relation_type, rng.choice("→←"))
+        relations = list(erm.relations)
+        for entity in rng.sample(entities, min(len(entities), 20)) + [entities[-1]]:
+            assert erm.get_dependencies(entity) == expected(entity, True)
+            assert erm.get_dependents(entity) == expected(entity, False)
+            assert erm.get_high_priority_dependencies(entity) == expected(entity, True, RelationType.HIGH)
+            assert erm.get_dependents(entity, RelationType.LOW) == expected(entity, False, RelationType.LOW)
+
+    assert erm.get_dependencies(Entity("Unknown", EntityLevel.N1)) == []
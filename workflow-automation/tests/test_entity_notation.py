@@ -0,0 +1,94 @@
+"""
+Tests for parsing and exporting the N1/N2/N3 entity notation.
+"""
+
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.entity_mapping import (
+    EntityLevel, EntityRelationMap, NotationSyntaxError, RelationType, create_seo_blog_entity_map,
+    estimate_tokens, parse_notation
+)
+
+
+def test_notation_round_trips():
+    erm = create_seo_blog_entity_map()
+    erm.add_entity("Unlinked", EntityLevel.N2)
+    text = erm.to_notation()
+
+    parsed = parse_notation(text)
+
+    assert parsed.to_notation() == text
+    # Entities are created on first mention, so only the set is preserved (metadata is not)
+    assert sorted(parsed.entities) == sorted(erm.entities)
+    assert [str(relation) for relation in parsed.relations] == [str(relation) for relation in erm.relations]
+
+
+def test_ascii_arrows_chains_and_comments():
+    unicode_map = parse_notation("N1:Keyword $H→ N2:Draft $L← N2:StyleGuide")
+    ascii_map = parse_notation(io.StringIO(
+        "# ASCII arrows, with and without spaces\n"
+        "\n"
+        "N1:Keyword $H-> N2:Draft\n"
+        "N2:Draft $L<-N2:StyleGuide\n"
+    ))
+
+    assert ascii_map.to_notation() == unicode_map.to_notation() == (
+        "N1:Keyword $H→ N2:Draft\nN2:Draft $L← N2:StyleGuide"
+    )
+    draft = ascii_map.relations[1]
+    assert (draft.relation_type, draft.direction) == (RelationType.LOW, "←")
+    assert ascii_map.entities["N2:StyleGuide"].level == EntityLevel.N2
+
+
+@pytest.mark.parametrize("text, line, column, message", [
+    ("N1:A $H→ N2:B\nN2:B $X→ N3:C", 2, 6, "unexpected '$'"),
+    ("N1:A $H→", 1, 9, "expected an entity after '$H→'"),
+    ("N1:A $H→ X:B", 1, 10, "invalid entity 'X:B'"),
+    ("# header\nN1:A N2:B", 2, 6, "expected a relation like $H→ or $L←, found 'N2:B'"),
+    ("N1:A\n  N1:A $L→ N3:", 2, 12, "invalid entity 'N3:'"),
+])
+def test_syntax_errors_report_line_and_column(text, line, column, message):
+    with pytest.raises(NotationSyntaxError) as info:
+        EntityRelationMap.from_notation(text)
+
+    error = info.value
+    assert (error.line, error.column) == (line, column)
+    assert message in str(error)
+    assert str(error).startswith(f"line {line}, column {column}: ")
+    assert error.text == text.splitlines()[line - 1]
+
+
+def test_budgeted_export_stays_within_the_budget():
+    erm = create_seo_blog_entity_map()
+    full = erm.to_notation(max_tokens=10_000)
+
+    # Ranked and chained, but the same relations
+    assert sorted(parse_notation(full).to_notation().splitlines()) == sorted(erm.to_notation().splitlines())
+    for budget in range(0, estimate_tokens(full) + 5):
+        text = erm.to_notation(max_tokens=budget)
+        assert estimate_tokens(text) <= budget
+        # Whatever was kept is still valid notation
+        parse_notation(text)
+    assert erm.to_notation(max_tokens=estimate_tokens(full)) == full
+
+
+def test_budgeted_export_keeps_high_relations_near_the_focus():
+    erm = parse_notation(
+        "N1:Keyword $H→ N2:Research $H→ N2:Draft $H→ N3:Article\n"
+        "N2:Draft $L← N2:StyleGuide\n"
+        "N1:Other $H→ N2:Unrelated"
+    )
+
+    text = erm.to_notation(max_tokens=20, focus="N2:Draft")
+
+    assert estimate_tokens(text) <= 20
+    assert text == "N2:Research $H→ N2:Draft $H→ N3:Article"
+    assert erm.to_notation(max_tokens=5, focus="N2:Draft") == "N2:Draft"
+    # A custom counter bounds the output the same way
+    assert len(erm.to_notation(max_tokens=60, count_tokens=len)) <= 60
@@ -0,0 +1,91 @@
+"""
+Tests for THREAD and PROCESS executor kinds.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workflow_architecture import (
+    DEADLINE_KEY, ExecutorKind, NodeStatus, WorkflowArchitecture, WorkflowStage
+)
+
+
+async def fetch(ctx):
+    return "<p>hello</p>"
+
+
+async def unrelated(ctx):
+    return "other branch"
+
+
+def where(inputs):
+    """Reports where it ran and what it was given (module-level, so it pickles)."""
+    return {
+        "pid": os.getpid(),
+        "thread": threading.current_thread().name,
+        "keys": sorted(inputs),
+        "text": inputs["fetch"].replace("<p>", "").replace("</p>", ""),
+        "deadline": inputs.get(DEADLINE_KEY),
+    }
+
+
+def build(kind, **kwargs):
+    workflow = WorkflowArchitecture("kinds", **kwargs)
+    workflow.add_node("fetch", "Fetch", WorkflowStage.REQUIREMENT, fetch)
+    workflow.add_node("other", "Other", WorkflowStage.REQUIREMENT, unrelated)
+    workflow.add_node("clean", "Clean", WorkflowStage.IMPLEMENTATION, where, dependencies=["fetch"], kind=kind)
+    return workflow
+
+
+def test_thread_node_runs_in_the_workflow_pool_with_only_its_inputs():
+    with build(ExecutorKind.THREAD) as workflow:
+        result = asyncio.run(workflow.execute({"topic": "AI"}))
+
+    assert result.success
+    clean = result.results["clean"]
+    assert clean["pid"] == os.getpid()
+    assert clean["thread"].startswith("workflow-kinds")
+    assert clean["keys"] == ["fetch", "topic"]
+    assert clean["text"] == "hello"
+
+
+def test_process_node_runs_in_another_process_and_gets_the_deadline():
+    with build(ExecutorKind.PROCESS, process_workers=1, timeout=30) as workflow:
+        result = asyncio.run(workflow.execute({"topic": "AI"}))
+        pool = workflow.process_pool
+
+    assert result.success
+    clean = result.results["clean"]
+    assert clean["pid"] != os.getpid()
+    assert clean["keys"] == [DEADLINE_KEY, "fetch", "topic"]
+    assert clean["deadline"] > 0
+    # close() on leaving the block shut the managed pool down
+    assert workflow.process_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(os.getpid)
+
+
+def test_unpicklable_process_executor_is_rejected_when_added():
+    workflow = WorkflowArchitecture("kinds")
+
+    with pytest.raises(ValueError, match="Node 'clean' runs in a process pool.*picklable"):
+        workflow.add_node(
+            "clean", "Clean", WorkflowStage.IMPLEMENTATION, lambda inputs: inputs, kind=ExecutorKind.PROCESS
+        )
+    assert "clean" not in workflow.nodes
+
+
+def test_unpicklable_process_inputs_fail_only_that_node():
+    with build(ExecutorKind.PROCESS, process_workers=1) as workflow:
+        result = asyncio.run(workflow.execute({"lock": threading.Lock()}))
+
+    assert not result.success
+    assert workflow.nodes["clean"].status == NodeStatus.FAILED
+    assert "pickle" in workflow.nodes["clean"].error
+    assert workflow.nodes["other"].status == NodeStatus.COMPLETED
@@ -0,0 +1,145 @@
+"""
+Tests for failure policies and optional dependencies.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workflow_architecture import FailurePolicy, NodeStatus, WorkflowArchitecture, WorkflowStage
+
+
+def value(result, delay: float = 0.0):
+    async def executor(ctx):
+        await asyncio.sleep(delay)
+        return result
+    return executor
+
+
+def fail(delay: float = 0.0):
+    async def executor(ctx):
+        await asyncio.sleep(delay)
+        raise RuntimeError("provider down")
+    return executor
+
+
+def statuses(workflow):
+    return {node_id: node.status for node_id, node in workflow.nodes.items()}
+
+
+def test_fail_fast_cancels_running_nodes_and_skips_the_rest():
+    cancelled = []
+
+    async def slow(ctx):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    workflow = WorkflowArchitecture("fail-fast", failure_policy=FailurePolicy.FAIL_FAST)
+    workflow.add_node("broken", "Broken", WorkflowStage.DESIGN, fail(0.01))
+    workflow.add_node("slow", "Slow", WorkflowStage.DESIGN, slow)
+    workflow.add_node("after", "After", WorkflowStage.DESIGN, value("late"), dependencies=["slow"])
+
+    started = time.monotonic()
+    result = asyncio.run(workflow.execute({}))
+
+    assert time.monotonic() - started < 1
+    assert not result.success
+    assert cancelled == ["slow"]
+    assert statuses(workflow) == {
+        "broken": NodeStatus.FAILED, "slow": NodeStatus.SKIPPED, "after": NodeStatus.SKIPPED
+    }
+    assert workflow.nodes["slow"].error == "Cancelled: fail-fast after 'broken' failed"
+    assert workflow.nodes["after"].error == "Skipped: fail-fast after 'broken' failed"
+    assert (result.nodes_failed, result.nodes_skipped) == (1, 2)
+
+
+def test_skip_dependents_prunes_only_the_failed_branch():
+    workflow = WorkflowArchitecture("skip")
+    workflow.add_node("broken", "Broken", WorkflowStage.DESIGN, fail())
+    workflow.add_node("child", "Child", WorkflowStage.DESIGN, value("c"), dependencies=["broken"])
+    workflow.add_node("grandchild", "Grandchild", WorkflowStage.DESIGN, value("g"), dependencies=["child"])
+    workflow.add_node("sibling", "Sibling", WorkflowStage.DESIGN, value("s", 0.01))
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert not result.success
+    assert statuses(workflow) == {
+        "broken": NodeStatus.FAILED,
+        "child": NodeStatus.SKIPPED,
+        "grandchild": NodeStatus.SKIPPED,
+        "sibling": NodeStatus.COMPLETED,
+    }
+    assert workflow.nodes["grandchild"].error == "Skipped: dependency 'broken' failed"
+
+
+def test_continue_runs_dependents_of_failed_nodes():
+    seen = {}
+
+    async def summarize(ctx):
+        seen["broken"] = ctx.get("broken")
+        return "summary"
+
+    workflow = WorkflowArchitecture("continue", failure_policy=FailurePolicy.CONTINUE)
+    workflow.add_node("broken", "Broken", WorkflowStage.DESIGN, fail())
+    workflow.add_node("summary", "Summary", WorkflowStage.DESIGN, summarize, dependencies=["broken"])
+    workflow.add_node("publish", "Publish", WorkflowStage.DESIGN, value("done"), dependencies=["summary"])
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert not result.success
+    assert (result.nodes_completed, result.nodes_failed, result.nodes_skipped) == (2, 1, 0)
+    assert seen == {"broken": None}
+    assert result.results["publish"] == "done"
+
+
+def test_failed_optional_dependency_does_not_skip_the_node():
+    seen = {}
+
+    async def draft(ctx):
+        seen.update(research=ctx["research"], style="style" in ctx)
+        return "draft"
+
+    workflow = WorkflowArchitecture("optional")
+    workflow.add_node("research", "Research", WorkflowStage.REQUIREMENT, value("notes"))
+    workflow.add_node("style", "Style guide", WorkflowStage.REQUIREMENT, fail(0.01))
+    workflow.add_node(
+        "draft", "Draft", WorkflowStage.IMPLEMENTATION, draft,
+        dependencies=["research"], optional_dependencies=["style"]
+    )
+    workflow.add_node("publish", "Publish", WorkflowStage.DEPLOYMENT, value("done"), dependencies=["draft"])
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert not result.success
+    assert seen == {"research": "notes", "style": False}
+    assert workflow.nodes["draft"].status == NodeStatus.COMPLETED
+    assert workflow.nodes["publish"].status == NodeStatus.COMPLETED
+    # Optional dependencies still order the node after them
+    assert workflow.nodes["draft"].start_time >= workflow.nodes["style"].end_time
+
+
+def test_optional_dependency_on_a_pruned_branch_still_runs():
+    workflow = WorkflowArchitecture("optional")
+    workflow.add_node("broken", "Broken", WorkflowStage.DESIGN, fail())
+    workflow.add_node("enrich", "Enrich", WorkflowStage.DESIGN, value("e"), dependencies=["broken"])
+    workflow.add_node("draft", "Draft", WorkflowStage.DESIGN, value("d"), optional_dependencies=["enrich"])
+    workflow.add_node(
+        "review", "Review", WorkflowStage.DESIGN, value("r"),
+        dependencies=["broken"], optional_dependencies=["draft"]
+    )
+
+    asyncio.run(workflow.execute({}))
+
+    assert statuses(workflow) == {
+        "broken": NodeStatus.FAILED,
+        "enrich": NodeStatus.SKIPPED,
+        "draft": NodeStatus.COMPLETED,
+        # A required dependency failed, so the optional one does not save it
+        "review": NodeStatus.SKIPPED,
+    }
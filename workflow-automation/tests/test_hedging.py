@@ -0,0 +1,76 @@
+"""
+Tests for hedged attempts and their per-run budget.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workflow_architecture import HedgePolicy, WorkflowArchitecture, WorkflowStage
+
+
+def test_fast_duplicate_wins():
+    started = []
+
+    async def fetch(ctx):
+        index = len(started)
+        started.append(index)
+        await asyncio.sleep(1.0 if index == 0 else 0.01)
+        return f"attempt {index}"
+
+    workflow = WorkflowArchitecture("hedge")
+    workflow.add_node(
+        "fetch", "Fetch", WorkflowStage.DESIGN, fetch, hedge_policy=HedgePolicy(delay=0.02, budget=None)
+    )
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert result.success
+    assert result.results["fetch"] == "attempt 1"
+    assert result.total_duration_ms < 500
+    assert started == [0, 1]
+
+
+def test_budget_caps_hedges_per_run_and_resets_between_runs():
+    started = []
+
+    async def fetch(ctx):
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    policy = HedgePolicy(delay=0.01, budget=0.1)
+    workflow = WorkflowArchitecture("budget")
+    for index in range(5):
+        workflow.add_node(f"fetch{index}", "Fetch", WorkflowStage.DESIGN, fetch, hedge_policy=policy)
+
+    for _ in range(2):
+        started.clear()
+        assert asyncio.run(workflow.execute({})).success
+        # Five executions at 10% round up to the guaranteed single hedge per run
+        assert len(started) == 6
+
+    # Clones copy the policy instead of sharing it
+    twin = workflow.clone()
+    assert twin.nodes["fetch0"].hedge_policy is not policy
+    assert twin.nodes["fetch0"].hedge_policy is twin.nodes["fetch1"].hedge_policy
+    started.clear()
+    assert asyncio.run(twin.execute({})).success
+    assert len(started) == 6
+
+
+def test_zero_budget_never_hedges():
+    started = []
+
+    async def fetch(ctx):
+        started.append(1)
+        await asyncio.sleep(0.03)
+        return "done"
+
+    workflow = WorkflowArchitecture("no-hedge")
+    workflow.add_node("fetch", "Fetch", WorkflowStage.DESIGN, fetch, hedge_policy=HedgePolicy(delay=0.01, budget=0))
+
+    assert asyncio.run(workflow.execute({})).success
+    assert len(started) == 1
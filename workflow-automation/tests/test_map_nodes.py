@@ -0,0 +1,76 @@
+"""
+Tests for map nodes fanning out over upstream results.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workflow_architecture import FailurePolicy, WorkflowArchitecture, WorkflowStage
+
+
+async def outline(ctx):
+    return {"headings": ["Intro", "Benefits", "Pricing", "Conclusion"]}
+
+
+def test_map_fans_out_and_keeps_item_order():
+    async def write(ctx, heading):
+        # Items finish out of order; results still follow the item order
+        await asyncio.sleep(0.01 * (4 - len(heading) % 4))
+        return f"## {heading}"
+
+    workflow = WorkflowArchitecture("map")
+    workflow.add_node("outline", "Outline", WorkflowStage.DESIGN, outline)
+    workflow.add_map_node(
+        "sections", "Sections", WorkflowStage.IMPLEMENTATION, "outline", write,
+        items=lambda value: value["headings"], dependencies=["outline"]
+    )
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert result.success
+    assert result.results["sections"] == ["## Intro", "## Benefits", "## Pricing", "## Conclusion"]
+    assert [child.id for child in workflow.map_children["sections"]] == [f"sections[{i}]" for i in range(4)]
+
+
+def test_map_reduce_combines_child_results():
+    async def write(ctx, heading):
+        return heading.lower()
+
+    workflow = WorkflowArchitecture("map")
+    workflow.add_node("outline", "Outline", WorkflowStage.DESIGN, outline)
+    workflow.add_map_node(
+        "sections", "Sections", WorkflowStage.IMPLEMENTATION, "outline", write,
+        items=lambda value: value["headings"], reduce=" / ".join, dependencies=["outline"]
+    )
+
+    assert asyncio.run(workflow.execute({})).results["sections"] == "intro / benefits / pricing / conclusion"
+
+
+def test_fail_fast_cancels_sibling_items():
+    finished = []
+
+    async def write(ctx, heading):
+        if heading == "Benefits":
+            raise RuntimeError("LLM refused")
+        await asyncio.sleep(0.5)
+        finished.append(heading)
+        return heading
+
+    workflow = WorkflowArchitecture("map", failure_policy=FailurePolicy.FAIL_FAST)
+    workflow.add_node("outline", "Outline", WorkflowStage.DESIGN, outline)
+    workflow.add_map_node(
+        "sections", "Sections", WorkflowStage.IMPLEMENTATION, "outline", write,
+        items=lambda value: value["headings"], dependencies=["outline"]
+    )
+
+    start = time.perf_counter()
+    result = asyncio.run(workflow.execute({}))
+
+    assert not result.success
+    assert time.perf_counter() - start < 0.3
+    assert finished == []
+    assert "sections[1]: LLM refused" in workflow.nodes["sections"].error
@@ -0,0 +1,139 @@
+"""
+Tests for the Prometheus metrics registry, exporter and HTTP endpoint.
+"""
+
+import asyncio
+import os
+import sys
+import urllib.error
+import urllib.request
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.metrics import MetricsRegistry, WorkflowMetricsExporter, start_metrics_server
+from core.tracing import Tracer
+from core.workflow_architecture import RetryPolicy, WorkflowArchitecture, WorkflowStage
+
+
+def samples(text):
+    """Sample lines of a Prometheus exposition, as {"name{labels}": value}."""
+    parsed = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            parsed[name] = value
+    return parsed
+
+
+def test_histogram_renders_cumulative_le_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("node_seconds", "Node duration", buckets=(1.0, 0.1))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value, stage="design")
+
+    text = registry.render()
+
+    assert text.startswith("# HELP node_seconds Node duration\n# TYPE node_seconds histogram\n")
+    assert samples(text) == {
+        'node_seconds_bucket{stage="design",le="0.1"}': "2",
+        'node_seconds_bucket{stage="design",le="1"}': "3",
+        'node_seconds_bucket{stage="design",le="+Inf"}': "4",
+        'node_seconds_sum{stage="design"}': "5.65",
+        'node_seconds_count{stage="design"}': "4",
+    }
+
+
+def test_counters_and_gauges_render_per_label_set():
+    registry = MetricsRegistry()
+    runs = registry.counter("runs_total", "Runs")
+    runs.inc(workflow="blog", status="ok")
+    runs.inc(2, workflow="blog", status="ok")
+    runs.inc(workflow='say "hi"\n', status="error")
+    active = registry.gauge("runs_active", "Active runs")
+    active.inc(workflow="blog")
+    active.dec(workflow="blog")
+
+    text = registry.render()
+
+    assert "# TYPE runs_total counter" in text
+    assert "# TYPE runs_active gauge" in text
+    assert samples(text) == {
+        'runs_total{status="ok",workflow="blog"}': "3",
+        'runs_total{status="error",workflow="say \\"hi\\"\\n"}': "1",
+        'runs_active{workflow="blog"}': "0",
+    }
+
+
+def test_metric_names_cannot_change_kind():
+    registry = MetricsRegistry()
+    counter = registry.counter("runs_total", "Runs")
+
+    assert registry.counter("runs_total", "Runs") is counter
+    with pytest.raises(ValueError, match="already registered as a counter"):
+        registry.gauge("runs_total", "Runs")
+
+
+def test_exporter_counts_runs_nodes_and_retries():
+    metrics = WorkflowMetricsExporter()
+    attempts = []
+
+    async def flaky(ctx):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("transient")
+        return "serp"
+
+    async def broken(ctx):
+        raise RuntimeError("down")
+
+    async def draft(ctx):
+        return "draft"
+
+    workflow = WorkflowArchitecture("blog", tracer=Tracer([metrics]), resource_limits={"openai": 2})
+    metrics.track_pools(workflow)
+    workflow.add_node(
+        "fetch", "Fetch", WorkflowStage.REQUIREMENT, flaky, resources=["openai"],
+        retry_policy=RetryPolicy(max_retries=1, base_delay=0, jitter=False)
+    )
+    workflow.add_node("broken", "Broken", WorkflowStage.REQUIREMENT, broken)
+    workflow.add_node("draft", "Draft", WorkflowStage.IMPLEMENTATION, draft, dependencies=["fetch"])
+    workflow.add_node("publish", "Publish", WorkflowStage.DEPLOYMENT, draft, dependencies=["broken"])
+
+    asyncio.run(workflow.execute({}))
+    parsed = samples(metrics.registry.render())
+
+    assert parsed['workflow_runs_total{status="error",workflow="blog"}'] == "1"
+    assert parsed['workflow_runs_active{workflow="blog"}'] == "0"
+    assert parsed['workflow_run_duration_seconds_count{workflow="blog"}'] == "1"
+    assert parsed['workflow_nodes_total{status="completed",workflow="blog"}'] == "2"
+    assert parsed['workflow_nodes_total{status="failed",workflow="blog"}'] == "1"
+    assert parsed['workflow_nodes_total{status="skipped",workflow="blog"}'] == "1"
+    assert parsed['workflow_node_retries_total{workflow="blog"}'] == "1"
+    assert parsed['workflow_nodes_queued{workflow="blog"}'] == "0"
+    assert parsed['workflow_nodes_in_flight{workflow="blog"}'] == "0"
+    assert parsed['workflow_node_duration_seconds_count{stage="requirement_analysis",workflow="blog"}'] == "1"
+    assert parsed['workflow_pool_in_use{pool="openai"}'] == "0"
+
+
+def test_http_endpoint_serves_the_registry():
+    registry = MetricsRegistry()
+    registry.counter("runs_total", "Runs").inc(workflow="blog", status="ok")
+    server = start_metrics_server(registry, port=0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            urllib.request.urlopen(f"{base}/health", timeout=5)
+        missing.value.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type == "text/plain; version=0.0.4; charset=utf-8"
+    assert body == registry.render()
+    assert 'runs_total{status="ok",workflow="blog"} 1' in body
+    assert missing.value.code == 404
@@ -0,0 +1,72 @@
+"""
+Tests for NodeResultCache keys and its disk tier.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.node_cache import NodeResultCache, fingerprint
+
+
+@pytest.mark.parametrize("left, right", [
+    ((1, 2), [1, 2]),
+    ({1: "x"}, {"1": "x"}),
+    ({1, 2}, [1, 2]),
+    ({"__type__": "tuple", "items": [1, 2]}, (1, 2)),
+    ({"a": (1, 2)}, {"a": [1, 2]}),
+    (1, 1.0),
+])
+def test_fingerprint_keeps_json_lookalikes_apart(left, right):
+    assert fingerprint(left) != fingerprint(right)
+
+
+def test_fingerprint_is_order_independent():
+    assert fingerprint({"b": 1, "a": {3, 1, 2}}) == fingerprint({"a": {2, 3, 1}, "b": 1})
+    assert fingerprint({2: "b", 1: "a"}) == fingerprint({1: "a", 2: "b"})
+
+
+def test_unfingerprintable_inputs_are_uncacheable():
+    looped = []
+    looped.append(looped)
+
+    assert NodeResultCache.make_key("node", "v1", {"items": looped}) is None
+    assert NodeResultCache.make_key("node", "v1", {"client": object()}) is None
+
+
+def test_disk_tier_runs_in_a_worker_thread(tmp_path, monkeypatch):
+    cache = NodeResultCache(cache_dir=str(tmp_path))
+    threads = []
+    for name in ("_read_disk", "_write_disk"):
+        original = getattr(cache, name)
+
+        def recording(*args, _original=original):
+            threads.append(threading.current_thread())
+            return _original(*args)
+
+        monkeypatch.setattr(cache, name, recording)
+
+    async def main():
+        await cache.aset("ab" * 32, {"serp": [1, 2, 3]})
+        cache._memory.clear()
+        return await cache.aget("ab" * 32)
+
+    assert asyncio.run(main()) == (True, {"serp": [1, 2, 3]})
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_expired_disk_entries_miss_and_are_removed(tmp_path):
+    key = "cd" * 32
+    NodeResultCache(ttl=-1, cache_dir=str(tmp_path)).set(key, "stale")
+
+    cache = NodeResultCache(cache_dir=str(tmp_path))
+
+    assert asyncio.run(cache.aget(key)) == (False, None)
+    assert not os.path.exists(cache._disk_path(key))
+    assert cache.stats()["misses"] == 1
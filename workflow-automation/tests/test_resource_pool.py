@@ -0,0 +1,160 @@
+"""
+Tests for resource pools and how workflows acquire them.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.resource_pool import ResourcePool, hold_resources
+from core.workflow_architecture import WorkflowArchitecture, WorkflowStage
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    async def main():
+        pool = ResourcePool("openai", 1)
+        await pool.acquire()
+        served = []
+
+        async def wait(label, priority):
+            await pool.acquire(priority)
+            served.append(label)
+            pool.release()
+
+        tasks = []
+        for label, priority in [("low", 1), ("high-1", 5), ("mid", 3), ("high-2", 5)]:
+            tasks.append(asyncio.create_task(wait(label, priority)))
+            await settle()
+        assert pool.waiting == 4
+
+        pool.release()
+        await asyncio.gather(*tasks)
+        return served, pool.in_use
+
+    served, in_use = asyncio.run(main())
+
+    assert served == ["high-1", "high-2", "mid", "low"]
+    assert in_use == 0
+
+
+def test_release_hands_the_slot_to_a_waiter_before_newcomers():
+    async def main():
+        pool = ResourcePool("serp", 1)
+        await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await settle()
+
+        pool.release()
+        # The slot now belongs to the waiter, even though it has not run yet
+        assert pool.in_use == 1
+        newcomer = asyncio.create_task(pool.acquire())
+        await settle()
+
+        assert waiter.done()
+        assert not newcomer.done()
+        pool.release()
+        await newcomer
+        pool.release()
+        return pool.in_use
+
+    assert asyncio.run(main()) == 0
+
+
+def test_cancelled_waiter_is_skipped():
+    async def main():
+        pool = ResourcePool("scraper", 1)
+        await pool.acquire()
+        cancelled = asyncio.create_task(pool.acquire(priority=10))
+        await settle()
+        waiter = asyncio.create_task(pool.acquire())
+        await settle()
+
+        cancelled.cancel()
+        await settle()
+        assert pool.waiting == 1
+        pool.release()
+        await waiter
+        return pool.in_use
+
+    assert asyncio.run(main()) == 1
+
+
+def test_releasing_an_idle_pool_raises():
+    with pytest.raises(RuntimeError, match="released more times than acquired"):
+        ResourcePool("openai", 1).release()
+
+
+def test_opposite_acquisition_orders_do_not_deadlock():
+    async def main():
+        pools = {"openai": ResourcePool("openai", 1), "serp": ResourcePool("serp", 1)}
+
+        async def hold(names):
+            async with hold_resources([pools[name] for name in names]):
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(
+            asyncio.gather(*[hold(["openai", "serp"]), hold(["serp", "openai"])] * 5), timeout=2
+        )
+        return [pool.in_use for pool in pools.values()]
+
+    assert asyncio.run(main()) == [0, 0]
+
+
+def test_node_waiting_on_a_named_pool_does_not_hold_a_global_slot():
+    timeline = {}
+
+    def timed(label, delay):
+        async def executor(ctx):
+            timeline[label] = [time.monotonic()]
+            await asyncio.sleep(delay)
+            timeline[label].append(time.monotonic())
+        return executor
+
+    workflow = WorkflowArchitecture("pools", concurrency=2)
+    workflow.add_resource_pool("openai", 1)
+    workflow.add_node("summary", "Summary", WorkflowStage.DESIGN, timed("summary", 0.2), resources=["openai"])
+    workflow.add_node("outline", "Outline", WorkflowStage.DESIGN, timed("outline", 0.01), resources=["openai"])
+    # Downstream paths make the dispatch order summary, outline, scrape
+    workflow.add_node("draft", "Draft", WorkflowStage.DESIGN, timed("draft", 0), dependencies=["outline"])
+    workflow.add_node("review", "Review", WorkflowStage.DESIGN, timed("review", 0), dependencies=["summary"])
+    workflow.add_node("publish", "Publish", WorkflowStage.DESIGN, timed("publish", 0), dependencies=["review"])
+    workflow.add_node("scrape", "Scrape", WorkflowStage.DESIGN, timed("scrape", 0.01))
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert result.success
+    # "outline" queues on openai without taking the second global slot
+    assert timeline["scrape"][1] < timeline["summary"][1]
+    assert timeline["outline"][0] >= timeline["summary"][1]
+
+
+def test_workflows_sharing_pools_do_not_deadlock():
+    async def slow(ctx):
+        await asyncio.sleep(0.01)
+
+    template = WorkflowArchitecture("shared")
+    template.add_resource_pool("openai", 1)
+    template.add_resource_pool("serp", 1)
+    first, second = template.clone("first"), template.clone("second")
+    for index in range(5):
+        first.add_node(f"n{index}", "Node", WorkflowStage.DESIGN, slow, resources=["openai", "serp"])
+        second.add_node(f"n{index}", "Node", WorkflowStage.DESIGN, slow, resources=["serp", "openai"])
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(first.execute({}), second.execute({})), timeout=5)
+
+    results = asyncio.run(main())
+
+    assert all(result.success for result in results)
+    assert first.resource_pools["openai"] is second.resource_pools["openai"]
+    assert template.resource_pools["openai"].in_use == 0
@@ -0,0 +1,142 @@
+"""
+Tests for node retries, backoff and per-attempt timeouts.
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import workflow_architecture
+from core.tracing import SpanExporter, Tracer
+from core.workflow_architecture import NodeStatus, RetryPolicy, WorkflowArchitecture, WorkflowStage
+
+
+class RecordingExporter(SpanExporter):
+    def __init__(self):
+        self.ended = []
+
+    def on_end(self, span):
+        self.ended.append(span)
+
+    def events(self, node_id, name):
+        span = next(span for span in self.ended if span.name == f"node:{node_id}")
+        return [event.attributes for event in span.events if event.name == name]
+
+
+@pytest.fixture
+def seeded(monkeypatch):
+    """Replace the module RNG so backoff draws are reproducible."""
+    monkeypatch.setattr(workflow_architecture, "random", random.Random(1234))
+    return random.Random(1234)
+
+
+def flaky(failures, error=RuntimeError, delay=0.0):
+    calls = []
+
+    async def executor(ctx):
+        calls.append(len(calls) + 1)
+        if len(calls) <= failures:
+            await asyncio.sleep(delay)
+            raise error(f"attempt {len(calls)} failed")
+        return "ok"
+    return executor, calls
+
+
+def run(policy, executor, timeout=None, workflow_timeout=None):
+    exporter = RecordingExporter()
+    workflow = WorkflowArchitecture("retry", tracer=Tracer([exporter]), timeout=workflow_timeout)
+    workflow.add_node(
+        "fetch", "Fetch", WorkflowStage.REQUIREMENT, executor, retry_policy=policy, timeout=timeout
+    )
+    return workflow, asyncio.run(workflow.execute({})), exporter
+
+
+def test_backoff_doubles_up_to_max_delay_without_jitter():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, jitter=False)
+
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_full_jitter_stays_within_the_exponential_bound(seeded):
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, jitter=True)
+
+    for attempt in range(1, 8):
+        cap = min(3.0, 0.5 * 2 ** (attempt - 1))
+        for _ in range(50):
+            delay = policy.backoff(attempt)
+            assert delay == seeded.uniform(0, cap)
+            assert 0 <= delay <= cap
+
+
+def test_node_retries_until_success_with_seeded_delays(seeded):
+    executor, calls = flaky(failures=2)
+    policy = RetryPolicy(max_retries=3, base_delay=0.004, max_delay=0.01)
+
+    workflow, result, exporter = run(policy, executor)
+
+    assert result.success
+    assert calls == [1, 2, 3]
+    assert workflow.nodes["fetch"].attempts == 3
+    retries = exporter.events("fetch", "retry")
+    assert [retry["attempt"] for retry in retries] == [1, 2]
+    assert [retry["delay_s"] for retry in retries] == [seeded.uniform(0, 0.004), seeded.uniform(0, 0.008)]
+
+
+def test_node_fails_after_max_retries(seeded):
+    executor, calls = flaky(failures=10)
+
+    workflow, result, exporter = run(RetryPolicy(max_retries=2, base_delay=0.001), executor)
+
+    assert not result.success
+    assert calls == [1, 2, 3]
+    node = workflow.nodes["fetch"]
+    assert node.status == NodeStatus.FAILED
+    assert node.error == "attempt 3 failed"
+    assert len(exporter.events("fetch", "retry")) == 2
+
+
+def test_non_retryable_exception_fails_without_retrying(seeded):
+    executor, calls = flaky(failures=1, error=ValueError)
+    policy = RetryPolicy(max_retries=5, base_delay=0.001, retry_on=(ConnectionError,))
+
+    workflow, result, exporter = run(policy, executor)
+
+    assert not result.success
+    assert calls == [1]
+    assert workflow.nodes["fetch"].error == "attempt 1 failed"
+    assert exporter.events("fetch", "retry") == []
+
+
+def test_per_attempt_timeout_is_retried(seeded):
+    calls = []
+
+    async def slow_then_fast(ctx):
+        calls.append(len(calls) + 1)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return "ok"
+
+    policy = RetryPolicy(max_retries=1, base_delay=0.001)
+    workflow, result, exporter = run(policy, slow_then_fast, timeout=0.05)
+
+    assert result.success
+    assert calls == [1, 2]
+    errors = exporter.events("fetch", "attempt.error")
+    assert len(errors) == 1
+    assert "timed out after 0.05s" in errors[0]["error"]
+
+
+def test_retry_is_skipped_when_backoff_exceeds_the_deadline():
+    executor, calls = flaky(failures=1)
+    policy = RetryPolicy(max_retries=3, base_delay=5.0, jitter=False)
+
+    workflow, result, _ = run(policy, executor, workflow_timeout=1.0)
+
+    assert not result.success
+    assert calls == [1]
+    assert result.total_duration_ms < 1000
@@ -0,0 +1,62 @@
+"""
+Tests for StagePipeline job execution.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.metrics import MetricsRegistry, WorkflowMetricsExporter
+from core.stage_pipeline import StagePipeline
+from core.tracing import SpanExporter, Tracer
+from core.workflow_architecture import WorkflowArchitecture, WorkflowStage
+
+
+class RecordingExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def on_end(self, span):
+        self.spans.append(span)
+
+
+async def write(ctx):
+    return ctx["keyword"]
+
+
+def test_jobs_keep_template_name_and_carry_index():
+    recorder = RecordingExporter()
+    registry = MetricsRegistry()
+    template = WorkflowArchitecture("Blog Batch", tracer=Tracer([recorder, WorkflowMetricsExporter(registry)]))
+    template.add_node("write", "Write", WorkflowStage.IMPLEMENTATION, write)
+
+    results = asyncio.run(StagePipeline(template).run([{"keyword": f"kw{i}"} for i in range(3)]))
+
+    assert all(result.success for result in results)
+    runs = [span for span in recorder.spans if span.parent_id is None]
+    assert {span.attributes["workflow.name"] for span in runs} == {"Blog Batch"}
+    assert sorted(span.attributes["pipeline.job"] for span in runs) == [0, 1, 2]
+    assert 'workflow_runs_total{status="ok",workflow="Blog Batch"} 3' in registry.render()
+
+
+def test_deadline_at_the_stage_gate_fails_held_nodes():
+    async def slow(ctx):
+        await asyncio.sleep(0.2)
+        return "done"
+
+    template = WorkflowArchitecture("Gated")
+    template.add_node("serp", "Fetch SERP", WorkflowStage.REQUIREMENT, slow)
+    template.add_node("outline", "Outline", WorkflowStage.DESIGN, slow, dependencies=["serp"])
+    template.add_node("write", "Write", WorkflowStage.IMPLEMENTATION, slow, dependencies=["outline"])
+
+    # One DESIGN worker: the second job is held at the gate past its deadline
+    pipeline = StagePipeline(template, stage_workers={WorkflowStage.DESIGN: 1})
+    results = asyncio.run(pipeline.run([{}, {}], timeout=0.3))
+
+    for result in results:
+        assert not result.success
+        assert result.nodes_completed + result.nodes_failed + result.nodes_skipped == 3
+    assert any("never started" in error for result in results for error in result.errors)
+    assert pipeline.stats()["failed"] == 2
@@ -0,0 +1,95 @@
+"""
+Tests for the SQLite task queue: claims, leases and heartbeats.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.task_queue import SQLiteTaskQueue, TaskStatus, TaskWorker, executor_ref
+
+
+def double(inputs):
+    return inputs["value"] * 2
+
+
+def slow_double(inputs):
+    time.sleep(0.3)
+    return inputs["value"] * 2
+
+
+def test_claim_takes_the_oldest_task_once(tmp_path):
+    queue = SQLiteTaskQueue(str(tmp_path / "tasks.db"))
+    first = queue.enqueue("a", executor_ref(double), {"value": 1})
+    second = queue.enqueue("b", executor_ref(double), {"value": 2})
+
+    task = queue.claim("w1", lease_seconds=60)
+    assert (task.task_id, task.inputs, task.attempts) == (first, {"value": 1}, 1)
+    assert queue.claim("w2", lease_seconds=60).task_id == second
+    assert queue.claim("w3", lease_seconds=60) is None
+
+    assert queue.complete(first, "w1", 2)
+    assert queue.result(first) == (TaskStatus.DONE, 2)
+    assert queue.result(second) is None
+
+
+def test_expired_lease_is_reclaimed_and_the_old_worker_cannot_write(tmp_path):
+    queue = SQLiteTaskQueue(str(tmp_path / "tasks.db"))
+    task_id = queue.enqueue("a", executor_ref(double), {"value": 1})
+
+    assert queue.claim("a", lease_seconds=0.01).task_id == task_id
+    time.sleep(0.02)
+    reclaimed = queue.claim("b", lease_seconds=60)
+    assert reclaimed.task_id == task_id and reclaimed.attempts == 2
+
+    # Worker A finishes late: its result and its failure are both refused
+    assert not queue.complete(task_id, "a", "stale")
+    assert not queue.fail(task_id, "a", "stale failure")
+    assert not queue.renew(task_id, "a", 60)
+    assert queue.result(task_id) is None
+
+    assert queue.complete(task_id, "b", 2)
+    assert queue.result(task_id) == (TaskStatus.DONE, 2)
+
+
+def test_task_fails_after_max_attempts_of_lost_leases(tmp_path):
+    queue = SQLiteTaskQueue(str(tmp_path / "tasks.db"), max_attempts=2)
+    task_id = queue.enqueue("a", executor_ref(double), {"value": 1})
+
+    for worker in ("a", "b"):
+        assert queue.claim(worker, lease_seconds=0.01).task_id == task_id
+        time.sleep(0.02)
+
+    assert queue.claim("c", lease_seconds=60) is None
+    status, error = queue.result(task_id)
+    assert status == TaskStatus.FAILED
+    assert "Lease expired" in str(error)
+
+
+def test_heartbeat_keeps_a_long_task_leased(tmp_path):
+    queue = SQLiteTaskQueue(str(tmp_path / "tasks.db"))
+    task_id = queue.enqueue("a", executor_ref(slow_double), {"value": 21})
+    # The task outlives its 0.15s lease; renewals every 0.05s keep it claimed
+    worker = TaskWorker(queue, worker_id="w1", lease_seconds=0.15)
+
+    assert worker.run_one()
+    assert worker.discarded == 0
+    assert queue.result(task_id) == (TaskStatus.DONE, 42)
+
+
+def test_worker_discards_the_outcome_of_a_cancelled_task(tmp_path):
+    queue = SQLiteTaskQueue(str(tmp_path / "tasks.db"))
+    task_id = queue.enqueue("a", executor_ref(slow_double), {"value": 1})
+    worker = TaskWorker(queue, worker_id="w1", lease_seconds=60)
+
+    timer = threading.Timer(0.1, queue.cancel, args=(task_id,))
+    timer.start()
+    worker.run_one()
+    timer.join()
+
+    assert worker.discarded == 1
+    status, error = queue.result(task_id)
+    assert status == TaskStatus.FAILED and "cancelled" in str(error)
@@ -0,0 +1,96 @@
+"""
+Tests for workflow spans and the JSONL span exporter.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import tracing
+from core.tracing import JsonlSpanExporter, SpanExporter, Tracer
+from core.workflow_architecture import RetryPolicy, WorkflowArchitecture, WorkflowStage
+
+
+class RecordingExporter(SpanExporter):
+    def __init__(self):
+        self.ended = []
+
+    def on_end(self, span):
+        self.ended.append(span)
+
+
+def build(tracer):
+    attempts = []
+
+    async def flaky(ctx):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("transient")
+        return "serp"
+
+    async def draft(ctx):
+        return f"draft from {ctx['fetch']}"
+
+    workflow = WorkflowArchitecture("traced", tracer=tracer)
+    workflow.add_node(
+        "fetch", "Fetch", WorkflowStage.REQUIREMENT, flaky,
+        retry_policy=RetryPolicy(max_retries=1, base_delay=0, jitter=False)
+    )
+    workflow.add_node("draft", "Draft", WorkflowStage.IMPLEMENTATION, draft, dependencies=["fetch"])
+    return workflow
+
+
+def test_node_spans_are_children_of_the_workflow_span():
+    exporter = RecordingExporter()
+    result = asyncio.run(build(Tracer([exporter])).execute({}))
+
+    assert result.success
+    *nodes, root = exporter.ended
+    assert root.name == "workflow:traced"
+    assert root.parent_id is None
+    assert [span.name for span in nodes] == ["node:fetch", "node:draft"]
+    assert {span.parent_id for span in nodes} == {root.span_id}
+    assert {span.trace_id for span in nodes} == {root.trace_id}
+    assert len({span.span_id for span in exporter.ended}) == 3
+    assert [event.name for event in nodes[0].events] == [
+        "attempt.start", "attempt.error", "retry", "attempt.start"
+    ]
+
+
+def test_jsonl_trace_is_on_disk_when_execute_returns(tmp_path):
+    exporter = JsonlSpanExporter(str(tmp_path))
+    asyncio.run(build(Tracer([exporter])).execute({}))
+
+    with open(exporter.path, encoding="utf-8") as f:
+        spans = [json.loads(line) for line in f]
+
+    assert [span["name"] for span in spans] == ["node:fetch", "node:draft", "workflow:traced"]
+    root = spans[-1]
+    assert root["status"] == "ok"
+    assert root["attributes"]["workflow.nodes_completed"] == 2
+    assert all(span["parent_id"] == root["span_id"] for span in spans[:-1])
+    assert spans[0]["attributes"]["node.attempts"] == 2
+    assert spans[0]["duration_ms"] >= 0
+    exporter.shutdown()
+
+
+def test_jsonl_writes_happen_on_the_writer_thread(tmp_path, monkeypatch):
+    writers = []
+
+    def recording_open(*args, **kwargs):
+        writers.append(threading.current_thread())
+        return open(*args, **kwargs)
+
+    monkeypatch.setattr(tracing, "open", recording_open, raising=False)
+    exporter = JsonlSpanExporter(str(tmp_path), buffer_size=1)
+    asyncio.run(build(Tracer([exporter])).execute({}))
+    exporter.shutdown()
+
+    assert writers
+    assert threading.main_thread() not in writers
+    with open(exporter.path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
@@ -0,0 +1,165 @@
+"""
+Tests for WorkflowArchitecture scheduling and context handling.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.node_cache import NodeResultCache
+from core.workflow_architecture import (
+    ExecutorKind, FailurePolicy, WorkflowArchitecture, WorkflowCycleError, WorkflowStage
+)
+from core.workflow_context import WorkflowContext
+
+
+def value(result, delay: float = 0.0):
+    async def executor(ctx):
+        await asyncio.sleep(delay)
+        return result
+    return executor
+
+
+async def fail(ctx):
+    raise RuntimeError("reader failed")
+
+
+@pytest.mark.parametrize("policy", [FailurePolicy.SKIP_DEPENDENTS, FailurePolicy.FAIL_FAST])
+def test_failed_reader_releases_upstream_value(policy):
+    workflow = WorkflowArchitecture("release", failure_policy=policy, release_intermediates=True)
+    workflow.add_node("source", "Source", WorkflowStage.DESIGN, value({"large": "payload"}))
+    workflow.add_node("reader", "Failing reader", WorkflowStage.DESIGN, fail, dependencies=["source"])
+    workflow.add_node("slow", "Slow reader", WorkflowStage.DESIGN, value("done", 0.05), dependencies=["source"])
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert not result.success
+    assert result.nodes_failed == 1
+    # Every reader of "source" finished, failed or was skipped: nothing pins it
+    assert "source" not in result.results
+    assert workflow.nodes["source"].result is None
+
+
+def test_skipped_nodes_release_their_inputs():
+    workflow = WorkflowArchitecture(
+        "release", failure_policy=FailurePolicy.SKIP_DEPENDENTS, release_intermediates=True
+    )
+    workflow.add_node("source", "Source", WorkflowStage.DESIGN, value("payload"))
+    workflow.add_node("broken", "Broken", WorkflowStage.DESIGN, fail)
+    workflow.add_node(
+        "join", "Join", WorkflowStage.DESIGN, value("joined"), dependencies=["source", "broken"]
+    )
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert workflow.nodes["join"].status.value == "skipped"
+    assert "source" not in result.results
+
+
+def test_wide_fan_out_completes_every_node():
+    workflow = WorkflowArchitecture("fan")
+    workflow.add_node("root", "Root", WorkflowStage.DESIGN, value("root"))
+    for index in range(500):
+        workflow.add_node(f"leaf{index}", "Leaf", WorkflowStage.DESIGN, value(index, 0.001), dependencies=["root"])
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert result.success
+    assert result.nodes_completed == 501
+
+
+def test_workflow_deadline_stops_running_nodes():
+    workflow = WorkflowArchitecture("deadline", timeout=0.05)
+    workflow.add_node("fast", "Fast", WorkflowStage.DESIGN, value("done"))
+    workflow.add_node("slow", "Slow", WorkflowStage.DESIGN, value("late", 5.0))
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert not result.success
+    assert workflow.nodes["fast"].status.value == "completed"
+    assert workflow.nodes["slow"].status.value != "completed"
+
+
+def test_closing_a_clone_keeps_the_shared_executor():
+    def parse(inputs):
+        return "parsed"
+
+    workflow = WorkflowArchitecture("pools")
+    workflow.add_node("parse", "Parse", WorkflowStage.DESIGN, parse, kind=ExecutorKind.THREAD)
+    asyncio.run(workflow.execute({}))
+    shared = workflow.thread_pool
+
+    with workflow.clone() as twin:
+        assert twin.thread_pool is shared
+        asyncio.run(twin.execute({}))
+
+    assert not shared._shutdown
+    workflow.close()
+    assert shared._shutdown
+
+
+def test_cache_store_failure_keeps_the_result():
+    class FullDiskCache(NodeResultCache):
+        def set(self, key, value):
+            raise OSError("disk full")
+
+    calls = []
+
+    async def paid(ctx):
+        calls.append(1)
+        return "answer"
+
+    workflow = WorkflowArchitecture("cache", cache=FullDiskCache())
+    workflow.add_node("paid", "Paid call", WorkflowStage.DESIGN, paid)
+
+    result = asyncio.run(workflow.execute({"prompt": "hi"}))
+
+    assert result.success
+    assert result.results["paid"] == "answer"
+    assert len(calls) == 1
+
+
+def test_keyed_view_lists_only_its_keys_and_reserved_keys():
+    store = WorkflowContext({f"node{index}": index for index in range(1000)})
+    store.publish("_deadline", 1.0)
+    view = store.view({"node1", "missing"})
+
+    assert sorted(view) == ["_deadline", "node1"]
+    assert len(view) == 2
+    store.publish("_tenant", "acme")
+    store.discard("node1")
+    assert sorted(view) == ["_deadline", "_tenant"]
+    assert dict(store.view()) == store.snapshot()
+
+
+def test_cycle_error_reports_the_cycle_path():
+    workflow = WorkflowArchitecture("cycle")
+    workflow.add_node("root", "Root", WorkflowStage.DESIGN, value("root"))
+    workflow.add_node("tail", "Tail", WorkflowStage.DESIGN, value("tail"), dependencies=["b"])
+    workflow.add_node("a", "A", WorkflowStage.DESIGN, value("a"), dependencies=["root", "c"])
+    workflow.add_node("b", "B", WorkflowStage.DESIGN, value("b"), dependencies=["a"])
+    workflow.add_node("c", "C", WorkflowStage.DESIGN, value("c"), dependencies=["b"])
+
+    with pytest.raises(WorkflowCycleError) as info:
+        workflow.compute_execution_order()
+
+    cycle = info.value.cycle
+    # Closed path in execution order, without the blocked "tail" or the acyclic "root"
+    assert cycle == ["b", "c", "a", "b"]
+    for dependency, dependent in zip(cycle, cycle[1:]):
+        assert dependency in workflow.nodes[dependent].dependencies
+    assert "b → c → a → b" in str(info.value)
+
+
+def test_self_dependency_is_a_cycle_of_one():
+    workflow = WorkflowArchitecture("cycle")
+    workflow.add_node("loop", "Loop", WorkflowStage.DESIGN, value("loop"), dependencies=["loop"])
+
+    with pytest.raises(WorkflowCycleError) as info:
+        asyncio.run(workflow.execute({}))
+
+    assert info.value.cycle == ["loop", "loop"]
@@ -0,0 +1,107 @@
+"""
+Tests for tenant admission and shared resources in WorkflowRuntime.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workflow_architecture import ExecutorKind, WorkflowArchitecture, WorkflowStage
+from core.workflow_runtime import TENANT_KEY, TenantScheduler, WorkflowRuntime
+
+
+def admission_order(scheduler, jobs):
+    """Queue ``jobs`` (tenant names) behind a held slot and return the order they are admitted in."""
+    async def main():
+        order = []
+
+        async def run(tenant):
+            await scheduler.admit(tenant)
+            order.append(tenant)
+            await asyncio.sleep(0)
+            scheduler.release(tenant)
+
+        await scheduler.admit("warmup")
+        tasks = [asyncio.create_task(run(tenant)) for tenant in jobs]
+        await asyncio.sleep(0)
+        assert scheduler.waiting == {
+            tenant: jobs.count(tenant) for tenant in dict.fromkeys(jobs)
+        } | {"warmup": 0}
+        scheduler.release("warmup")
+        await asyncio.gather(*tasks)
+        return order
+
+    return asyncio.run(main())
+
+
+def test_tenants_are_admitted_round_robin():
+    jobs = ["acme"] * 4 + ["globex"] * 2 + ["initech"]
+
+    order = admission_order(TenantScheduler(max_active=1), jobs)
+
+    assert order == ["acme", "globex", "initech", "acme", "globex", "acme", "acme"]
+
+
+def test_per_tenant_limit_caps_running_runs():
+    async def main():
+        scheduler = TenantScheduler(max_active=3, per_tenant_limit=1)
+        peak = {}
+
+        async def run(tenant):
+            await scheduler.admit(tenant)
+            peak[tenant] = max(peak.get(tenant, 0), scheduler.active_by_tenant[tenant])
+            await asyncio.sleep(0.01)
+            scheduler.release(tenant)
+
+        await asyncio.gather(*[run("acme") for _ in range(3)], run("globex"))
+        return peak, scheduler.active
+
+    peak, active = asyncio.run(main())
+
+    assert peak == {"acme": 1, "globex": 1}
+    assert active == 0
+
+
+def parse(inputs):
+    return f"{inputs['keyword']} parsed on {threading.current_thread().name}"
+
+
+def test_submit_runs_and_closes_a_clone_on_the_shared_pool(monkeypatch):
+    closed = []
+    close = WorkflowArchitecture.close
+
+    def recording_close(workflow):
+        closed.append(workflow)
+        close(workflow)
+
+    monkeypatch.setattr(WorkflowArchitecture, "close", recording_close)
+
+    async def tenant_of(ctx):
+        return ctx[TENANT_KEY]
+
+    template = WorkflowArchitecture("job")
+    template.add_node("parse", "Parse", WorkflowStage.IMPLEMENTATION, parse, kind=ExecutorKind.THREAD)
+    template.add_node("tenant", "Tenant", WorkflowStage.IMPLEMENTATION, tenant_of)
+
+    async def main():
+        async with WorkflowRuntime(share_session=False) as runtime:
+            results = await asyncio.gather(*[
+                runtime.submit(template, {"keyword": f"kw{index}"}, tenant="acme") for index in range(3)
+            ])
+            shared = runtime.thread_pool
+            # Closing the clones left the runtime's pool usable
+            assert shared.submit(lambda: "alive").result() == "alive"
+            return results, runtime.stats()
+
+    results, stats = asyncio.run(main())
+
+    assert all(result.success for result in results)
+    assert results[0].results["parse"].startswith("kw0 parsed on workflow-runtime")
+    assert results[0].results["tenant"] == "acme"
+    assert len(closed) == 3
+    assert template not in closed
+    assert template.nodes["parse"].result is None
+    assert stats["completed"] == 3 and stats["active_workflows"] == 0
@@ -0,0 +1,114 @@
+"""
+Tests for compiling declarative workflow specs.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workflow_spec import WorkflowSpecError, compile_workflow, spec_hash
+
+
+def parse(inputs):
+    return "parsed"
+
+
+SPEC = {
+    "name": "Spec Test",
+    "nodes": [{"id": "parse", "stage": "design", "executor": "parse", "kind": "thread"}],
+}
+
+
+def test_compiled_workflow_context_manager_shuts_down_its_executor():
+    async def run():
+        async with compile_workflow(SPEC, {"parse": parse}) as workflow:
+            result = await workflow.execute({})
+            pool = workflow.thread_pool
+        return result, pool, workflow
+
+    result, pool, workflow = asyncio.run(run())
+
+    assert result.results["parse"] == "parsed"
+    assert pool is not None and pool._shutdown
+    assert workflow.thread_pool is None
+
+
+def test_specs_with_embedded_callables_hash_and_compile():
+    def answer(value):
+        async def executor(ctx):
+            return value
+        return executor
+
+    def spec(executor):
+        return {"name": "Inline", "nodes": [{"id": "answer", "stage": "design", "executor": executor}]}
+
+    first, second = answer(1), answer(2)
+    assert spec_hash(spec(first)) == spec_hash(spec(first))
+    assert spec_hash(spec(first)) != spec_hash(spec(second))
+
+    async def run(executor):
+        async with compile_workflow(spec(executor)) as workflow:
+            return (await workflow.execute({})).results["answer"]
+
+    assert asyncio.run(run(first)) == 1
+    assert asyncio.run(run(second)) == 2
+
+
+def test_spec_hash_rejects_values_that_are_not_data():
+    with pytest.raises(WorkflowSpecError, match="Cannot hash workflow spec"):
+        spec_hash({"nodes": [{"id": "a", "version": object()}]})
+
+
+def spec_with(node_fields=None, **sections):
+    node = {"id": "parse", "stage": "design", "executor": "parse", **(node_fields or {})}
+    return {"name": "Spec Test", "nodes": [node], **sections}
+
+
+@pytest.mark.parametrize("node_fields, message", [
+    ({"retry": {"max_retries": "3"}}, r"nodes\[0\] \(parse\)\.retry\.max_retries: expected an integer, got '3'"),
+    ({"retry": -1}, r"nodes\[0\] \(parse\)\.retry: expected an integer >= 0"),
+    ({"retry": {"jitter": "yes"}}, r"\.retry\.jitter: expected true or false"),
+    ({"retry": {"base_delay": -0.5}}, r"\.retry\.base_delay: expected a number >= 0"),
+    ({"timeout": "5s"}, r"nodes\[0\] \(parse\)\.timeout: expected a number, got '5s'"),
+    ({"timeout": 0}, r"\.timeout: expected a number > 0"),
+    ({"hedge": {"percentile": 150}}, r"\.hedge\.percentile: expected a number > 0 and <= 100"),
+    ({"hedge": {"max_hedges": 1.5}}, r"\.hedge\.max_hedges: expected an integer"),
+    ({"hedge": {"delay": "fast"}}, r"\.hedge\.delay: expected a number"),
+    ({"cacheable": "false"}, r"\.cacheable: expected true or false"),
+    ({"inputs": "keyword"}, r"\.inputs: expected a list"),
+])
+def test_node_fields_are_type_and_range_checked(node_fields, message):
+    with pytest.raises(WorkflowSpecError, match=message):
+        compile_workflow(spec_with(node_fields), {"parse": parse})
+
+
+@pytest.mark.parametrize("sections, message", [
+    ({"workflow": {"concurrency": "5"}}, r"workflow\.concurrency: expected an integer"),
+    ({"workflow": {"timeout": -1}}, r"workflow\.timeout: expected a number > 0"),
+    ({"workflow": {"resource_limits": {"openai": 0}}}, r"workflow\.resource_limits\.openai: expected an integer > 0"),
+    ({"workflow": {"failure_policy": "explode"}}, r"workflow\.failure_policy: unknown value 'explode'"),
+    ({"performance": {"cache_ttl": "1h"}}, r"performance\.cache_ttl: expected a number"),
+])
+def test_workflow_settings_are_type_and_range_checked(sections, message):
+    with pytest.raises(WorkflowSpecError, match=message):
+        compile_workflow(spec_with(**sections), {"parse": parse})
+
+
+def test_valid_numeric_fields_compile():
+    workflow = compile_workflow(
+        spec_with(
+            {"timeout": 2.5, "retry": {"max_retries": 2, "base_delay": 0, "jitter": False},
+             "hedge": {"percentile": 99, "budget": None}},
+            workflow={"concurrency": 4, "resource_limits": {"openai": 3}}
+        ),
+        {"parse": parse}
+    )
+
+    node = workflow.nodes["parse"]
+    assert node.timeout == 2.5
+    assert node.retry_policy.max_retries == 2
+    assert node.hedge_policy.budget is None